@@ -0,0 +1,8 @@
+"""
+Pakiet benchmarków sklepu Frog.
+Zawiera deterministyczne generatory danych (produkty, klienci, paragony)
+oraz runner mierzący czasy funkcji publicznych przy różnych rozmiarach danych.
+
+Uruchomienie (z katalogu głównego projektu):
+    python -m benchmarks.run
+"""
@@ -0,0 +1,119 @@
+"""
+Pomiar przepustowości kopii zapasowych (frog.backup): pełna kopia, kopia przyrostowa
+po dopisaniu paragonów części klientów i zmianie kilku wierszy customers.csv, odtworzenie.
+
+Przykład (z katalogu głównego projektu):
+    python -m benchmarks.backup --customers 10000 --lines 20 --touched 0.05
+"""
+
+# --- Importy ---
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks import generators
+
+
+def _tree_size(root):
+    """Zwraca (liczba plików, bajty) w data/ i DATABASE/ katalogu root."""
+    files = size = 0
+    for sub in ('data', 'DATABASE'):
+        for entry in os.scandir(os.path.join(root, sub)):
+            if entry.is_file():
+                files += 1
+                size += entry.stat().st_size
+    return files, size
+
+
+def _touch_store(root, product_ids, customer_ids, touched, changed_rows, seed):
+    """Dopisuje po jednym paragonie części klientów i zmienia telefon kilku z nich."""
+    from frog.customer_manager import update_customer_phone
+
+    rng = random.Random(seed)
+    chosen = rng.sample(customer_ids, max(1, int(len(customer_ids) * touched)))
+    for cid in chosen:
+        lines = generators.generate_receipt_lines(product_ids, 1, seed=f"touch-{cid}")
+        with open(os.path.join(root, 'DATABASE', f"{cid}.txt"), 'a', encoding='utf-8') as f:
+            f.writelines(lines)
+    for cid in chosen[:changed_rows]:
+        update_customer_phone(cid, f"{rng.randint(500000000, 899999999)}")
+    return len(chosen)
+
+
+def _row(name, seconds, files, size):
+    return {'name': name, 'seconds': seconds, 'files': files, 'bytes': size,
+            'mb_per_s': size / 1e6 / seconds if seconds else 0.0,
+            'files_per_s': files / seconds if seconds else 0.0}
+
+
+def measure_backup(n_customers, lines, n_products=200, touched=0.05, changed_rows=10,
+                   level=6, seed=0):
+    """Zwraca listę wyników: etap, czas, pliki, bajty danych, MB/s i pliki/s."""
+    from frog import backup
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='frog-backup-') as tmp:
+        root, backup_dir, target = (os.path.join(tmp, d) for d in ('store', 'backup', 'restored'))
+        products, customers = generators.build_store(root, n_products, n_customers, lines, seed)
+        with generators.redirect_paths(root), contextlib.redirect_stdout(io.StringIO()):
+            files, size = _tree_size(root)
+            start = time.perf_counter()
+            entry = backup.backup(backup_dir, compresslevel=level)
+            results.append(_row('backup (pełna)', time.perf_counter() - start, files, size))
+            results[-1]['archive_bytes'] = entry['archive_bytes']
+
+            start = time.perf_counter()
+            entry = backup.backup(backup_dir, compresslevel=level)
+            results.append(_row('backup (bez zmian)', time.perf_counter() - start, files, 0))
+            results[-1]['archive_bytes'] = entry['archive_bytes']
+
+            _touch_store(root, [p['ID'] for p in products], [c['ID'] for c in customers],
+                         touched, changed_rows, seed)
+            start = time.perf_counter()
+            entry = backup.backup(backup_dir, compresslevel=level)
+            results.append(_row('backup (przyrostowa)', time.perf_counter() - start,
+                                entry['changes'], entry['data_bytes']))
+            results[-1]['archive_bytes'] = entry['archive_bytes']
+
+            files, size = _tree_size(root)
+            start = time.perf_counter()
+            backup.restore(backup_dir, target)
+            results.append(_row('restore (3 archiwa)', time.perf_counter() - start, files, size))
+    return results
+
+
+def main(argv=None):
+    """Punkt wejścia wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Przepustowość kopii zapasowych i odtwarzania")
+    parser.add_argument('--customers', type=int, default=10000)
+    parser.add_argument('--lines', type=int, default=20, help="linie paragonów na klienta")
+    parser.add_argument('--products', type=int, default=200)
+    parser.add_argument('--touched', type=float, default=0.05,
+                        help="ułamek klientów z nowym paragonem przed kopią przyrostową")
+    parser.add_argument('--changed-rows', type=int, default=10,
+                        help="liczba klientów ze zmienionym telefonem")
+    parser.add_argument('--level', type=int, default=6, help="poziom kompresji gzip")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="zapis wyników do pliku JSON")
+    args = parser.parse_args(argv)
+
+    results = measure_backup(args.customers, args.lines, args.products, args.touched,
+                             args.changed_rows, args.level, args.seed)
+    for r in results:
+        archive = f" archiwum={r['archive_bytes']} B" if 'archive_bytes' in r else ''
+        print(f"{r['name']:<22} {r['seconds']:8.3f} s  pliki={r['files']:<7} "
+              f"{r['mb_per_s']:8.1f} MB/s {r['files_per_s']:10.0f} plików/s{archive}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
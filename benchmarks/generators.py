@@ -0,0 +1,154 @@
+"""
+Deterministyczne generatory danych testowych dla benchmarków.
+Tworzą katalog produktów, bazę klientów i historię paragonów w tych samych
+formatach, których używa aplikacja (products.xlsx, customers.csv, DATABASE/*.txt).
+"""
+
+# --- Importy ---
+import contextlib
+import csv
+import datetime
+import os
+import random
+
+import pandas as pd
+
+from frog.auth import hash_password
+
+# --- Pule wartości do losowania ---
+CATEGORIES = ['Pieczywo', 'Nabiał', 'Napoje', 'Słodycze', 'Mrożonki', 'Spożywcze',
+              'Świeże', 'Przekąski', 'Chemia', 'Alkohol', 'Kosmetyki', 'Przemysłowe', 'Dom']
+PRODUCT_NAMES = ['Chleb', 'Bułka', 'Mleko', 'Jogurt', 'Ser', 'Masło', 'Woda', 'Sok', 'Herbata',
+                 'Kawa', 'Czekolada', 'Baton', 'Ciastka', 'Pizza', 'Makaron', 'Ryż', 'Jabłka',
+                 'Chipsy', 'Krakersy', 'Mydło', 'Piwo', 'Serwetki', 'Świeczki', 'Kebab']
+FIRST_NAMES = ['Anna', 'Jan', 'Piotr', 'Maria', 'Katarzyna', 'Tomasz', 'Agnieszka', 'Paweł',
+               'Magdalena', 'Michał', 'Joanna', 'Krzysztof', 'Ewa', 'Marcin', 'Zofia']
+LAST_NAMES = ['Nowak', 'Kowalski', 'Wiśniewski', 'Wójcik', 'Kowalczyk', 'Kamiński', 'Lewandowski',
+              'Zieliński', 'Szymański', 'Woźniak', 'Dąbrowski', 'Sienkiewicz', 'Mazur', 'Krawczyk']
+EMAIL_DOMAINS = ['gmail.com', 'wp.pl', 'onet.pl', 'example.com', 'o2.pl', 'interia.pl']
+
+PRODUCT_COLUMNS = ['ID', 'Nazwa', 'Kategoria', 'Cena', 'Ilość_w_magazynie']
+CUSTOMER_COLUMNS = ['ID', 'Imię', 'Nazwisko', 'Email', 'Data_rejestracji', 'PasswordHash', 'Telefon']
+
+# Data początkowa generowanej historii zakupów
+START_DATE = datetime.datetime(2025, 1, 1, 8, 0)
+
+
+def customer_password(customer_id):
+    """Zwraca jawne hasło wygenerowanego klienta (potrzebne do testów logowania)."""
+    return f"haslo{customer_id}"
+
+
+# --- Generatory rekordów ---
+def generate_products(n, seed=0):
+    """
+    Generuje n produktów w formacie wierszy products.xlsx.
+    :param n: liczba produktów
+    :param seed: ziarno generatora (te same parametry dają te same dane)
+    """
+    rng = random.Random(seed)
+    return [{
+        'ID': f"P{i:03d}",
+        'Nazwa': f"{rng.choice(PRODUCT_NAMES)} {i}",
+        'Kategoria': rng.choice(CATEGORIES),
+        'Cena': round(rng.uniform(0.99, 49.99), 2),
+        'Ilość_w_magazynie': rng.randint(0, 250),
+    } for i in range(1, n + 1)]
+
+
+def generate_customers(n, seed=0):
+    """
+    Generuje n klientów w formacie wierszy customers.csv.
+    ID są kolejnymi liczbami od 1000, hasło klienta zwraca customer_password(ID).
+    """
+    rng = random.Random(seed)
+    customers = []
+    for i in range(n):
+        cid = str(1000 + i)
+        imie = rng.choice(FIRST_NAMES)
+        nazwisko = rng.choice(LAST_NAMES)
+        registered = START_DATE - datetime.timedelta(days=rng.randint(0, 3 * 365))
+        customers.append({
+            'ID': cid,
+            'Imię': imie,
+            'Nazwisko': nazwisko,
+            'Email': f"{imie.lower()}.{nazwisko.lower()}{cid}@{rng.choice(EMAIL_DOMAINS)}",
+            'Data_rejestracji': registered.strftime("%Y-%m-%d"),
+            'PasswordHash': hash_password(customer_password(cid)),
+            'Telefon': ''.join(rng.choice('0123456789') for _ in range(9)) if rng.random() < 0.8 else '',
+        })
+    return customers
+
+
+def generate_receipt_lines(product_ids, n, seed=0, max_items=6, max_qty=5):
+    """
+    Generuje n linii historii zakupów jednego klienta (chronologicznie).
+    Część linii ma stary format daty (ISO z mikrosekundami), jak w istniejących plikach.
+    """
+    rng = random.Random(seed)
+    lines = []
+    when = START_DATE
+    for _ in range(n):
+        when += datetime.timedelta(minutes=rng.randint(5, 3 * 24 * 60))
+        k = rng.randint(1, min(max_items, len(product_ids)))
+        cart = [(pid, rng.randint(1, max_qty)) for pid in rng.sample(product_ids, k)]
+        stamp = when.isoformat(timespec='microseconds') if rng.random() < 0.1 \
+            else when.strftime("%Y-%m-%d %H:%M")
+        lines.append(f"{stamp} -> {repr(cart)}\n")
+    return lines
+
+
+# --- Zapis danych na dysk ---
+def write_products(path, products):
+    """Zapisuje produkty do pliku Excel (tak jak add_product)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pd.DataFrame(products, columns=PRODUCT_COLUMNS).to_excel(path, index=False)
+
+
+def write_customers(path, customers):
+    """Zapisuje klientów do pliku CSV (tak jak save_customers)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CUSTOMER_COLUMNS)
+        writer.writeheader()
+        writer.writerows(customers)
+
+
+def write_receipts(receipts_dir, customer_ids, product_ids, lines_per_customer, seed=0):
+    """
+    Tworzy plik historii zakupów dla każdego klienta w receipts_dir.
+    Każdy klient dostaje lines_per_customer linii (ziarno zależne od ID).
+    """
+    os.makedirs(receipts_dir, exist_ok=True)
+    for cid in customer_ids:
+        lines = generate_receipt_lines(product_ids, lines_per_customer, seed=f"{seed}-{cid}")
+        with open(os.path.join(receipts_dir, f"{cid}.txt"), 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+
+
+def build_store(root, n_products=100, n_customers=100, lines_per_customer=0, seed=0):
+    """
+    Tworzy w katalogu root kompletny zestaw danych sklepu:
+    root/data/products.xlsx, root/data/customers.csv oraz root/DATABASE/<ID>.txt.
+    Zwraca krotkę (produkty, klienci).
+    """
+    products = generate_products(n_products, seed)
+    customers = generate_customers(n_customers, seed)
+    write_products(os.path.join(root, 'data', 'products.xlsx'), products)
+    write_customers(os.path.join(root, 'data', 'customers.csv'), customers)
+    write_receipts(os.path.join(root, 'DATABASE'), [c['ID'] for c in customers],
+                   [p['ID'] for p in products], lines_per_customer, seed)
+    return products, customers
+
+
+@contextlib.contextmanager
+def redirect_paths(root):
+    """
+    Tymczasowo przełącza bieżący sklep (frog.store) na dane w katalogu root.
+    Pozwala uruchamiać funkcje aplikacji na wygenerowanych danych bez dotykania plików sklepu.
+    Działa tylko w bieżącym wątku – wątki robocze muszą wywołać redirect_paths same.
+    """
+    from frog.store import Store, use_store
+
+    with use_store(Store(root)):
+        yield root
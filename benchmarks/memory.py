@@ -0,0 +1,78 @@
+"""
+Pomiar pamięci: bajty na rekord dla dotychczasowych słowników (list_products,
+load_customers) i dla zwartych rekordów z frog.records.
+
+Przykład (z katalogu głównego projektu):
+    python -m benchmarks.memory --customers 100000 --products 10000
+"""
+
+# --- Importy ---
+import argparse
+import contextlib
+import gc
+import io
+import json
+import sys
+import tempfile
+import tracemalloc
+
+from benchmarks import generators
+
+
+def allocated_bytes(loader):
+    """Wywołuje loader i zwraca (wynik, bajty zaalokowane i wciąż zajęte przez wynik)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = loader()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current
+
+
+def measure_memory(n_customers, n_products, seed=0):
+    """Zwraca listę wyników: nazwa loadera, liczba rekordów, bajty na rekord."""
+    from frog.customer_manager import load_customers
+    from frog.product_manager import list_products
+    from frog.records import load_customer_records, load_product_records
+
+    loaders = [
+        ('load_customers (dict)', load_customers),
+        ('load_customer_records (Customer)', load_customer_records),
+        ('list_products (dict)', list_products),
+        ('load_product_records (Product)', load_product_records),
+    ]
+    results = []
+    with tempfile.TemporaryDirectory(prefix='frog-memory-') as root:
+        generators.build_store(root, n_products, n_customers, seed=seed)
+        with generators.redirect_paths(root), contextlib.redirect_stdout(io.StringIO()):
+            for name, loader in loaders:
+                records, size = allocated_bytes(loader)
+                results.append({'name': name, 'records': len(records),
+                                'bytes_per_record': size / max(len(records), 1)})
+                del records
+    return results
+
+
+def main(argv=None):
+    """Punkt wejścia wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Pomiar pamięci rekordów produktów i klientów")
+    parser.add_argument('--customers', type=int, default=100000)
+    parser.add_argument('--products', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="zapis wyników do pliku JSON")
+    args = parser.parse_args(argv)
+
+    results = measure_memory(args.customers, args.products, args.seed)
+    for r in results:
+        print(f"{r['name']:<36} n={r['records']:<8} {r['bytes_per_record']:8.1f} B/rekord")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""
+Symulator wielu kas (capacity planning).
+Uruchamia N kas jako procesy lub wątki; każda kasa odtwarza realistyczne koszyki
+z katalogu i listy klientów: logowanie (authenticate), zdjęcie towaru ze stanu
+(update_stock) i zapis paragonu (purchase_products). Na koniec raportuje
+transakcje na sekundę, percentyle opóźnień oraz wykryte uszkodzenia danych
+w data/ i DATABASE/.
+
+Przykłady (z katalogu głównego projektu):
+    python -m benchmarks.registers --registers 4 --transactions 50
+    python -m benchmarks.registers --mode thread --registers 8 --output raport.json
+    python -m benchmarks.registers --store /kopia/sklepu --passwords hasla.csv
+        # UWAGA: --store modyfikuje dane w podanym katalogu – używaj kopii
+"""
+
+# --- Importy ---
+import argparse
+import collections
+import concurrent.futures
+import contextlib
+import csv
+import io
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+from benchmarks import generators
+
+# Format linii paragonu zapisywanej przez purchase_products
+RECEIPT_LINE = re.compile(r"^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}\S* -> \[(\('[^']*', \d+\)(, )?)*\]$")
+
+GUEST_SHARE = 0.1   # Odsetek zakupów bez logowania (konto GUEST)
+
+
+# --- Statystyki ---
+def percentiles(values, points=(50, 90, 99)):
+    """Zwraca słownik percentyli (metoda najbliższej rangi) w milisekundach."""
+    if not values:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(values)
+    result = {}
+    for p in points:
+        rank = max(1, -(-p * len(ordered) // 100))  # Zaokrąglenie w górę
+        result[f"p{p}"] = ordered[rank - 1] * 1000
+    result['max'] = ordered[-1] * 1000
+    return result
+
+
+# --- Koszyki ---
+def make_basket(rng, product_ids, weights, max_items=8):
+    """
+    Losuje koszyk: liczba pozycji maleje geometrycznie, popularność produktów
+    ma rozkład Zipfa (wagi 1/ranga), ilości 1–3 sztuki.
+    """
+    size = 1
+    while size < max_items and rng.random() < 0.55:
+        size += 1
+    chosen = []
+    while len(chosen) < min(size, len(product_ids)):
+        pid = rng.choices(product_ids, weights)[0]
+        if pid not in chosen:
+            chosen.append(pid)
+    return [(pid, rng.randint(1, 3)) for pid in chosen]
+
+
+# --- Kasa ---
+def run_register(register_no, root, transactions, seed, customers, quiet=True):
+    """
+    Jedna kasa: wykonuje `transactions` transakcji na danych sklepu w katalogu root.
+    :param customers: lista par (ID, hasło) klientów, którzy mogą robić zakupy
+    :param quiet: czy wyciszyć komunikaty [LOG] (w trybie wątków robi to simulate,
+        bo sys.stdout jest wspólny dla całego procesu)
+    :return: słownik z czasami operacji i listą zatwierdzonych koszyków
+    """
+    from frog.auth import authenticate
+    from frog.customer_manager import purchase_products
+    from frog.product_manager import list_products, update_stock
+
+    rng = random.Random(f"{seed}-{register_no}")
+    timings = collections.defaultdict(list)
+    committed = []            # (ID klienta, koszyk) dla zapisanych paragonów
+    sold = []                 # Koszyki, które zeszły ze stanu
+    errors = collections.Counter()
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(generators.redirect_paths(root))  # Sklep ustawiany w wątku kasy
+        if quiet:
+            stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+        product_ids = [str(p['ID']) for p in list_products()]  # Katalog wczytany na start zmiany
+        weights = [1 / rank for rank in range(1, len(product_ids) + 1)]
+        for _ in range(transactions):
+            basket = make_basket(rng, product_ids, weights)
+            start = time.perf_counter()
+            try:
+                if rng.random() < GUEST_SHARE:
+                    cid = 'GUEST'
+                else:
+                    cid, pwd = rng.choice(customers)
+                    t = time.perf_counter()
+                    ok = authenticate(cid, pwd)
+                    timings['authenticate'].append(time.perf_counter() - t)
+                    if not ok:
+                        errors['authenticate: odmowa'] += 1
+                        continue
+                t = time.perf_counter()
+                update_stock([(pid, -qty) for pid, qty in basket])
+                timings['update_stock'].append(time.perf_counter() - t)
+                sold.append(basket)
+                t = time.perf_counter()
+                purchase_products(cid, basket)
+                timings['purchase_products'].append(time.perf_counter() - t)
+                committed.append((cid, basket))
+                timings['transaction'].append(time.perf_counter() - start)
+            except Exception as e:
+                errors[f"{type(e).__name__}: {e}"[:120]] += 1
+    return {'timings': dict(timings), 'committed': committed, 'sold': sold,
+            'errors': dict(errors)}
+
+
+# --- Wykrywanie uszkodzeń ---
+def read_stock(root):
+    """Bieżące stany magazynowe sklepu w katalogu root (plik Excel + dziennik magazynowy)."""
+    from frog.product_manager import list_products
+    with generators.redirect_paths(root), contextlib.redirect_stdout(io.StringIO()):
+        return {str(p['ID']): int(p['Ilość_w_magazynie']) for p in list_products()}
+
+
+def receipt_line_counts(receipts_dir):
+    """Liczba linii w każdym pliku historii zakupów."""
+    counts = {}
+    if not os.path.isdir(receipts_dir):
+        return counts
+    for name in os.listdir(receipts_dir):
+        if name.endswith('.txt'):
+            with open(os.path.join(receipts_dir, name), encoding='utf-8', errors='replace') as f:
+                counts[name[:-4]] = sum(1 for _ in f)
+    return counts
+
+
+def check_integrity(root, initial_stock, initial_lines, initial_customers, results):
+    """
+    Porównuje stan danych po symulacji z oczekiwanym:
+    stany magazynowe (utracone aktualizacje), czytelność plików,
+    liczba i poprawność linii paragonów, liczba klientów.
+    Zwraca listę opisów wykrytych problemów.
+    """
+    problems = []
+    receipts_dir = os.path.join(root, 'DATABASE')
+
+    # Stany magazynowe: stan początkowy minus wszystko, co zeszło ze stanu
+    expected = dict(initial_stock)
+    for r in results:
+        for basket in r['sold']:
+            for pid, qty in basket:
+                expected[pid] -= qty
+    try:
+        actual = read_stock(root)
+        if set(actual) != set(expected):
+            problems.append(f"magazyn: zmieniony zbiór produktów ({len(actual)} zamiast {len(expected)})")
+        lost = {pid: actual.get(pid, 0) - qty for pid, qty in expected.items() if actual.get(pid) != qty}
+        if lost:
+            problems.append(f"magazyn: niezgodny stan {len(lost)} produktów "
+                            f"(łącznie {sum(lost.values())} szt. – utracone aktualizacje)")
+    except Exception as e:
+        problems.append(f"products.xlsx: plik nieczytelny ({type(e).__name__}: {e})")
+
+    # Klienci: plik musi być czytelny i zawierać tych samych klientów
+    try:
+        with open(os.path.join(root, 'data', 'customers.csv'), newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        if len(rows) != initial_customers:
+            problems.append(f"customers.csv: {len(rows)} klientów zamiast {initial_customers}")
+    except Exception as e:
+        problems.append(f"customers.csv: plik nieczytelny ({type(e).__name__}: {e})")
+
+    # Paragony: liczba nowych linii i ich format
+    written = collections.Counter(cid for r in results for cid, _ in r['committed'])
+    after = receipt_line_counts(receipts_dir)
+    for cid in set(written) | set(after):
+        new_lines = after.get(cid, 0) - initial_lines.get(cid, 0)
+        if new_lines != written.get(cid, 0):
+            problems.append(f"DATABASE/{cid}.txt: {new_lines} nowych linii zamiast {written.get(cid, 0)}")
+    malformed = 0
+    for cid in after:
+        with open(os.path.join(receipts_dir, f"{cid}.txt"), encoding='utf-8', errors='replace') as f:
+            malformed += sum(1 for line in f if not RECEIPT_LINE.match(line.rstrip('\n')))
+    if malformed:
+        problems.append(f"DATABASE/: {malformed} uszkodzonych linii paragonów")
+    return problems
+
+
+# --- Symulacja ---
+def simulate(root, registers=4, transactions=50, mode='process', seed=0, customers=None):
+    """
+    Uruchamia symulację na danych w katalogu root i zwraca raport (słownik).
+    :param customers: lista par (ID, hasło); domyślnie hasła z generatora danych
+    """
+    initial_stock = read_stock(root)
+    with open(os.path.join(root, 'data', 'customers.csv'), newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    if customers is None:
+        customers = [(r['ID'], generators.customer_password(r['ID'])) for r in rows]
+    initial_lines = receipt_line_counts(os.path.join(root, 'DATABASE'))
+
+    start = time.perf_counter()
+    if mode == 'process':
+        with concurrent.futures.ProcessPoolExecutor(max_workers=registers) as pool:
+            futures = [pool.submit(run_register, i, root, transactions, seed, customers)
+                       for i in range(registers)]
+            results = [f.result() for f in futures]
+    else:
+        # Wątki współdzielą sys.stdout – wyciszamy go raz dla całej puli
+        with contextlib.redirect_stdout(io.StringIO()), \
+                concurrent.futures.ThreadPoolExecutor(max_workers=registers) as pool:
+            futures = [pool.submit(run_register, i, root, transactions, seed, customers, False)
+                       for i in range(registers)]
+            results = [f.result() for f in futures]
+    elapsed = time.perf_counter() - start
+
+    merged = collections.defaultdict(list)
+    errors = collections.Counter()
+    for r in results:
+        for op, values in r['timings'].items():
+            merged[op].extend(values)
+        errors.update(r['errors'])
+    done = len(merged['transaction'])
+    return {
+        'registers': registers,
+        'mode': mode,
+        'transactions_requested': registers * transactions,
+        'transactions_ok': done,
+        'elapsed_s': elapsed,
+        'tps': done / elapsed if elapsed else 0.0,
+        'latency_ms': {op: percentiles(values) for op, values in merged.items()},
+        'errors': dict(errors),
+        'corruption': check_integrity(root, initial_stock, initial_lines, len(rows), results),
+    }
+
+
+def print_report(report):
+    """Wypisuje raport symulacji w czytelnej postaci."""
+    print(f"Kasy: {report['registers']} ({report['mode']}), transakcje: "
+          f"{report['transactions_ok']}/{report['transactions_requested']} "
+          f"w {report['elapsed_s']:.2f} s -> {report['tps']:.1f} tx/s")
+    for op, stats in report['latency_ms'].items():
+        cells = '  '.join(f"{k}={v:8.2f}" for k, v in stats.items() if v is not None)
+        print(f"  {op:<18} {cells} ms")
+    for message, count in report['errors'].items():
+        print(f"  [BŁĄD x{count}] {message}")
+    if report['corruption']:
+        for problem in report['corruption']:
+            print(f"  [USZKODZENIE] {problem}")
+    else:
+        print("  Nie wykryto uszkodzeń danych.")
+
+
+def main(argv=None):
+    """Punkt wejścia wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Symulator wielu kas sklepu Frog")
+    parser.add_argument('--registers', type=int, default=4, help="liczba kas")
+    parser.add_argument('--transactions', type=int, default=50, help="transakcji na kasę")
+    parser.add_argument('--mode', choices=['process', 'thread'], default='process')
+    parser.add_argument('--store', help="katalog sklepu (data/ i DATABASE/); domyślnie dane generowane")
+    parser.add_argument('--products', type=int, default=200, help="liczba generowanych produktów")
+    parser.add_argument('--customers', type=int, default=1000, help="liczba generowanych klientów")
+    parser.add_argument('--history', type=int, default=10, help="linii historii na klienta")
+    parser.add_argument('--passwords', help="plik CSV z kolumnami ID,hasło (dla --store)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="zapis raportu do pliku JSON")
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        root = args.store
+        if root is None:
+            root = stack.enter_context(tempfile.TemporaryDirectory(prefix='frog-registers-'))
+            generators.build_store(root, args.products, args.customers, args.history, args.seed)
+        customers = None
+        if args.passwords:
+            with open(args.passwords, newline='', encoding='utf-8') as f:
+                customers = [(row[0], row[1]) for row in csv.reader(f) if len(row) >= 2]
+        report = simulate(root, args.registers, args.transactions, args.mode, args.seed, customers)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 1 if report['corruption'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,385 @@
+"""
+Runner benchmarków sklepu Frog.
+Mierzy funkcje publiczne przy kilku rozmiarach danych, zapisuje wyniki do JSON
+i opcjonalnie porównuje je z poprzednim uruchomieniem (wykrywanie regresji).
+
+Przykłady:
+    python -m benchmarks.run                              # wszystkie benchmarki
+    python -m benchmarks.run --quick                      # tylko najmniejsze rozmiary
+    python -m benchmarks.run --only list_products auth.authenticate
+    python -m benchmarks.run --compare benchmarks/results/poprzedni.json
+"""
+
+# --- Importy ---
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks import generators
+
+# --- Rejestr benchmarków ---
+BENCHMARKS = []  # Lista słowników: nazwa, rozmiary, funkcja przygotowująca
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+
+def benchmark(name, sizes):
+    """
+    Dekorator rejestrujący benchmark.
+    Udekorowana funkcja dostaje (katalog_roboczy, rozmiar, ziarno), przygotowuje dane
+    i zwraca bezargumentową funkcję, której czas jest mierzony.
+    """
+    def decorator(setup):
+        BENCHMARKS.append({'name': name, 'sizes': list(sizes), 'setup': setup})
+        return setup
+    return decorator
+
+
+# --- Definicje benchmarków ---
+@benchmark("list_products", sizes=[100, 1000, 10000])
+def bench_list_products(root, size, seed):
+    """Wczytanie całego katalogu produktów z Excela."""
+    from frog.product_manager import list_products
+    generators.build_store(root, seed=seed, n_products=size, n_customers=1)
+    return list_products
+
+
+@benchmark("auth.authenticate", sizes=[100, 1000, 10000, 100000])
+def bench_authenticate(root, size, seed):
+    """Logowanie ostatniego klienta w pliku (najgorszy przypadek liniowego skanu)."""
+    from frog.auth import authenticate
+    _, customers = generators.build_store(root, seed=seed, n_products=10, n_customers=size)
+    cid = customers[-1]['ID']
+    pwd = generators.customer_password(cid)
+    return lambda: authenticate(cid, pwd)
+
+
+@benchmark("auth.generate_id", sizes=[100, 1000, 10000, 100000])
+def bench_auth_generate_id(root, size, seed):
+    """Generowanie ID nowego klienta (moduł auth)."""
+    from frog.auth import generate_id
+    generators.build_store(root, seed=seed, n_products=10, n_customers=size)
+    return generate_id
+
+
+@benchmark("customer_manager.generate_id", sizes=[100, 1000, 10000, 100000])
+def bench_customer_generate_id(root, size, seed):
+    """Generowanie ID nowego klienta (moduł customer_manager, z wczytaniem CSV)."""
+    from frog.customer_manager import generate_id
+    generators.build_store(root, seed=seed, n_products=10, n_customers=size)
+    return generate_id
+
+
+@benchmark("load_customers", sizes=[1000, 100000])
+def bench_load_customers(root, size, seed):
+    """Wczytanie bazy klientów jako listy słowników."""
+    from frog.customer_manager import load_customers
+    generators.build_store(root, seed=seed, n_products=10, n_customers=size)
+    return load_customers
+
+
+@benchmark("records.load_customer_records", sizes=[1000, 100000])
+def bench_load_customer_records(root, size, seed):
+    """Wczytanie bazy klientów jako zwartych rekordów Customer."""
+    from frog.records import load_customer_records
+    generators.build_store(root, seed=seed, n_products=10, n_customers=size)
+    return load_customer_records
+
+
+@benchmark("customer_index.search", sizes=[1000, 100000])
+def bench_customer_search(root, size, seed):
+    """Wyszukiwanie klientów po kilku indeksach naraz (prefiks nazwiska, domena, daty)."""
+    from frog.customer_manager import search_customers
+    from frog.customer_index import get_index
+    generators.build_store(root, seed=seed, n_products=10, n_customers=size)
+    get_index()  # Budowa indeksu nie wchodzi do pomiaru
+    return lambda: search_customers(surname='Now', email_domain='gmail.com',
+                                    registered_from='2024-01-01', limit=50)
+
+
+@benchmark("records.load_product_records", sizes=[100, 1000, 10000])
+def bench_load_product_records(root, size, seed):
+    """Wczytanie katalogu jako zwartych rekordów Product (openpyxl, tylko odczyt)."""
+    from frog.records import load_product_records
+    generators.build_store(root, seed=seed, n_products=size, n_customers=1)
+    return load_product_records
+
+
+@benchmark("purchase_products", sizes=[10, 1000, 100000])
+def bench_purchase_products(root, size, seed):
+    """Dopisanie zakupu do historii klienta, która ma już `size` linii."""
+    from frog.customer_manager import purchase_products
+    products, customers = generators.build_store(root, seed=seed, n_products=50, n_customers=1)
+    cid = customers[0]['ID']
+    lines = generators.generate_receipt_lines([p['ID'] for p in products], size, seed)
+    with open(os.path.join(root, 'DATABASE', f"{cid}.txt"), 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    cart = [(products[0]['ID'], 2), (products[1]['ID'], 1), (products[2]['ID'], 3)]
+    return lambda: purchase_products(cid, cart)
+
+
+@benchmark("update_stock", sizes=[100, 1000, 10000])
+def bench_update_stock(root, size, seed):
+    """Zdjęcie koszyka ze stanu przy katalogu `size` produktów (dopisanie do dziennika)."""
+    from frog.product_manager import update_stock
+    products, _ = generators.build_store(root, seed=seed, n_products=size, n_customers=1)
+    for p in products[:3]:
+        update_stock([(p['ID'], 10 ** 6)])  # Zapas, żeby pomiar nie wyczerpał stanu
+    changes = [(p['ID'], -1) for p in products[:3]]
+    return lambda: update_stock(changes)
+
+
+@benchmark("recommend.also_bought", sizes=[100, 1000, 10000])
+def bench_also_bought(root, size, seed):
+    """Podpowiedź dla 5-pozycyjnego koszyka z modelu zbudowanego z historii `size` klientów."""
+    from frog import recommend
+    products, _ = generators.build_store(root, seed=seed, n_products=500, n_customers=size,
+                                         lines_per_customer=5)
+    model = recommend.load_model()
+    cart = [p['ID'] for p in products[:5]]
+    return lambda: recommend.also_bought(model, cart)
+
+
+@benchmark("customer_manager.purchase_history", sizes=[1000, 100000])
+def bench_purchase_history(root, size, seed):
+    """Strona 20 najnowszych zakupów z zakresu dat z historii `size` linii (indeks offsetów gotowy)."""
+    from frog.customer_manager import purchase_history
+    products, customers = generators.build_store(root, seed=seed, n_products=50, n_customers=1)
+    cid = customers[0]['ID']
+    lines = generators.generate_receipt_lines([p['ID'] for p in products], size, seed)
+    with open(os.path.join(root, 'DATABASE', f"{cid}.txt"), 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    middle = lines[size // 2][:10]
+    purchase_history(cid, 1)  # Budowa indeksu nie wchodzi do pomiaru
+    return lambda: purchase_history(cid, 20, date_to=middle)
+
+
+@benchmark("service.history_rows", sizes=[10, 50, 200])
+def bench_history_rows(root, size, seed):
+    """Wycena historii zakupów klienta (dane zakładki Historia) przy `size` paragonach."""
+    from frog.service import history_rows
+    _, customers = generators.build_store(root, seed=seed, n_products=100, n_customers=1,
+                                          lines_per_customer=size)
+    cid = customers[0]['ID']
+    return lambda: history_rows(cid)
+
+
+@benchmark("service.checkout", sizes=[100, 10000])
+def bench_service_checkout(root, size, seed):
+    """Zakup przez DataService (zlecenie do puli wątków + oczekiwanie na wynik) przy katalogu `size`."""
+    from frog.product_manager import update_stock
+    from frog.service import DataService
+    products, customers = generators.build_store(root, seed=seed, n_products=size, n_customers=1)
+    for p in products[:3]:
+        update_stock([(p['ID'], 10 ** 6)])  # Zapas, żeby pomiar nie wyczerpał stanu
+    service = DataService()
+    cid = customers[0]['ID']
+    items = [(p['ID'], 1) for p in products[:3]]
+    return lambda: service.checkout(cid, items).result()
+
+
+@benchmark("changes.Feed.pending", sizes=[100, 10000])
+def bench_feed_pending(root, size, seed):
+    """Sprawdzenie dziennika zmian przez otwarte okno, gdy nic się nie zmieniło (katalog `size`)."""
+    from frog import changes
+    from frog.product_manager import update_stock
+    products, _ = generators.build_store(root, seed=seed, n_products=size, n_customers=1)
+    update_stock([(products[0]['ID'], 1)])  # Dziennik magazynowy istnieje, jak w działającym sklepie
+    feed = changes.Feed()
+    return feed.pending
+
+
+@benchmark("receipts.export_day", sizes=[1000, 10000])
+def bench_export_day(root, size, seed):
+    """Eksport paragonów z najbardziej ruchliwego dnia do CSV przy `size` klientach (jeden proces)."""
+    import collections
+    from frog import receipts
+    _, customers = generators.build_store(root, seed=seed, n_products=200, n_customers=size,
+                                          lines_per_customer=30)
+    days = collections.Counter()
+    for c in customers[:100]:
+        with open(os.path.join(root, 'DATABASE', f"{c['ID']}.txt"), encoding='utf-8') as f:
+            days.update(line[:10] for line in f)
+    day = days.most_common(1)[0][0]
+    output = os.path.join(root, 'export.csv')
+    return lambda: receipts.export_day(day, output, 'csv', workers=1)
+
+
+@benchmark("fsck.check_receipts", sizes=[1000, 10000])
+def bench_fsck_receipts(root, size, seed):
+    """Sprawdzenie plików paragonów `size` klientów (po 20 linii, jeden proces, bez naprawy)."""
+    from frog import fsck
+    products, customers = generators.build_store(root, seed=seed, n_products=200, n_customers=size,
+                                                 lines_per_customer=20)
+    known = (frozenset(p['ID'] for p in products), frozenset(c['ID'] for c in customers))
+    return lambda: fsck.check_receipts(*known, workers=1)
+
+
+@benchmark("pricing.price_carts", sizes=[100, 10000, 100000])
+def bench_price_carts(root, size, seed):
+    """Wsadowa wycena `size` koszyków z promocjami (uzgodnienie na koniec dnia)."""
+    import random
+    from frog import pricing
+    products = generators.generate_products(1000, seed)
+    catalog = pricing.build_catalog(products)
+    rng = random.Random(seed)
+    carts = [[(pid, rng.randint(1, 5)) for pid in rng.sample(catalog['ids'], rng.randint(1, 8))]
+             for _ in range(size)]
+    rules = [pricing.multi_buy(catalog['ids'][0], 3, 2),
+             pricing.category_discount(generators.CATEGORIES[0], 10),
+             pricing.basket_threshold(100, 5)]
+    return lambda: pricing.price_carts(catalog, carts, rules)
+
+
+@benchmark("cart.add_remove", sizes=[1000, 100000])
+def bench_cart_add_remove(root, size, seed):
+    """`size` operacji dodania i usunięcia pozycji w koszyku (suma przyrostowa)."""
+    import random
+    from frog.cart import Cart
+    from frog.pricing import build_catalog
+    products = generators.generate_products(1000, seed)
+    for p in products:
+        p['Ilość_w_magazynie'] = size * 10  # Stan nie ogranicza pomiaru
+    rng = random.Random(seed)
+    ops = [rng.choice(products)['ID'] for _ in range(size)]
+
+    def run():
+        cart = Cart(build_catalog(products))
+        for pid in ops:
+            cart.add(pid, 2)
+        for pid in ops:
+            cart.remove(pid, 1)
+        return cart.total
+    return run
+
+
+# --- Pomiar ---
+def measure(func, min_time=0.2, max_repeats=20):
+    """
+    Wielokrotnie wywołuje func i zwraca czasy pojedynczych wywołań (w sekundach).
+    Powtarza aż łączny czas przekroczy min_time lub osiągnie max_repeats wywołań
+    (co najmniej 3 powtórzenia).
+    """
+    times = []
+    while len(times) < 3 or (sum(times) < min_time and len(times) < max_repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run_benchmarks(selected=None, quick=False, seed=0, verbose=True):
+    """
+    Uruchamia zarejestrowane benchmarki i zwraca listę wyników.
+    :param selected: lista nazw benchmarków (None = wszystkie)
+    :param quick: tylko najmniejszy rozmiar każdego benchmarku
+    """
+    results = []
+    for bench in BENCHMARKS:
+        if selected and bench['name'] not in selected:
+            continue
+        sizes = bench['sizes'][:1] if quick else bench['sizes']
+        for size in sizes:
+            with tempfile.TemporaryDirectory(prefix='frog-bench-') as root:
+                with generators.redirect_paths(root), contextlib.redirect_stdout(io.StringIO()):
+                    func = bench['setup'](root, size, seed)
+                    times = measure(func)
+            result = {
+                'name': bench['name'],
+                'size': size,
+                'repeats': len(times),
+                'best_s': min(times),
+                'mean_s': statistics.mean(times),
+                'stdev_s': statistics.stdev(times) if len(times) > 1 else 0.0,
+            }
+            results.append(result)
+            if verbose:
+                print(f"{result['name']:<32} n={size:<8} best={result['best_s'] * 1000:10.3f} ms"
+                      f"  mean={result['mean_s'] * 1000:10.3f} ms")
+    return results
+
+
+# --- Zapis i porównywanie wyników ---
+def save_results(results, path=None, seed=0):
+    """Zapisuje wyniki wraz z metadanymi środowiska do pliku JSON i zwraca jego ścieżkę."""
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(RESULTS_DIR, f"bench-{stamp}.json")
+    payload = {
+        'meta': {
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'seed': seed,
+        },
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def compare_results(previous, current, threshold=1.25):
+    """
+    Porównuje dwa zestawy wyników (po nazwie i rozmiarze).
+    Zwraca listę regresji: wyniki, których najlepszy czas wzrósł ponad threshold razy.
+    """
+    baseline = {(r['name'], r['size']): r for r in previous}
+    regressions = []
+    for r in current:
+        old = baseline.get((r['name'], r['size']))
+        if old is None or old['best_s'] <= 0:
+            continue
+        ratio = r['best_s'] / old['best_s']
+        if ratio > threshold:
+            regressions.append({'name': r['name'], 'size': r['size'], 'ratio': ratio,
+                                'old_s': old['best_s'], 'new_s': r['best_s']})
+    return regressions
+
+
+def main(argv=None):
+    """Punkt wejścia wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Benchmarki sklepu Frog")
+    parser.add_argument('--only', nargs='*', help="nazwy benchmarków do uruchomienia")
+    parser.add_argument('--quick', action='store_true', help="tylko najmniejsze rozmiary")
+    parser.add_argument('--output', help="plik wynikowy JSON (domyślnie benchmarks/results/)")
+    parser.add_argument('--compare', help="plik JSON z poprzednimi wynikami")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="dopuszczalny wzrost czasu przy porównaniu (domyślnie 1.25)")
+    parser.add_argument('--seed', type=int, default=0, help="ziarno generatorów danych")
+    parser.add_argument('--list', action='store_true', help="wypisz dostępne benchmarki")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for bench in BENCHMARKS:
+            print(f"{bench['name']:<32} rozmiary: {bench['sizes']}")
+        return 0
+
+    results = run_benchmarks(args.only, args.quick, args.seed)
+    path = save_results(results, args.output, args.seed)
+    print(f"Zapisano wyniki: {path}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)['results']
+        regressions = compare_results(previous, results, args.threshold)
+        for r in regressions:
+            print(f"[REGRESJA] {r['name']} n={r['size']}: {r['old_s'] * 1000:.3f} ms -> "
+                  f"{r['new_s'] * 1000:.3f} ms (x{r['ratio']:.2f})")
+        if regressions:
+            return 1
+        print("Brak regresji.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
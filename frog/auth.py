@@ -8,11 +8,9 @@ import os                      # Do operacji na ścieżkach i plikach
 import hashlib                 # Do szyfrowania hasła (SHA-256)
 import datetime                # Do zapisywania daty rejestracji
 
-# Ścieżka do pliku z danymi klientów
-CUSTOMERS_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'customers.csv')
-
-# Katalog na pliki związane z klientem (np. historia zakupów)
-DATABASE_DIR = os.path.join(os.path.dirname(__file__), '..', 'DATABASE')
+from frog import changes               # Dziennik zmian (powiadomienia dla otwartych okien)
+from frog import customer_index        # Indeksy wyszukiwania klientów
+from frog.store import current_store  # Ścieżki plików bieżącego sklepu
 
 
 def hash_password(password: str) -> str:
@@ -24,10 +22,10 @@ def hash_password(password: str) -> str:
 def email_exists(email: str) -> bool:
     """Sprawdza, czy email już jest w bazie."""
     # Jeśli plik nie istnieje, nie ma żadnych klientów
-    if not os.path.exists(CUSTOMERS_CSV):
+    if not os.path.exists(current_store().customers_csv):
         return False
     # Otwórz plik i sprawdź, czy jakiś wiersz ma taki sam email
-    with open(CUSTOMERS_CSV, newline='', encoding='utf-8') as f:
+    with open(current_store().customers_csv, newline='', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         return any(row.get('Email') == email for row in reader)
 
@@ -35,9 +33,9 @@ def email_exists(email: str) -> bool:
 def generate_id() -> str:
     """Generuje nowe 4-cyfrowe ID klienta."""
     # Jeśli plik nie istnieje, zaczynamy od ID 1000
-    if not os.path.exists(CUSTOMERS_CSV):
+    if not os.path.exists(current_store().customers_csv):
         return "1000"
-    with open(CUSTOMERS_CSV, newline='', encoding='utf-8') as f:
+    with open(current_store().customers_csv, newline='', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         # Pobieramy wszystkie numery ID, konwertujemy na int, szukamy największego i dodajemy 1
         ids = [int(row['ID']) for row in reader if row.get('ID', '').isdigit()]
@@ -53,7 +51,7 @@ def authenticate(customer_id: str, password: str) -> bool:
     """
     hashed = hash_password(password)  # Hashujemy podane hasło
     try:
-        with open(CUSTOMERS_CSV, newline='', encoding='utf-8') as f:
+        with open(current_store().customers_csv, newline='', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             # Szukamy klienta z takim ID i porównujemy hash hasła
             for row in reader:
@@ -86,29 +84,36 @@ def register_with_password(imie: str, nazwisko: str, email: str, password: str,
     fieldnames = ['ID', 'Imię', 'Nazwisko', 'Email', 'Data_rejestracji', 'PasswordHash', 'Telefon']
 
     # Sprawdzenie czy trzeba dodać nagłówek do pliku CSV
-    header_needed = (not os.path.exists(CUSTOMERS_CSV)) or \
-                    ('PasswordHash' not in open(CUSTOMERS_CSV, encoding='utf-8').readline())
+    path = current_store().customers_csv
+    header_needed = (not os.path.exists(path)) or \
+                    ('PasswordHash' not in open(path, encoding='utf-8').readline())
 
     # Tworzenie folderu na wypadek, gdyby nie istniał
-    os.makedirs(os.path.dirname(CUSTOMERS_CSV), exist_ok=True)
-
-    # Dopisanie nowego klienta do pliku
-    with open(CUSTOMERS_CSV, 'a', newline='', encoding='utf-8') as f:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    row = {
+        'ID': cid,
+        'Imię': imie,
+        'Nazwisko': nazwisko,
+        'Email': email,
+        'Data_rejestracji': now,
+        'PasswordHash': pwd_hash,
+        'Telefon': phone
+    }
+
+    # Dopisanie nowego klienta do pliku (i do indeksów wyszukiwania)
+    with customer_index.maintained() as index, open(path, 'a', newline='', encoding='utf-8') as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         if header_needed:
             writer.writeheader()  # Dodajemy nagłówki, jeśli trzeba
-        writer.writerow({
-            'ID': cid,
-            'Imię': imie,
-            'Nazwisko': nazwisko,
-            'Email': email,
-            'Data_rejestracji': now,
-            'PasswordHash': pwd_hash,
-            'Telefon': phone
-        })
+        writer.writerow(row)
+        if index:
+            index.add(row)
+    changes.record(changes.CUSTOMERS, [(changes.UPSERT, cid, row)])
 
     # Tworzymy plik z historią zakupów klienta (pusty plik tekstowy)
-    os.makedirs(DATABASE_DIR, exist_ok=True)
-    open(os.path.join(DATABASE_DIR, f"{cid}.txt"), 'a', encoding='utf-8').close()
+    receipts_dir = current_store().receipts_dir
+    os.makedirs(receipts_dir, exist_ok=True)
+    open(os.path.join(receipts_dir, f"{cid}.txt"), 'a', encoding='utf-8').close()
 
     return cid  # Zwracamy nowo utworzone ID klienta
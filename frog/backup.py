@@ -0,0 +1,411 @@
+"""
+Moduł kopii zapasowych sklepu Żabka (data/ i DATABASE/ bieżącego sklepu).
+Każde uruchomienie zapisuje jedno archiwum tar.gz w katalogu kopii. Pierwsze (pełne)
+zawiera wszystkie pliki; kolejne (przyrostowe) tylko to, co się zmieniło:
+  - pliki dopisywane (paragony DATABASE/*.txt, dziennik magazynowy) – tylko dopisany zakres bajtów,
+  - customers.csv i products.xlsx – tylko dodane / zmienione wiersze i listę usuniętych ID,
+  - pozostałe pliki – w całości, gdy się zmieniły.
+Stan ostatniej kopii (rozmiary, czasy modyfikacji i sumy kontrolne plików, sumy wierszy tabel)
+trzyma manifest.json w katalogu kopii, więc niezmienione pliki są pomijane po samym stat().
+Suma CRC32 pliku jest liczona z bajtów w trakcie ich kopiowania do archiwum i przedłużana
+o każdy dopisany zakres – plik dopisywany w czasie kopii nie psuje sumy, a dopisany nie jest czytany od nowa.
+Wiersze tabel są rozpoznawane po ID i numerze wystąpienia, więc powtórzone ID nie sklejają się
+w jeden wiersz; odtworzenie sprawdza liczbę wierszy i sumy kontrolne całych plików i tabel.
+
+Przykład (z katalogu głównego projektu):
+    python -m frog.backup backup /kopie/sklep            # pełna, potem przyrostowe
+    python -m frog.backup restore /kopie/sklep /tmp/odtworzony
+    python -m frog.backup list /kopie/sklep
+"""
+
+# --- Importy ---
+import argparse
+import collections
+import csv
+import datetime
+import hashlib
+import io
+import json
+import os
+import tarfile
+import zlib
+
+import openpyxl
+import pandas as pd
+
+from frog.store import current_store, store_at, use_store
+
+MANIFEST = 'manifest.json'      # Stan ostatniej kopii w katalogu kopii
+INDEX = 'index.json'            # Spis zmian zapisany w każdym archiwum
+TAIL_BYTES = 4096               # Ile bajtów przed końcem pliku obejmuje suma kontrolna "ogona"
+CUSTOMERS = 'data/customers.csv'
+PRODUCTS = 'data/products.xlsx'
+
+# --- Rodzaje wpisów w archiwum ---
+FULL = 'full'        # cały plik
+APPEND = 'append'    # bajty dopisane od offsetu
+DELTA = 'delta'      # zmienione wiersze tabeli (customers.csv / products.xlsx)
+
+
+# --- Sumy kontrolne ---
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _tail_sum(path, size):
+    """Suma kontrolna ostatnich TAIL_BYTES bajtów przed pozycją size (wykrywa przepisanie pliku)."""
+    start = max(0, size - TAIL_BYTES)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return _digest(f.read(size - start))
+
+
+def _cell(v):
+    """Tekst komórki do sumy kontrolnej (5.0 i 5 to ta sama wartość po zapisie do Excela)."""
+    if v is None:
+        return ''
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return str(v)
+
+
+def _row_sum(values):
+    return _digest('\x1f'.join(map(_cell, values)).encode('utf-8'))
+
+
+def _row_keys(rows):
+    """
+    Klucze wierszy tabeli: ID, a dla kolejnych wierszy z tym samym ID – ID i numer wystąpienia
+    (ID\x1f1, ID\x1f2, ...). Przy unikalnych ID klucz to samo ID.
+    """
+    seen = collections.Counter()
+    keys = []
+    for r in rows:
+        pid = str(r[0])
+        keys.append(f"{pid}\x1f{seen[pid]}" if seen[pid] else pid)
+        seen[pid] += 1
+    return keys
+
+
+def _table_sum(sums):
+    """Suma kontrolna całej tabeli – niezależna od kolejności wierszy i zapisu pliku."""
+    return _digest('\n'.join(sorted(sums)).encode('ascii'))
+
+
+def _file_crc(path, size):
+    """CRC32 pierwszych size bajtów pliku (czytanych strumieniowo)."""
+    crc = 0
+    with open(path, 'rb') as f:
+        while size and (chunk := f.read(min(size, 1 << 20))):
+            crc = zlib.crc32(chunk, crc)
+            size -= len(chunk)
+    return crc
+
+
+class _CrcReader:
+    """Źródło danych dla tarfile – przekazuje bajty pliku i przedłuża o nie sumę CRC32."""
+
+    def __init__(self, f, crc=0):
+        self._f = f
+        self.crc = crc
+
+    def read(self, n=-1):
+        data = self._f.read(n)
+        self.crc = zlib.crc32(data, self.crc)
+        return data
+
+
+# --- Manifest ---
+def load_manifest(backup_dir):
+    """Wczytuje manifest katalogu kopii albo zwraca pusty (brak kopii)."""
+    try:
+        with open(os.path.join(backup_dir, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'seq': 0, 'files': {}, 'tables': {}, 'archives': []}
+
+
+def _save_manifest(backup_dir, manifest):
+    path = os.path.join(backup_dir, MANIFEST)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+# --- Odczyt tabel ---
+def _customer_rows(path):
+    """Zwraca (nagłówek, lista wierszy) pliku customers.csv."""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        return header, [r for r in reader if r]
+
+
+def _product_rows(path):
+    """Zwraca (nagłówek, lista wierszy) pliku products.xlsx (openpyxl, tylko odczyt)."""
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(h) for h in next(rows, ())]
+        return header, [list(r) for r in rows if r and r[0] is not None]
+    finally:
+        wb.close()
+
+
+TABLES = {CUSTOMERS: _customer_rows, PRODUCTS: _product_rows}
+
+
+# --- Kopia ---
+def _store_files(root):
+    """Ścieżki względne plików sklepu: wszystko w data/ i DATABASE/ (bez plików tymczasowych)."""
+    for sub in ('data', 'DATABASE'):
+        top = os.path.join(root, sub)
+        if not os.path.isdir(top):
+            continue
+        with os.scandir(top) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    yield f"{sub}/{entry.name}", entry
+
+
+def _add_bytes(tar, name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+
+def _add_range(tar, name, path, offset, size, crc=0):
+    """
+    Dodaje do archiwum bajty [offset, size) pliku – strumieniowo, bez wczytywania całości.
+    :param crc: CRC32 bajtów [0, offset) pliku
+    :return: CRC32 bajtów [0, size) – liczone z tych samych bajtów, które trafiły do archiwum
+    """
+    info = tarfile.TarInfo(name)
+    info.size = size - offset
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        reader = _CrcReader(f, crc)
+        tar.addfile(info, reader)
+    return reader.crc
+
+
+def _backup_table(tar, rel, path, old, changes):
+    """
+    Zapisuje tabelę w całości (pierwsza kopia, zmiana nagłówka) albo tylko zmienione wiersze.
+    Zwraca (nowy stan tabeli: nagłówek, sumy kontrolne wierszy po kluczu z _row_keys, liczba wierszy
+    i suma całej tabeli; bajty zapisanych danych).
+    """
+    header, rows = TABLES[rel](path)
+    keys = _row_keys(rows)
+    sums = {key: _row_sum(r) for key, r in zip(keys, rows)}
+    size = 0
+    if not old or old['header'] != header:
+        size = os.path.getsize(path)
+        _add_range(tar, rel, path, 0, size)
+        changes.append({'path': rel, 'kind': FULL})
+    else:
+        old_sums = old['rows']
+        changed = [(key, r) for key, r in zip(keys, rows) if old_sums.get(key) != sums[key]]
+        deleted = [key for key in old_sums if key not in sums]
+        if changed or deleted:
+            payload = json.dumps({'header': header, 'keys': [key for key, _ in changed],
+                                  'rows': [r for _, r in changed], 'deleted': deleted},
+                                 ensure_ascii=False, default=str).encode('utf-8')
+            _add_bytes(tar, rel + '.delta', payload)
+            changes.append({'path': rel, 'kind': DELTA, 'rows': len(changed), 'deleted': len(deleted)})
+            size = len(payload)
+    return {'header': header, 'rows': sums, 'count': len(rows), 'sum': _table_sum(sums.values())}, size
+
+
+def backup(backup_dir, full=False, compresslevel=6):
+    """
+    Zapisuje kopię bieżącego sklepu do katalogu kopii (pełną albo przyrostową).
+    :param backup_dir: katalog na archiwa i manifest
+    :param full: wymusza pełną kopię (nowy łańcuch kopii przyrostowych)
+    :param compresslevel: poziom kompresji gzip (1 – najszybciej, 9 – najmniejsze archiwum)
+    :return: wpis archiwum z manifestu (nazwa, rodzaj, liczba plików, bajty danych i archiwum)
+    """
+    store = current_store()
+    os.makedirs(backup_dir, exist_ok=True)
+    manifest = load_manifest(backup_dir)
+    if full or not manifest['archives']:
+        manifest['files'], manifest['tables'] = {}, {}
+        kind = FULL
+    else:
+        kind = 'incremental'
+    seq = manifest['seq'] + 1
+    name = f"frog-{seq:05d}-{kind}.tar.gz"
+    files, tables = manifest['files'], manifest['tables']
+    changes, seen, data_bytes = [], set(), 0
+
+    tmp = os.path.join(backup_dir, f"{name}.{os.getpid()}.tmp")
+    with tarfile.open(tmp, 'w:gz', compresslevel=compresslevel) as tar:
+        for rel, entry in _store_files(store.root):
+            seen.add(rel)
+            st = entry.stat()
+            old = files.get(rel)
+            if old and old['size'] == st.st_size and old['mtime'] == st.st_mtime_ns:
+                continue  # Niezmieniony – bez czytania pliku
+            size = st.st_size
+            if rel in TABLES:
+                tables[rel], shipped = _backup_table(tar, rel, entry.path, tables.get(rel), changes)
+                data_bytes += shipped
+            elif old and 0 < old['size'] <= size and _tail_sum(entry.path, old['size']) == old['tail']:
+                crc = old.get('crc')
+                if crc is None:  # Manifest starszej kopii – suma dotychczasowej części liczona raz
+                    crc = _file_crc(entry.path, old['size'])
+                if size > old['size']:  # Plik tylko dopisywany – wysyłamy nowy zakres bajtów
+                    crc = _add_range(tar, rel, entry.path, old['size'], size, crc)
+                    changes.append({'path': rel, 'kind': APPEND, 'offset': old['size']})
+                    data_bytes += size - old['size']
+            else:
+                crc = _add_range(tar, rel, entry.path, 0, size)
+                changes.append({'path': rel, 'kind': FULL})
+                data_bytes += size
+            files[rel] = {'size': size, 'mtime': st.st_mtime_ns, 'tail': _tail_sum(entry.path, size)}
+            if rel not in TABLES:  # Tabele sprawdza suma wierszy, nie suma pliku
+                files[rel]['crc'] = crc
+        removed = sorted(set(files) - seen)
+        for rel in removed:
+            del files[rel]
+            tables.pop(rel, None)
+        index = {'seq': seq, 'kind': kind, 'store': store.name,
+                 'created': datetime.datetime.now().isoformat(timespec='seconds'),
+                 'changes': changes, 'removed': removed}
+        _add_bytes(tar, INDEX, json.dumps(index, ensure_ascii=False).encode('utf-8'))
+    os.replace(tmp, os.path.join(backup_dir, name))
+
+    entry = {'seq': seq, 'name': name, 'kind': kind, 'created': index['created'],
+             'changes': len(changes), 'removed': len(removed), 'data_bytes': data_bytes,
+             'archive_bytes': os.path.getsize(os.path.join(backup_dir, name))}
+    manifest['seq'] = seq
+    manifest['archives'].append(entry)
+    _save_manifest(backup_dir, manifest)
+    return entry
+
+
+# --- Odtwarzanie ---
+def _apply_delta(path, rel, delta):
+    """Nakłada zmienione wiersze i usunięcia na odtworzoną tabelę (kolejność wierszy zachowana)."""
+    header, rows = TABLES[rel](path)
+    by_key = dict(zip(_row_keys(rows), rows))
+    for key in delta['deleted']:
+        by_key.pop(key, None)
+    keys = delta.get('keys') or [str(r[0]) for r in delta['rows']]  # Starsze kopie: klucz to ID
+    for key, r in zip(keys, delta['rows']):
+        by_key[key] = r  # Zmieniony zostaje na swoim miejscu, nowy trafia na koniec
+    if rel == CUSTOMERS:
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(delta['header'])
+            writer.writerows(by_key.values())
+    else:
+        pd.DataFrame(list(by_key.values()), columns=delta['header']).to_excel(path, index=False)
+
+
+def restore(backup_dir, target, upto=None):
+    """
+    Odtwarza sklep w katalogu target (musi być pusty lub nie istnieć) z ostatniej pełnej kopii
+    i kolejnych przyrostowych – do kopii numer upto włącznie (domyślnie do najnowszej).
+    Po odtworzeniu do najnowszej kopii rozmiary i sumy kontrolne plików są porównywane z manifestem.
+    :return: lista nazw zastosowanych archiwów
+    """
+    manifest = load_manifest(backup_dir)
+    archives = [a for a in manifest['archives'] if upto is None or a['seq'] <= upto]
+    if not archives:
+        raise FileNotFoundError("Brak kopii do odtworzenia.")
+    start = max(i for i, a in enumerate(archives) if a['kind'] == FULL)
+    chain = archives[start:]
+    if os.path.isdir(target) and os.listdir(target):
+        raise FileExistsError(f"Katalog docelowy nie jest pusty: {target}")
+
+    for archive in chain:
+        with tarfile.open(os.path.join(backup_dir, archive['name']), 'r:gz') as tar:
+            members = {m.name: m for m in tar.getmembers()}  # getmember() szuka liniowo
+            index = json.load(tar.extractfile(members[INDEX]))
+            for change in index['changes']:
+                rel = change['path']
+                path = os.path.join(target, *rel.split('/'))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if change['kind'] == DELTA:
+                    _apply_delta(path, rel, json.load(tar.extractfile(members[rel + '.delta'])))
+                    continue
+                src = tar.extractfile(members[rel])
+                with open(path, 'r+b' if change['kind'] == APPEND else 'wb') as f:
+                    if change['kind'] == APPEND:
+                        if os.path.getsize(path) < change['offset']:
+                            raise ValueError(f"Brakuje danych przed dopisanym zakresem: {rel}")
+                        f.seek(change['offset'])
+                        f.truncate()
+                    while chunk := src.read(1 << 20):
+                        f.write(chunk)
+            for rel in index['removed']:
+                path = os.path.join(target, *rel.split('/'))
+                if os.path.exists(path):
+                    os.remove(path)
+
+    if chain[-1]['seq'] == manifest['seq']:
+        verify(target, manifest)
+    return [a['name'] for a in chain]
+
+
+def verify(target, manifest):
+    """
+    Porównuje odtworzone pliki z manifestem: rozmiar i suma kontrolna całego pliku,
+    a dla tabel – liczba wierszy, sumy wierszy i suma całej tabeli
+    (plik tabeli zapisany na nowo nie musi być identyczny bajt w bajt).
+    """
+    for rel, state in manifest['files'].items():
+        path = os.path.join(target, *rel.split('/'))
+        if rel in manifest['tables']:
+            table = manifest['tables'][rel]
+            _, rows = TABLES[rel](path)
+            sums = {key: _row_sum(r) for key, r in zip(_row_keys(rows), rows)}
+            same = sums == table['rows'] and len(rows) == table.get('count', len(rows))
+            if same and 'sum' in table:  # Manifesty starszych kopii nie mają sumy tabeli
+                same = _table_sum(sums.values()) == table['sum']
+            if not same:
+                raise ValueError(f"Wiersze tabeli różnią się od kopii: {rel}")
+        else:
+            same = os.path.getsize(path) == state['size'] and _tail_sum(path, state['size']) == state['tail']
+            if same and 'crc' in state:  # Manifesty starszych kopii nie mają sumy CRC32
+                same = _file_crc(path, state['size']) == state['crc']
+            if not same:
+                raise ValueError(f"Plik różni się od kopii: {rel}")
+
+
+def main(argv=None):
+    """Punkt wejścia wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Kopie zapasowe danych sklepu")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('backup', help="pełna lub przyrostowa kopia bieżącego sklepu")
+    p.add_argument('backup_dir')
+    p.add_argument('--full', action='store_true', help="wymuś pełną kopię")
+    p.add_argument('--level', type=int, default=6, help="poziom kompresji gzip 1-9")
+    p.add_argument('--store', default=current_store(), help="katalog sklepu (domyślnie projekt)")
+    p = sub.add_parser('restore', help="odtworzenie sklepu do pustego katalogu")
+    p.add_argument('backup_dir')
+    p.add_argument('target')
+    p.add_argument('--upto', type=int, help="numer ostatniej kopii do zastosowania")
+    p = sub.add_parser('list', help="lista archiwów w katalogu kopii")
+    p.add_argument('backup_dir')
+    args = parser.parse_args(argv)
+
+    if args.command == 'backup':
+        with use_store(store_at(args.store)):
+            entry = backup(args.backup_dir, args.full, args.level)
+        print(f"{entry['name']}: zmian={entry['changes']} usuniętych={entry['removed']}"
+              f" dane={entry['data_bytes']} B archiwum={entry['archive_bytes']} B")
+    elif args.command == 'restore':
+        for name in restore(args.backup_dir, args.target, args.upto):
+            print(f"Zastosowano {name}")
+    else:
+        for a in load_manifest(args.backup_dir)['archives']:
+            print(f"{a['seq']:>5} {a['created']} {a['kind']:<12} zmian={a['changes']:<8}"
+                  f" archiwum={a['archive_bytes']} B")
+    return 0
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Moduł koszyka zakupowego sklepu Żabka.
+Koszyk przechowuje ilości per ID produktu (ponowne dodanie scala pozycje),
+pilnuje stanów magazynowych przy dodawaniu i utrzymuje sumę przyrostowo,
+bez czytania pliku z produktami przy każdej zmianie.
+"""
+
+# --- Importy ---
+from frog.pricing import price_cart
+
+
+class Cart:
+    """
+    Koszyk: słownik ID -> ilość oraz bieżąca suma w groszach.
+    Ceny i stany pochodzą z indeksu katalogu (pricing.build_catalog),
+    więc dodanie i usunięcie pozycji to operacje O(1) bez I/O.
+    """
+
+    def __init__(self, catalog, rules=()):
+        self.catalog = catalog
+        self.rules = list(rules)
+        self._items = {}      # ID -> ilość (kolejność dodawania zachowana)
+        self._subtotal = 0    # Suma brutto w groszach (liczby całkowite – bez błędów zaokrągleń)
+
+    # --- Pomocnicze ---
+    def _unit_price(self, pid):
+        """Cena jednostkowa produktu w groszach."""
+        return int(round(self.catalog['prices'][self.catalog['index'][pid]] * 100))
+
+    def _position(self, pid):
+        """Pozycja produktu w katalogu lub KeyError dla nieznanego ID."""
+        pos = self.catalog['index'].get(pid)
+        if pos is None:
+            raise KeyError(f"Nieznany produkt: {pid}")
+        return pos
+
+    # --- Operacje na koszyku ---
+    def available(self, pid):
+        """Ile sztuk produktu można jeszcze dodać (stan magazynu minus ilość w koszyku)."""
+        pos = self._position(str(pid))
+        return int(self.catalog['stock'][pos]) - self._items.get(str(pid), 0)
+
+    def add(self, pid, qty=1):
+        """
+        Dodaje qty sztuk produktu (scala z istniejącą pozycją).
+        Podnosi ValueError, jeśli ilość jest niepoprawna lub przekracza stan magazynu.
+        """
+        pid = str(pid)
+        if qty <= 0:
+            raise ValueError("Ilość musi być dodatnia.")
+        if qty > self.available(pid):
+            raise ValueError(f"Brak wystarczającej ilości produktu {pid} w magazynie.")
+        self._items[pid] = self._items.get(pid, 0) + qty
+        self._subtotal += self._unit_price(pid) * qty
+
+    def remove(self, pid, qty=None):
+        """Usuwa qty sztuk produktu (domyślnie całą pozycję)."""
+        pid = str(pid)
+        current = self._items.get(pid, 0)
+        if not current:
+            return
+        qty = current if qty is None else min(qty, current)
+        if qty == current:
+            del self._items[pid]
+        else:
+            self._items[pid] = current - qty
+        self._subtotal -= self._unit_price(pid) * qty
+
+    def clear(self):
+        """Opróżnia koszyk."""
+        self._items.clear()
+        self._subtotal = 0
+
+    def set_catalog(self, catalog):
+        """
+        Podmienia indeks katalogu (np. po odświeżeniu listy produktów).
+        Pozycje, których nie ma już w katalogu, są usuwane, a ilości większe niż nowy stan
+        magazynu – zmniejszane do tego stanu; suma liczona od nowa.
+        :return: słownik ID -> (ilość przed, ilość po) zmienionych pozycji (0 = pozycja usunięta)
+        """
+        self.catalog = catalog
+        index, stock = catalog['index'], catalog['stock']
+        adjusted, items = {}, {}
+        for pid, qty in self._items.items():
+            allowed = min(qty, max(int(stock[index[pid]]), 0)) if pid in index else 0
+            if allowed != qty:
+                adjusted[pid] = (qty, allowed)
+            if allowed:
+                items[pid] = allowed
+        self._items = items
+        self._subtotal = sum(self._unit_price(pid) * qty for pid, qty in self._items.items())
+        return adjusted
+
+    # --- Odczyt ---
+    def quantity(self, pid):
+        """Ilość danego produktu w koszyku."""
+        return self._items.get(str(pid), 0)
+
+    def items(self):
+        """Lista par (ID, ilość) w kolejności dodawania."""
+        return list(self._items.items())
+
+    def to_purchase(self):
+        """Zwarta postać koszyka dla purchase_products (lista krotek ID, ilość)."""
+        return self.items()
+
+    @property
+    def subtotal(self):
+        """Suma brutto (bez promocji) w PLN – utrzymywana przyrostowo."""
+        return self._subtotal / 100
+
+    def price(self):
+        """Pełna wycena koszyka z promocjami (pozycje, rabaty, suma)."""
+        return price_cart(self.catalog, self.items(), self.rules)
+
+    @property
+    def total(self):
+        """Kwota do zapłaty; bez promocji równa sumie przyrostowej (O(1))."""
+        if not self.rules:
+            return self.subtotal
+        return self.price()['total']
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self.items())
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __repr__(self):
+        return f"Cart({self.items()!r})"
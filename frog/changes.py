@@ -0,0 +1,226 @@
+"""
+Moduł powiadomień o zmianach danych sklepu Żabka (change feed).
+Każdy zapis katalogu (products.xlsx) i klientów (customers.csv) dopisuje jedną linię JSON
+do dziennika zmian data/changes.log: tabelę, operację, ID i nowy wiersz. Wersja danych
+to rozmiar dziennika w bajtach – rośnie z każdą zmianą, a sprawdzenie jej to jeden stat().
+Otwarte okna i pamięci podręczne (np. indeks klientów) zapamiętują wersję, przy której
+wczytały dane, i nakładają tylko zmiany dopisane później, zamiast czytać cały plik od nowa.
+Zmiany stanów magazynowych pochodzą z dziennika magazynowego (frog.inventory).
+
+Zmiany, których nie ma w dzienniku (ręczna edycja pliku, usunięty dziennik), są wykrywane
+po rozmiarze i czasie modyfikacji pliku – wtedy odbiorca dostaje RESET i wczytuje tabelę od nowa.
+Zawiera: Change, record, version, read, Feed, apply.
+"""
+
+# --- Importy ---
+import datetime
+import json
+import os
+from collections import namedtuple
+
+from frog import inventory
+from frog.store import current_store, store_at, use_store
+
+# --- Tabele i operacje ---
+PRODUCTS = 'products'     # wiersze products.xlsx
+CUSTOMERS = 'customers'   # wiersze customers.csv
+STOCK = 'stock'           # stany magazynowe (z dziennika magazynowego)
+TABLES = (PRODUCTS, CUSTOMERS, STOCK)
+
+UPSERT = 'upsert'   # nowy albo zmieniony wiersz
+DELETE = 'delete'   # usunięty wiersz
+RESET = 'reset'     # nie da się odtworzyć zmian – tabelę trzeba wczytać od nowa
+
+PRIVATE_FIELDS = ('PasswordHash',)  # Pola, które nie trafiają do dziennika zmian
+
+# Jedna zmiana: tabela, operacja, ID wiersza i nowe wartości (słownik; None dla DELETE i RESET)
+Change = namedtuple('Change', 'table op id row')
+
+
+def _jsonable(value):
+    """Wartości z pandas / NumPy (np.int64, Timestamp) zamienia na typy JSON."""
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+# --- Zapis ---
+def record(table, entries):
+    """
+    Dopisuje zmiany jednej tabeli do dziennika zmian bieżącego sklepu (jeden zapis).
+    :param table: PRODUCTS albo CUSTOMERS
+    :param entries: lista krotek (operacja, ID, wiersz), np. [(UPSERT, 'P001', {...})]
+    """
+    if not entries:
+        return
+    path = current_store().changes_log
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    stamp = datetime.datetime.now().isoformat(timespec='seconds')
+    lines = []
+    for op, key, row in entries:
+        if row is not None:
+            row = {k: v for k, v in row.items() if k not in PRIVATE_FIELDS}
+        lines.append(json.dumps({'t': stamp, 'table': table, 'op': op, 'id': str(key), 'row': row},
+                                ensure_ascii=False, default=_jsonable) + '\n')
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(''.join(lines))
+
+
+# --- Odczyt ---
+def version():
+    """Wersja danych bieżącego sklepu – rozmiar dziennika zmian w bajtach (0 bez dziennika)."""
+    try:
+        return os.stat(current_store().changes_log).st_size
+    except FileNotFoundError:
+        return 0
+
+
+def read(offset, tables=None):
+    """
+    Czyta zmiany dopisane do dziennika za offsetem.
+    :param offset: wersja, do której zmiany są już znane
+    :param tables: tabele do zwrócenia (None = wszystkie)
+    :return: (nowa wersja, lista Change) albo (0, None), gdy dziennik skrócono lub usunięto
+             i zmian za offsetem nie da się odtworzyć.
+    Niepełna ostatnia linia (zapis w toku) zostaje do następnego odczytu.
+    """
+    path = current_store().changes_log
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < offset:
+                return 0, None
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return (0, []) if offset == 0 else (0, None)
+    end = data.rfind(b'\n') + 1
+    found = []
+    for line in data[:end].decode('utf-8').splitlines():
+        try:
+            entry = json.loads(line)
+            change = Change(entry['table'], entry['op'], entry['id'], entry['row'])
+        except (ValueError, KeyError, TypeError):
+            continue  # Uszkodzona linia – pomijamy
+        if tables is None or change.table in tables:
+            found.append(change)
+    return offset + end, found
+
+
+def _signature(path):
+    """Rozmiar i czas modyfikacji pliku (None, gdy go nie ma)."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _size(path):
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return 0
+
+
+# --- Subskrypcja zmian ---
+class Feed:
+    """
+    Kursor dziennika zmian jednego sklepu dla okna lub pamięci podręcznej.
+    Zaczyna od bieżącej wersji: odbiorca wczytuje dane, a potem co jakiś czas woła
+    pending() (same stat(), prawie nic nie kosztuje) i – gdy coś się zmieniło – poll().
+    Zmiany już zawarte we wczytanych danych mogą przyjść jeszcze raz; są idempotentne
+    (pełne wiersze, bezwzględne stany), więc ponowne nałożenie niczego nie psuje.
+    """
+
+    def __init__(self, store=None, tables=(PRODUCTS, STOCK)):
+        self.store = store_at(store or current_store())
+        self.tables = tuple(tables)
+        self._files = {PRODUCTS: self.store.products_xlsx, CUSTOMERS: self.store.customers_csv}
+        self._offset = _size(self.store.changes_log)
+        self._journal_offset = _size(self.store.inventory_log)
+        self._signatures = self._file_signatures()
+
+    def _file_signatures(self):
+        return {t: _signature(self._files[t]) for t in self.tables if t in self._files}
+
+    def pending(self):
+        """Czy od ostatniego poll() zmienił się dziennik zmian, dziennik magazynowy lub plik tabeli."""
+        if _size(self.store.changes_log) != self._offset:
+            return True
+        if STOCK in self.tables and _size(self.store.inventory_log) != self._journal_offset:
+            return True
+        return self._file_signatures() != self._signatures
+
+    def poll(self):
+        """
+        Zwraca listę Change od ostatniego wywołania (pustą, gdy nic się nie zmieniło).
+        Wiersze produktów i zmiany STOCK niosą bieżący stan z dziennika magazynowego.
+        """
+        with use_store(self.store):
+            result = []
+            offset, found = read(self._offset, self.tables)
+            if found is None:  # Dziennik zmian skrócony – nie wiemy, co pominęliśmy
+                result.extend(Change(t, RESET, None, None) for t in self._files if t in self.tables)
+                found = []
+            self._offset = offset
+
+            # Plik zmieniony bez wpisu w dzienniku (np. ręczna edycja) – tabela od nowa
+            signatures = self._file_signatures()
+            for table, signature in signatures.items():
+                if signature != self._signatures.get(table) and \
+                        not any(c.table == table for c in found + result):
+                    result.append(Change(table, RESET, None, None))
+            self._signatures = signatures
+            result.extend(found)
+
+            if STOCK in self.tables:
+                result.extend(self._stock_changes(found))
+            return result
+
+    def _stock_changes(self, found):
+        """Zmiany STOCK dla produktów z nowymi zdarzeniami magazynowymi; uzupełnia stany w wierszach."""
+        journal = self.store.inventory_log
+        if not os.path.exists(journal):
+            return []
+        if _size(journal) < self._journal_offset:
+            self._journal_offset = 0
+            return [Change(STOCK, RESET, None, None)]
+        self._journal_offset, events = inventory.read_events(journal, self._journal_offset)
+        upserts = [c for c in found if c.table == PRODUCTS and c.op == UPSERT]
+        if not events and not upserts:
+            return []
+        stock = inventory.current_stock()
+        for c in upserts:
+            if c.id in stock:
+                c.row['Ilość_w_magazynie'] = stock[c.id]
+        touched = dict.fromkeys(pid for _, pid, _ in events if pid in stock)
+        return [Change(STOCK, UPSERT, pid, {'Ilość_w_magazynie': stock[pid]}) for pid in touched]
+
+
+# --- Nakładanie zmian ---
+def apply(records, changes, table=PRODUCTS):
+    """
+    Nakłada zmiany na słownik ID -> wiersz (w miejscu). Zmiany STOCK aktualizują
+    tylko istniejące wiersze; zmiany innych tabel niż table i STOCK są pomijane.
+    :return: (ID wierszy, w których zmieniły się tylko stany, czy zmienił się skład lub treść wierszy)
+             albo None, gdy wśród zmian jest RESET i dane trzeba wczytać od nowa.
+    """
+    stock_only, structural = set(), False
+    for c in changes:
+        if c.table not in (table, STOCK):
+            continue
+        if c.op == RESET:
+            return None
+        if c.table == STOCK:
+            row = records.get(c.id)
+            if row is not None:
+                row.update(c.row)
+                stock_only.add(c.id)
+        elif c.op == DELETE:
+            structural |= records.pop(c.id, None) is not None
+        else:
+            row = records.get(c.id)
+            if row is None:
+                records[c.id] = row = {}
+            row.update(c.row)
+            structural = True
+    return stock_only, structural
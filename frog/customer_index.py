@@ -0,0 +1,290 @@
+"""
+Moduł indeksów wyszukiwania klientów sklepu Żabka.
+Indeksy pomocnicze trzymane w pamięci procesu (osobno dla każdego sklepu) to posortowane
+tablice kluczy: nazwisk, domen emaili, odwróconych numerów telefonu i dat rejestracji.
+Prefiks nazwiska, domena, sufiks telefonu i zakres dat to zawsze ciągły przedział
+pozycji w takiej tablicy (bisect). Dla każdego klienta pamiętamy też jego pozycję (rangę)
+w każdym indeksie, więc kolejne warunki zapytania sprawdzane są wektorowo (NumPy)
+na kandydatach z najbardziej selektywnego indeksu.
+
+Indeks jest aktualizowany przy rejestracji, zmianie danych i usuwaniu klientów
+(maintained()). Zmiany zapisane przez inne procesy są doczytywane z dziennika zmian
+(frog.changes); zmiana pliku customers.csv bez wpisu w dzienniku (ręczna edycja)
+jest wykrywana po rozmiarze i czasie modyfikacji – wtedy indeks budowany jest od nowa.
+Zawiera: CustomerIndex, get_index, maintained, search.
+"""
+
+# --- Importy ---
+import bisect
+import contextlib
+import os
+import threading
+
+import numpy as np
+
+from frog import changes
+from frog.records import Customer, load_customer_records
+from frog.store import current_store
+
+# Indeksy zbudowane w tym procesie – klucz to ścieżka customers.csv sklepu
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+NON_NUMERIC_ID = 2 ** 62  # Klucz sortowania dla ID, które nie są liczbą (na końcu wyników)
+
+
+# --- Klucze indeksów ---
+def _surname_key(c):
+    return c.nazwisko.casefold()
+
+
+def _domain_key(c):
+    return c.email.rpartition('@')[2].casefold()
+
+
+def _phone_key(c):
+    """Cyfry numeru w odwrotnej kolejności – sufiks numeru staje się prefiksem klucza."""
+    return ''.join(ch for ch in c.telefon if ch.isdigit())[::-1]
+
+
+def _date_key(c):
+    return c.data_rejestracji
+
+
+def _signature(path):
+    """Podpis pliku (rozmiar, czas modyfikacji, i-węzeł) do wykrywania zmian z zewnątrz."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+class _SortedKeys:
+    """
+    Posortowana tablica kluczy, równoległa tablica numerów wierszy (klientów)
+    i ranga każdego wiersza – jego pozycja w tablicy (-1 dla wierszy spoza indeksu).
+    """
+
+    def __init__(self, keys, capacity):
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.keys = [keys[r] for r in order]
+        self.rows = np.array(order, dtype=np.int64)
+        self.rank = np.full(capacity, -1, dtype=np.int64)
+        self.rank[self.rows] = np.arange(len(order))
+
+    def resize(self, capacity):
+        rank = np.full(capacity, -1, dtype=np.int64)
+        rank[:len(self.rank)] = self.rank
+        self.rank = rank
+
+    def add(self, key, row):
+        i = bisect.bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.rows = np.insert(self.rows, i, row)
+        self.rank[self.rank >= i] += 1
+        self.rank[row] = i
+
+    def remove(self, row):
+        i = int(self.rank[row])
+        del self.keys[i]
+        self.rows = np.delete(self.rows, i)
+        self.rank[self.rank > i] -= 1
+        self.rank[row] = -1
+
+    def span(self, lo, hi):
+        """Przedział pozycji kluczy lo <= klucz <= hi (None = bez granicy)."""
+        start = 0 if lo is None else bisect.bisect_left(self.keys, lo)
+        end = len(self.keys) if hi is None else bisect.bisect_right(self.keys, hi)
+        return start, max(start, end)
+
+    def prefix_span(self, prefix):
+        """Przedział pozycji kluczy zaczynających się od prefix."""
+        start = bisect.bisect_left(self.keys, prefix)
+        return start, bisect.bisect_left(self.keys, prefix + '\U0010ffff', start)
+
+
+class CustomerIndex:
+    """
+    Indeksy wyszukiwania klientów jednego pliku customers.csv.
+    Klienci mają stałe numery wierszy; usunięty wiersz zostaje pusty (None).
+    Metody add / remove / update utrzymują indeksy po zmianach wykonanych w tym procesie.
+    """
+    KEYS = {'surname': _surname_key, 'domain': _domain_key, 'phone': _phone_key, 'date': _date_key}
+
+    def __init__(self, records, signature=None, version=0):
+        self.signature = signature
+        self.version = version                     # Wersja dziennika zmian, do której indeks jest aktualny
+        self.lock = threading.RLock()
+        self.records = list(records)               # Wiersz -> Customer (None po usunięciu)
+        self._row = {c.id: row for row, c in enumerate(self.records)}
+        capacity = max(len(self.records), 16)
+        self._order = np.full(capacity, NON_NUMERIC_ID, dtype=np.int64)  # Klucz sortowania po ID
+        self._order[:len(self.records)] = [int(c.id) if c.id.isdigit() else NON_NUMERIC_ID
+                                           for c in self.records]
+        self._indexes = {name: _SortedKeys([key(c) for c in self.records], capacity)
+                         for name, key in self.KEYS.items()}
+
+    def __len__(self):
+        return len(self._row)
+
+    # --- Utrzymanie indeksów ---
+    def add(self, customer):
+        """Dodaje klienta (Customer albo słownik w formacie wiersza CSV); istniejący jest podmieniany."""
+        if isinstance(customer, dict):
+            customer = Customer(*(str(customer.get(k) or '') for k in (
+                'ID', 'Imię', 'Nazwisko', 'Email', 'Data_rejestracji', 'PasswordHash', 'Telefon')))
+        with self.lock:
+            self.remove(customer.id)
+            row = len(self.records)
+            if row >= len(self._order):  # Brak miejsca – podwajamy tablice
+                capacity = 2 * len(self._order)
+                order = np.full(capacity, NON_NUMERIC_ID, dtype=np.int64)
+                order[:row] = self._order[:row]
+                self._order = order
+                for index in self._indexes.values():
+                    index.resize(capacity)
+            self.records.append(customer)
+            self._row[customer.id] = row
+            self._order[row] = int(customer.id) if customer.id.isdigit() else NON_NUMERIC_ID
+            for name, key in self.KEYS.items():
+                self._indexes[name].add(key(customer), row)
+
+    def remove(self, customer_id):
+        """Usuwa klienta o danym ID (brak klienta nie jest błędem)."""
+        with self.lock:
+            row = self._row.pop(customer_id, None)
+            if row is None:
+                return
+            self.records[row] = None
+            for index in self._indexes.values():
+                index.remove(row)
+
+    def update(self, customer):
+        """Podmienia dane klienta (np. po zmianie emaila lub telefonu)."""
+        self.add(customer)
+
+    def apply(self, found):
+        """
+        Nakłada zmiany klientów z dziennika zmian. Hasła nie ma w dzienniku: zmieniony klient
+        zachowuje dotychczasowy skrót, nowy ma pusty (logowanie i tak czyta customers.csv).
+        """
+        with self.lock:
+            for change in found:
+                if change.op == changes.DELETE:
+                    self.remove(change.id)
+                    continue
+                row = dict(change.row)
+                old = self._row.get(change.id)
+                if old is not None and 'PasswordHash' not in row:
+                    row['PasswordHash'] = self.records[old].password_hash
+                self.add(row)
+
+    # --- Wyszukiwanie ---
+    def search(self, surname=None, email_domain=None, phone_suffix=None,
+               registered_from=None, registered_to=None, limit=None):
+        """
+        Zwraca klientów spełniających wszystkie podane warunki (posortowanych po ID).
+        :param surname: prefiks nazwiska (bez rozróżniania wielkości liter)
+        :param email_domain: domena emaila, np. 'gmail.com'
+        :param phone_suffix: końcówka numeru telefonu (liczą się tylko cyfry)
+        :param registered_from: pierwsza data rejestracji RRRR-MM-DD (włącznie)
+        :param registered_to: ostatnia data rejestracji RRRR-MM-DD (włącznie)
+        :param limit: maksymalna liczba wyników (None = wszystkie)
+        :return: lista obiektów Customer
+        """
+        with self.lock:
+            # Każdy warunek to przedział pozycji [start, end) w jednym z indeksów
+            spans = []
+            if surname:
+                spans.append(('surname', self._indexes['surname'].prefix_span(surname.casefold())))
+            if email_domain:
+                domain = email_domain.lstrip('@').casefold()
+                spans.append(('domain', self._indexes['domain'].span(domain, domain)))
+            if phone_suffix:
+                digits = ''.join(ch for ch in phone_suffix if ch.isdigit())[::-1]
+                spans.append(('phone', self._indexes['phone'].prefix_span(digits)))
+            if registered_from or registered_to:
+                spans.append(('date', self._indexes['date'].span(registered_from or None,
+                                                                 registered_to or None)))
+
+            if spans:
+                # Kandydaci z najbardziej selektywnego indeksu, reszta warunków na rangach
+                spans.sort(key=lambda s: s[1][1] - s[1][0])
+                name, (start, end) = spans[0]
+                rows = self._indexes[name].rows[start:end]
+                for name, (start, end) in spans[1:]:
+                    rank = self._indexes[name].rank[rows]
+                    rows = rows[(rank >= start) & (rank < end)]
+            else:
+                rows = self._indexes['surname'].rows
+
+            order = self._order[rows]
+            if limit is not None and len(rows) > limit:
+                keep = np.argpartition(order, limit)[:limit]
+                rows, order = rows[keep], order[keep]
+            rows = rows[np.argsort(order, kind='stable')]
+            records = self.records
+            return [records[row] for row in rows.tolist()]
+
+
+# --- Indeks bieżącego sklepu ---
+def _catch_up(index, signature):
+    """
+    Doczytuje do indeksu zmiany klientów z dziennika zmian. Zwraca False, gdy się nie da
+    (dziennik skrócony albo plik zmieniony bez wpisu w dzienniku) i indeks trzeba zbudować od nowa.
+    """
+    offset, found = changes.read(index.version, (changes.CUSTOMERS,))
+    if found is None or (index.signature != signature and not found):
+        return False
+    index.apply(found)
+    index.signature, index.version = signature, offset
+    return True
+
+
+def get_index():
+    """
+    Zwraca indeks klientów bieżącego sklepu – zbudowany raz na proces i doczytujący zmiany
+    innych procesów z dziennika zmian; przebudowany, gdy plik customers.csv zmieniono inaczej.
+    """
+    path = current_store().customers_csv
+    with _indexes_lock:
+        index = _indexes.get(path)
+        signature, version = _signature(path), changes.version()
+        if index is not None and (index.signature, index.version) != (signature, version):
+            with index.lock:
+                if not _catch_up(index, signature):
+                    index = None
+        if index is None:
+            index = _indexes[path] = CustomerIndex(load_customer_records(), signature, version)
+        return index
+
+
+@contextlib.contextmanager
+def maintained():
+    """
+    Otacza zapis pliku customers.csv. Zwraca (w with) indeks do zaktualizowania albo None,
+    gdy indeksu nie zbudowano lub był już nieaktualny – wtedy zostanie zbudowany przy
+    następnym zapytaniu. Po zapisie indeks przejmuje nowy podpis pliku.
+    """
+    path = current_store().customers_csv
+    index = _indexes.get(path)
+    if index is None:
+        yield None
+        return
+    with index.lock:
+        fresh = index.signature == _signature(path)
+        try:
+            yield index if fresh else None
+        except BaseException:
+            _indexes.pop(path, None)  # Zapis nieudany – nie wiemy, co trafiło do pliku
+            raise
+        if fresh:
+            index.signature = _signature(path)
+        else:
+            _indexes.pop(path, None)
+
+
+def search(**filters):
+    """Wyszukuje klientów bieżącego sklepu – argumenty jak w CustomerIndex.search."""
+    return get_index().search(**filters)
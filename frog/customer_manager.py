@@ -3,15 +3,26 @@ Moduł obsługi klientów sklepu Żabka – wersja funkcyjna.
 Zawiera funkcje do rejestracji, usuwania, aktualizacji i historii zakupów klientów.
 """
 
+import bisect
 import csv
 import os
+import re
 import datetime
+import hashlib
+import threading
 
-# Ścieżka do pliku CSV z danymi klientów
-CUSTOMERS_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'customers.csv')
+from frog import changes               # Dziennik zmian (powiadomienia dla otwartych okien)
+from frog import customer_index        # Indeksy wyszukiwania klientów
+from frog.store import current_store  # Ścieżki plików bieżącego sklepu
 
-# Ścieżka do katalogu z plikami historii zakupów klientów
-RECEIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'DATABASE')
+# Pozycja koszyka zapisana w linii paragonu, np. ('P001', 2)
+RECEIPT_ITEM = re.compile(r"\('([^']*)',\s*(\d+)\)")
+DAY = re.compile(r'\d{4}-\d{2}-\d{2}')  # Dzień RRRR-MM-DD w filtrach historii
+RECEIPT_HEAD_BYTES = 4096  # Ile bajtów z początku pliku paragonów obejmuje suma kontrolna (wykrywa przepisanie)
+
+# Indeksy offsetów plików historii zbudowane w tym procesie – klucz to ścieżka pliku
+_history_indexes = {}
+_history_lock = threading.Lock()
 
 
 def log_operation(operation):
@@ -30,9 +41,9 @@ def log_operation(operation):
 
 def load_customers():
     """Wczytuje listę klientów z pliku CSV."""
-    if not os.path.exists(CUSTOMERS_CSV):
+    if not os.path.exists(current_store().customers_csv):
         return []
-    with open(CUSTOMERS_CSV, newline='', encoding='utf-8') as csvfile:
+    with open(current_store().customers_csv, newline='', encoding='utf-8') as csvfile:
         return list(csv.DictReader(csvfile))  # Zwraca listę słowników (klientów)
 
 
@@ -41,7 +52,7 @@ def save_customers(customers):
     if not customers:
         return
     fieldnames = list(customers[0].keys())  # Pobieramy nagłówki z pierwszego rekordu
-    with open(CUSTOMERS_CSV, "w", newline='', encoding='utf-8') as csvfile:
+    with open(current_store().customers_csv, "w", newline='', encoding='utf-8') as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()               # Zapisujemy nagłówki
         writer.writerows(customers)        # Zapisujemy klientów
@@ -88,7 +99,11 @@ def register_customer(imie, nazwisko, email, password_hash, phone=""):
 
     customers.append(new_customer)  # Dodajemy do listy
     try:
-        save_customers(customers)   # Zapisujemy do pliku
+        with customer_index.maintained() as index:
+            save_customers(customers)   # Zapisujemy do pliku
+            if index:
+                index.add(new_customer)
+        changes.record(changes.CUSTOMERS, [(changes.UPSERT, new_id, new_customer)])
     except Exception as e:
         print("Błąd zapisu klienta:", e)
         raise
@@ -113,7 +128,14 @@ def delete_customer(key, by="ID"):
         return True  # Domyślnie zostawiamy wszystko
 
     new_customers = list(filter(matches, customers))  # Filtrowanie listy
-    save_customers(new_customers)
+    kept = {c['ID'] for c in new_customers}
+    removed = [c['ID'] for c in customers if c['ID'] not in kept]
+    with customer_index.maintained() as index:
+        save_customers(new_customers)
+        if index:
+            for cid in removed:
+                index.remove(cid)
+    changes.record(changes.CUSTOMERS, [(changes.DELETE, cid, None) for cid in removed])
 
 
 @log_operation("Zakup produktów przez klienta")
@@ -125,8 +147,9 @@ def purchase_products(customer_id, cart):
         return []
 
     try:
-        os.makedirs(RECEIPTS_DIR, exist_ok=True)  # Tworzy folder, jeśli nie istnieje
-        receipt_path = os.path.join(RECEIPTS_DIR, f"{customer_id}.txt")
+        receipts_dir = current_store().receipts_dir
+        os.makedirs(receipts_dir, exist_ok=True)  # Tworzy folder, jeśli nie istnieje
+        receipt_path = os.path.join(receipts_dir, f"{customer_id}.txt")
         now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
 
         # Dopisujemy zakup do pliku historii klienta
@@ -139,6 +162,187 @@ def purchase_products(customer_id, cart):
         raise
 
 
+def parse_receipt_line(line):
+    """
+    Rozbija linię historii zakupów "data -> [('P001', 2), ...]" na (data, lista pozycji).
+    Zwraca None dla linii, która nie jest paragonem. Nie używa eval.
+    """
+    dt, sep, items_str = line.strip().partition(' -> ')
+    if not sep or not items_str.startswith('['):
+        return None
+    return dt, [(pid, int(qty)) for pid, qty in RECEIPT_ITEM.findall(items_str)]
+
+
+def read_receipt_file(path, offset=0):
+    """
+    Czyta paragony z pliku historii od podanego offsetu (w bajtach).
+    Zwraca (nowy offset, lista (data, pozycje)); niepełna ostatnia linia
+    (zapis w toku) zostaje do następnego odczytu. Plik krótszy niż offset jest czytany od początku –
+    kto sumuje odczytane paragony, musi sam wykryć przepisanie pliku (receipt_file_rewritten).
+    """
+    if os.path.getsize(path) < offset:
+        offset = 0  # Plik został przepisany – czytamy od początku
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b'\n') + 1
+    receipts = []
+    for line in data[:end].decode('utf-8', errors='replace').splitlines():
+        parsed = parse_receipt_line(line)
+        if parsed:
+            receipts.append(parsed)
+    return offset + end, receipts
+
+
+def receipt_head_sum(path, size):
+    """Suma kontrolna pierwszych min(size, RECEIPT_HEAD_BYTES) bajtów pliku paragonów."""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(min(size, RECEIPT_HEAD_BYTES)), digest_size=8).hexdigest()
+
+
+def receipt_file_signature(st, path, offset):
+    """Podpis przeczytanego pliku paragonów: [i-węzeł, czas modyfikacji, suma początku pliku]."""
+    return [st.st_ino, st.st_mtime_ns, receipt_head_sum(path, offset)]
+
+
+def receipt_file_rewritten(st, path, offset, signature):
+    """
+    Sprawdza, czy plik paragonów przepisano od odczytu offset bajtów: plik jest krótszy,
+    ma inny i-węzeł albo – po zmianie czasu modyfikacji – inny początek.
+    :param st: bieżący wynik os.stat pliku
+    :param signature: podpis z receipt_file_signature z ostatniego odczytu (None – nieznany)
+    """
+    if not offset:
+        return False
+    if st.st_size < offset:
+        return True
+    if signature is None:
+        return False
+    inode, mtime, head = signature
+    if st.st_ino != inode:
+        return True
+    return st.st_mtime_ns != mtime and receipt_head_sum(path, offset) != head
+
+
+def read_new_receipts(offsets):
+    """
+    Przyrostowy odczyt paragonów ze wszystkich plików w katalogu DATABASE sklepu.
+    Zwraca listę krotek (ID klienta, data, pozycje) tylko z linii dopisanych za zapamiętanym
+    offsetem pliku; słownik offsets (ID klienta -> bajt) jest aktualizowany w miejscu.
+    """
+    new = []
+    receipts_dir = current_store().receipts_dir
+    if not os.path.isdir(receipts_dir):
+        return new
+    for name in sorted(os.listdir(receipts_dir)):
+        if not name.endswith('.txt'):
+            continue
+        cid = name[:-4]
+        offsets[cid], receipts = read_receipt_file(os.path.join(receipts_dir, name), offsets.get(cid, 0))
+        new.extend((cid, dt, items) for dt, items in receipts)
+    return new
+
+
+# --- Historia zakupów: stronicowanie po indeksie offsetów ---
+def _stamp_key(dt):
+    """Klucz sortowania daty z linii paragonu: 'RRRR-MM-DD GG:MM' dla obu formatów zapisu."""
+    return dt.replace('T', ' ', 1)[:16]
+
+
+def _history_index(path):
+    """
+    Zwraca indeks pliku historii: offsety początków linii paragonów i klucze ich dat.
+    Indeks jest budowany raz na proces i przy każdym wywołaniu dopisuje tylko linie
+    dodane na końcu pliku; przepisany (krótszy lub podmieniony) plik jest indeksowany od nowa.
+    """
+    st = os.stat(path)
+    with _history_lock:
+        index = _history_indexes.get(path)
+        if index is None or st.st_size < index['size'] or st.st_ino != index['ino']:
+            index = _history_indexes[path] = {'size': 0, 'ino': st.st_ino, 'offsets': [],
+                                              'stamps': [], 'ordered': True}
+        if st.st_size == index['size']:
+            return index
+        with open(path, 'rb') as f:
+            f.seek(index['size'])
+            data = f.read(st.st_size - index['size'])
+        offsets, stamps = index['offsets'], index['stamps']
+        pos, end = 0, data.rfind(b'\n') + 1  # Niepełna ostatnia linia – przy następnym odczycie
+        while pos < end:
+            nl = data.index(b'\n', pos)
+            sep = data.find(b' -> ', pos, nl)
+            if sep != -1:
+                stamp = _stamp_key(data[pos:sep].decode('utf-8', errors='replace'))
+                if stamps and stamp < stamps[-1]:
+                    index['ordered'] = False
+                offsets.append(index['size'] + pos)
+                stamps.append(stamp)
+            pos = nl + 1
+        index['size'] += end
+        return index
+
+
+def _candidates(index, date_from, date_to, after):
+    """Numery linii indeksu od najnowszej, w zakresie dat, za linią o offsecie kursora."""
+    offsets, stamps = index['offsets'], index['stamps']
+    if index['ordered']:
+        stop = len(offsets) if after is None else bisect.bisect_left(offsets, after)
+        lo = bisect.bisect_left(stamps, date_from, 0, stop) if date_from else 0
+        hi = bisect.bisect_right(stamps, date_to + '\uffff', lo, stop) if date_to else stop
+        return range(hi - 1, lo - 1, -1)
+    # Plik z datami nie po kolei (np. ręcznie sklejony) – sortujemy pasujące linie po dacie
+    order = sorted((i for i in range(len(offsets))
+                    if (not date_from or stamps[i] >= date_from)
+                    and (not date_to or stamps[i][:10] <= date_to)),
+                   key=lambda i: (stamps[i], i), reverse=True)
+    if after is not None:
+        i = bisect.bisect_left(offsets, after)
+        if i < len(offsets) and offsets[i] == after and i in order:
+            order = order[order.index(i) + 1:]
+    return order
+
+
+def purchase_history(customer_id, limit=20, cursor=None, date_from=None, date_to=None, product=None):
+    """
+    Zwraca jedną stronę historii zakupów klienta – od najnowszych.
+    Czyta z pliku tylko linie potrzebne do strony (offsety z indeksu pliku).
+    Przykład: purchase_history('1000', limit=20, date_from='2025-05-01', date_to='2025-05-31')
+    :param limit: liczba zakupów na stronę, co najmniej 1 (None = wszystkie pasujące)
+    :param cursor: kursor z poprzedniej strony (None = od najnowszego zakupu)
+    :param date_from: pierwszy dzień RRRR-MM-DD (włącznie)
+    :param date_to: ostatni dzień RRRR-MM-DD (włącznie)
+    :param product: tylko zakupy zawierające produkt o tym ID
+    :return: (lista (data, pozycje), kursor następnej strony albo None, gdy to ostatnia strona)
+    Kursor to offset w pliku, więc zakupy dopisane w międzyczasie nie przesuwają kolejnych stron.
+    Podnosi ValueError dla limitu mniejszego niż 1 i dat w innym formacie niż RRRR-MM-DD.
+    """
+    if limit is not None and limit < 1:
+        raise ValueError("Strona historii musi mieć co najmniej jeden zakup.")
+    for day in (date_from, date_to):
+        if day is not None:
+            try:
+                datetime.date.fromisoformat(day if DAY.fullmatch(day) else '')
+            except ValueError:
+                raise ValueError(f"Niepoprawna data (oczekiwano RRRR-MM-DD): {day}") from None
+    path = os.path.join(current_store().receipts_dir, f"{customer_id}.txt")
+    if not os.path.exists(path):
+        return [], None
+    index = _history_index(path)
+    offsets = index['offsets']
+    candidates = _candidates(index, date_from, date_to, cursor)
+    page = []
+    with open(path, 'rb') as f:
+        for i in candidates:
+            if limit is not None and len(page) == limit:
+                return page, offsets[last]  # Następna strona: linie przed ostatnią zwróconą
+            f.seek(offsets[i])
+            parsed = parse_receipt_line(f.readline().decode('utf-8', errors='replace'))
+            if parsed and (product is None or any(pid == product for pid, _ in parsed[1])):
+                page.append(parsed)
+                last = i
+    return page, None
+
+
 def filter_customers(filter_func):
     """
     Funkcja wyższego rzędu – zwraca listę klientów spełniających warunek filter_func.
@@ -147,31 +351,52 @@ def filter_customers(filter_func):
     return list(filter(filter_func, load_customers()))
 
 
+def search_customers(surname=None, email_domain=None, phone_suffix=None,
+                     registered_from=None, registered_to=None, limit=None):
+    """
+    Wyszukuje klientów po indeksach (bez wczytywania i skanowania całego pliku CSV).
+    Wszystkie podane warunki muszą być spełnione; wynik posortowany po ID.
+    Przykład: search_customers(surname='Now', email_domain='gmail.com', registered_from='2024-01-01')
+    :param surname: prefiks nazwiska (bez rozróżniania wielkości liter)
+    :param email_domain: domena emaila
+    :param phone_suffix: końcówka numeru telefonu
+    :param registered_from: data rejestracji od (RRRR-MM-DD, włącznie)
+    :param registered_to: data rejestracji do (RRRR-MM-DD, włącznie)
+    :param limit: maksymalna liczba wyników
+    :return: lista słowników w formacie load_customers()
+    """
+    found = customer_index.search(surname=surname, email_domain=email_domain,
+                                  phone_suffix=phone_suffix, registered_from=registered_from,
+                                  registered_to=registered_to, limit=limit)
+    return [c.as_dict() for c in found]
+
+
+def _update_customer_field(customer_id, field, value):
+    """Zmienia jedno pole klienta w pliku CSV i w indeksach wyszukiwania."""
+    customers = load_customers()
+    changed = []
+    with customer_index.maintained() as index:
+        for customer in customers:
+            if customer['ID'] == customer_id:
+                customer[field] = value
+                changed.append((changes.UPSERT, customer_id, customer))
+                if index:
+                    index.update(customer)
+                break
+        save_customers(customers)
+    changes.record(changes.CUSTOMERS, changed)
+
+
 def update_customer_phone(customer_id, new_phone):
     """Aktualizuje numer telefonu klienta."""
-    customers = load_customers()
-    for customer in customers:
-        if customer['ID'] == customer_id:
-            customer['Telefon'] = new_phone
-            break
-    save_customers(customers)
+    _update_customer_field(customer_id, 'Telefon', new_phone)
 
 
 def update_customer_email(customer_id, new_email):
     """Aktualizuje adres email klienta."""
-    customers = load_customers()
-    for customer in customers:
-        if customer['ID'] == customer_id:
-            customer['Email'] = new_email
-            break
-    save_customers(customers)
+    _update_customer_field(customer_id, 'Email', new_email)
 
 
 def update_customer_password(customer_id, new_password_hash):
     """Aktualizuje hasło klienta (już zahashowane)."""
-    customers = load_customers()
-    for customer in customers:
-        if customer['ID'] == customer_id:
-            customer['PasswordHash'] = new_password_hash
-            break
-    save_customers(customers)
+    _update_customer_field(customer_id, 'PasswordHash', new_password_hash)
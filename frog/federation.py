@@ -0,0 +1,158 @@
+"""
+Moduł zapytań federacyjnych – katalog i sprzedaż zebrane z wielu sklepów naraz.
+Każdy sklep (katalog z data/ i DATABASE/) jest odpytywany w osobnym procesie
+z własnym kontekstem frog.store, a wyniki cząstkowe (małe słowniki) są scalane w procesie głównym.
+
+Przykład (z katalogu głównego projektu):
+    python -m frog.federation catalogue /sklepy/krakow /sklepy/gdansk
+    python -m frog.federation sales /sklepy/krakow /sklepy/gdansk --from 2025-05-01 --to 2025-05-31
+"""
+
+# --- Importy ---
+import argparse
+import concurrent.futures
+import contextlib
+import io
+import json
+import os
+
+from frog.customer_manager import read_new_receipts
+from frog.product_manager import list_products
+from frog.store import store_at, use_store
+
+UNKNOWN_CATEGORY = 'Nieznana'  # Kategoria produktów z paragonów, których nie ma już w katalogu
+
+
+# --- Zapytania do jednego sklepu (uruchamiane w procesach roboczych) ---
+def _store_catalogue(store):
+    """Zwraca (nazwa sklepu, [(ID, nazwa, kategoria, cena, stan), ...]) dla jednego sklepu."""
+    with use_store(store) as s, contextlib.redirect_stdout(io.StringIO()):
+        rows = [(str(p['ID']), str(p['Nazwa']), str(p['Kategoria']), float(p['Cena']),
+                 int(p['Ilość_w_magazynie'])) for p in list_products()]
+    return s.name, rows
+
+
+def _store_sales(store, start, end):
+    """
+    Sumuje sprzedaż jednego sklepu w przedziale dat [start, end] (RRRR-MM-DD, None = bez granicy).
+    Wartość pozycji liczona jest po cenie z katalogu tego sklepu.
+    :return: (nazwa sklepu, liczba paragonów, {ID: [sztuki, wartość, nazwa, kategoria]})
+    """
+    with use_store(store) as s, contextlib.redirect_stdout(io.StringIO()):
+        catalog = {str(p['ID']): (float(p['Cena']), str(p['Nazwa']), str(p['Kategoria']))
+                   for p in list_products()}
+        receipts = read_new_receipts({})
+    transactions = 0
+    items = {}
+    for _, dt, basket in receipts:
+        day = dt[:10]  # Obie wersje formatu daty zaczynają się od RRRR-MM-DD
+        if (start and day < start) or (end and day > end):
+            continue
+        transactions += 1
+        for pid, qty in basket:
+            price, name, category = catalog.get(pid, (0.0, pid, UNKNOWN_CATEGORY))
+            row = items.setdefault(pid, [0, 0.0, name, category])
+            row[0] += qty
+            row[1] += qty * price
+    return s.name, transactions, items
+
+
+def _map_stores(func, stores, workers, *args):
+    """
+    Wywołuje func(sklep, *args) dla każdego sklepu – w puli procesów, gdy sklepów
+    jest kilka i mamy więcej niż jeden procesor; wyniki w kolejności sklepów.
+    """
+    stores = [store_at(s) for s in stores]
+    workers = min(workers or os.cpu_count() or 1, len(stores))
+    if workers <= 1:
+        return [func(s, *args) for s in stores]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(func, s, *args) for s in stores]
+        return [f.result() for f in futures]
+
+
+# --- Zapytania federacyjne ---
+def federated_catalogue(stores, workers=None):
+    """
+    Wspólny katalog sieci sklepów.
+    :param stores: lista sklepów (Store lub katalogi)
+    :return: lista wierszy (po ID) ze stanem łącznym, stanem w każdym sklepie i zakresem cen
+    """
+    merged = {}
+    for name, rows in _map_stores(_store_catalogue, stores, workers):
+        for pid, title, category, price, stock in rows:
+            row = merged.setdefault(pid, {
+                'ID': pid, 'Nazwa': title, 'Kategoria': category, 'Ilość_w_magazynie': 0,
+                'Cena_min': price, 'Cena_max': price, 'Sklepy': {}})
+            row['Ilość_w_magazynie'] += stock
+            row['Cena_min'] = min(row['Cena_min'], price)
+            row['Cena_max'] = max(row['Cena_max'], price)
+            row['Sklepy'][name] = stock
+    return [merged[pid] for pid in sorted(merged)]
+
+
+def federated_sales(stores, start=None, end=None, workers=None):
+    """
+    Sprzedaż sieci sklepów w przedziale dat.
+    :param stores: lista sklepów (Store lub katalogi)
+    :param start: pierwszy dzień (RRRR-MM-DD) albo None
+    :param end: ostatni dzień (RRRR-MM-DD) albo None
+    :return: słownik z listami 'products', 'stores' i 'categories' (malejąco po wartości)
+    """
+    products, per_store, categories = {}, [], {}
+    for name, transactions, items in _map_stores(_store_sales, stores, workers, start, end):
+        store_row = {'Sklep': name, 'Paragony': transactions, 'Sztuki': 0, 'Wartość': 0.0}
+        for pid, (qty, value, title, category) in items.items():
+            row = products.setdefault(pid, {'ID': pid, 'Nazwa': title, 'Kategoria': category,
+                                            'Sztuki': 0, 'Wartość': 0.0, 'Sklepy': {}})
+            row['Sztuki'] += qty
+            row['Wartość'] += value
+            row['Sklepy'][name] = qty
+            cat = categories.setdefault(category, {'Kategoria': category, 'Sztuki': 0, 'Wartość': 0.0})
+            cat['Sztuki'] += qty
+            cat['Wartość'] += value
+            store_row['Sztuki'] += qty
+            store_row['Wartość'] += value
+        per_store.append(store_row)
+
+    def by_value(rows):  # funkcja pomocnicza – sortowanie i zaokrąglenie kwot
+        for row in rows:
+            row['Wartość'] = round(row['Wartość'], 2)
+        return sorted(rows, key=lambda r: -r['Wartość'])
+
+    return {'from': start, 'to': end, 'products': by_value(products.values()),
+            'stores': by_value(per_store), 'categories': by_value(categories.values())}
+
+
+def main(argv=None):
+    """Punkt wejścia wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Zapytania do wielu sklepów naraz")
+    parser.add_argument('query', choices=['catalogue', 'sales'])
+    parser.add_argument('stores', nargs='+', help="katalogi sklepów (z data/ i DATABASE/)")
+    parser.add_argument('--from', dest='start', help="pierwszy dzień sprzedaży RRRR-MM-DD")
+    parser.add_argument('--to', dest='end', help="ostatni dzień sprzedaży RRRR-MM-DD")
+    parser.add_argument('--workers', type=int, help="liczba procesów (domyślnie liczba CPU)")
+    parser.add_argument('--output', help="zapis wyniku do pliku JSON")
+    args = parser.parse_args(argv)
+
+    if args.query == 'catalogue':
+        result = federated_catalogue(args.stores, args.workers)
+        for row in result:
+            print(f"{row['ID']:<8} {row['Nazwa']:<25} stan={row['Ilość_w_magazynie']:<6}"
+                  f" cena={row['Cena_min']:.2f}-{row['Cena_max']:.2f} sklepy={len(row['Sklepy'])}")
+    else:
+        result = federated_sales(args.stores, args.start, args.end, args.workers)
+        for row in result['stores']:
+            print(f"{row['Sklep']:<20} paragony={row['Paragony']:<7} sztuki={row['Sztuki']:<8}"
+                  f" wartość={row['Wartość']:.2f} zł")
+        print("\nKategorie:")
+        for row in result['categories']:
+            print(f"  {row['Kategoria']:<15} sztuki={row['Sztuki']:<8} wartość={row['Wartość']:.2f} zł")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    main()
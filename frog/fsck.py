@@ -0,0 +1,461 @@
+"""
+Moduł sprawdzania spójności danych sklepu Żabka (w stylu fsck).
+Sprawdza products.xlsx, customers.csv i wszystkie pliki paragonów w DATABASE/:
+  - produkty: uszkodzone wiersze (brak ID / nazwy, zła cena lub stan), powtórzone ID,
+  - klienci: uszkodzone wiersze, powtórzone ID i emaile, obcięte skróty haseł, złe daty i emaile,
+  - paragony: uszkodzone i niedokończone linie, stary format daty (ISO z sekundami),
+    produkty spoza katalogu, pliki klientów, których nie ma, puste pliki bez klienta, obce pliki,
+  - pozostałości po przerwanych zapisach (*.tmp).
+Pliki paragonów są sprawdzane porcjami w puli procesów; typowy, poprawny plik przechodzi
+jednym dopasowaniem wyrażenia regularnego, linia po linii analizowane są tylko pliki z błędami.
+
+Z --repair poprawia to, co da się poprawić bez zgadywania: odrzucone wiersze i linie
+trafiają do katalogu lost+found/ sklepu (nic nie jest kasowane bez śladu), daty ISO są
+zamieniane na format RRRR-MM-DD GG:MM, usuwane są puste pliki bez klienta i stare pliki *.tmp.
+Obcięte skróty haseł, powtórzone emaile i paragony usuniętych klientów / produktów są tylko zgłaszane.
+Naprawę uruchamiamy przy zamkniętym sklepie (bez otwartych kas i okien).
+
+Przykład (z katalogu głównego projektu):
+    python -m frog.fsck                     # tylko raport
+    python -m frog.fsck --repair --store /sklepy/krakow
+"""
+
+# --- Importy ---
+import argparse
+import collections
+import concurrent.futures
+import csv
+import datetime
+import io
+import json
+import os
+import re
+import time
+
+import openpyxl
+import pandas as pd
+
+from frog import inventory
+from frog.store import current_store, store_at, use_store
+
+LOST_FOUND = 'lost+found'   # Katalog sklepu na odrzucone wiersze i linie
+CHUNK_FILES = 2000          # Ile plików paragonów sprawdza jedno zadanie puli
+TEMP_AGE = 3600             # Plik *.tmp starszy niż tyle sekund to pozostałość po przerwanym zapisie
+GUEST = 'GUEST'             # Zakupy bez konta (kasa gościa)
+
+PRODUCT_FIELDS = ['ID', 'Nazwa', 'Kategoria', 'Cena', 'Ilość_w_magazynie']
+CUSTOMER_FIELDS = ['ID', 'Imię', 'Nazwisko', 'Email', 'Data_rejestracji', 'PasswordHash', 'Telefon']
+
+# --- Rodzaje problemów: kod -> (waga, czy --repair go poprawia, opis) ---
+ERROR = 'error'
+WARNING = 'warning'
+CODES = {
+    'product-malformed-row': (ERROR, True, "uszkodzony wiersz produktu"),
+    'product-duplicate-id': (ERROR, True, "powtórzone ID produktu"),
+    'customer-malformed-row': (ERROR, True, "uszkodzony wiersz klienta"),
+    'customer-duplicate-id': (ERROR, True, "powtórzone ID klienta"),
+    'customer-truncated-hash': (ERROR, False, "obcięty skrót hasła (potrzebne nowe hasło)"),
+    'customer-duplicate-email': (WARNING, False, "ten sam email u kilku klientów"),
+    'customer-invalid-email': (WARNING, False, "niepoprawny email"),
+    'customer-invalid-date': (WARNING, False, "niepoprawna data rejestracji"),
+    'receipt-malformed-line': (ERROR, True, "uszkodzona linia paragonu"),
+    'receipt-truncated-line': (ERROR, True, "niedokończona ostatnia linia paragonu"),
+    'receipt-timestamp-format': (WARNING, True, "stary format daty (ISO)"),
+    'receipt-unknown-product': (WARNING, False, "paragon z produktem spoza katalogu"),
+    'receipt-unknown-customer': (WARNING, False, "paragony klienta, którego nie ma"),
+    'receipt-empty-orphan': (WARNING, True, "pusty plik paragonów bez klienta"),
+    'receipt-foreign-file': (WARNING, False, "obcy plik w DATABASE/"),
+    'leftover-temp-file': (WARNING, True, "pozostałość po przerwanym zapisie"),
+}
+
+# Jeden problem: kod, plik (względem katalogu sklepu), numer linii / wiersza (0 = cały plik),
+# szczegóły i czy został naprawiony
+Issue = collections.namedtuple('Issue', 'code path line detail repaired')
+
+
+# --- Wzorce linii paragonu ---
+_DATE = rb'\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])'
+_TIME = rb'(?:[01]\d|2[0-3]):[0-5]\d'
+_ITEMS = rb"\[\('[^'\n]*', [1-9]\d*\)(?:, \('[^'\n]*', [1-9]\d*\))*\]"
+# Cały plik poprawnych linii w bieżącym formacie – szybka ścieżka jednym dopasowaniem
+GOOD_FILE = re.compile(rb'(?:' + _DATE + rb' ' + _TIME + rb' -> ' + _ITEMS + rb'\n)*')
+STAMP = re.compile(_DATE + rb' ' + _TIME)
+STAMP_ISO = re.compile(_DATE + rb'T' + _TIME + rb'(?::[0-5]\d(?:\.\d{1,6})?)?')
+ITEMS = re.compile(rb"\[\('[^'\n]*',\s*[1-9]\d*\)(?:,\s*\('[^'\n]*',\s*[1-9]\d*\))*\]")
+PRODUCT_REF = re.compile(rb"\('([^'\n]*)',")
+SHA256 = re.compile(r'[0-9a-f]{64}')
+
+
+def _issue(code, path, line=0, detail='', repaired=False):
+    return Issue(code, path, line, detail, repaired)
+
+
+def _reject(root, rel, lines):
+    """Dopisuje odrzucone linie / wiersze do lost+found/<rel> (zachowując ślad po naprawie)."""
+    path = os.path.join(root, LOST_FOUND, *rel.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'ab') as f:
+        f.writelines(line if line.endswith(b'\n') else line + b'\n' for line in lines)
+
+
+def _replace_bytes(path, data):
+    """Atomowy zapis pliku (plik tymczasowy + podmiana)."""
+    tmp = f"{path}.{os.getpid()}.fsck.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _csv_line(values):
+    """Wiersz CSV (bajty) z listy wartości – do zapisu odrzuconych wierszy w lost+found/."""
+    out = io.StringIO()
+    csv.writer(out).writerow(['' if v is None else v for v in values])
+    return out.getvalue().encode('utf-8')
+
+
+# --- Produkty ---
+def check_products(repair=False):
+    """
+    Sprawdza products.xlsx. Zwraca (lista Issue, zbiór ID produktów z katalogu).
+    Gdy istnieje dziennik magazynowy, stany sprawdzane są w nim (kolumna w pliku bywa nieaktualna).
+    Z repair=True uszkodzone i powtórzone wiersze trafiają do lost+found/data/products.xlsx.csv,
+    a plik jest podmieniany atomowo.
+    """
+    store = current_store()
+    path, rel = store.products_xlsx, 'data/products.xlsx'
+    if not os.path.exists(path):
+        return [], set()
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(h) for h in next(rows, ())]
+        body = [list(r) for r in rows if any(v is not None for v in r)]
+    finally:
+        wb.close()
+    issues, ids, kept, rejected = [], set(), [], []
+    col = {name: header.index(name) for name in PRODUCT_FIELDS if name in header}
+    missing = [name for name in PRODUCT_FIELDS if name not in col]
+    if missing:
+        issues.append(_issue('product-malformed-row', rel, 1, f"brak kolumn: {', '.join(missing)}"))
+        return issues, {str(r[0]) for r in body if r and r[0] is not None}
+
+    journal = inventory.current_stock() if os.path.exists(store.inventory_log) else None
+    for n, row in enumerate(body, 2):
+        row += [None] * (len(header) - len(row))
+        pid, name = row[col['ID']], row[col['Nazwa']]
+        price, stock = row[col['Cena']], row[col['Ilość_w_magazynie']]
+        if journal is not None and str(pid) in journal:
+            stock = journal[str(pid)]
+        elif stock is None:
+            stock = 0  # Pusta komórka stanu to 0 sztuk (jak w product_manager.list_products)
+        problem = None
+        if pid is None or not str(pid).strip():
+            problem = "brak ID"
+        elif name is None or not str(name).strip():
+            problem = "brak nazwy"
+        elif not isinstance(price, (int, float)) or price < 0:
+            problem = f"zła cena: {price!r}"
+        elif not isinstance(stock, (int, float)) or stock < 0 or stock != int(stock):
+            problem = f"zły stan: {stock!r}"
+        if problem:
+            issues.append(_issue('product-malformed-row', rel, n, problem, repair))
+            rejected.append(row)
+        elif str(pid) in ids:
+            issues.append(_issue('product-duplicate-id', rel, n, str(pid), repair))
+            rejected.append(row)
+        else:
+            ids.add(str(pid))
+            kept.append(row)
+    if repair and rejected:
+        _reject(store.root, rel + '.csv', [_csv_line(r) for r in rejected])
+        out = io.BytesIO()
+        pd.DataFrame(kept, columns=header).to_excel(out, index=False)
+        _replace_bytes(path, out.getvalue())
+    return issues, ids
+
+
+# --- Klienci ---
+def check_customers(repair=False):
+    """
+    Sprawdza customers.csv. Zwraca (lista Issue, zbiór ID klientów).
+    Z repair=True uszkodzone i powtórzone wiersze trafiają do lost+found/data/customers.csv.
+    """
+    store = current_store()
+    path, rel = store.customers_csv, 'data/customers.csv'
+    if not os.path.exists(path):
+        return [], set()
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    if not rows:
+        return [], set()
+    header, issues, ids, emails = rows[0], [], set(), {}
+    if sorted(header) != sorted(CUSTOMER_FIELDS):
+        issues.append(_issue('customer-malformed-row', rel, 1, f"nagłówek: {','.join(header)}"))
+        return issues, {r[0] for r in rows[1:] if r}
+    col = {name: header.index(name) for name in CUSTOMER_FIELDS}
+    kept, rejected = [header], []
+    for n, row in enumerate(rows[1:], 2):
+        if not row:
+            continue
+        cid = row[col['ID']].strip() if len(row) > col['ID'] else ''
+        if len(row) != len(header) or not cid:
+            issues.append(_issue('customer-malformed-row', rel, n,
+                                 f"{len(row)} pól zamiast {len(header)}" if cid else "brak ID", repair))
+            rejected.append(row)
+            continue
+        if cid in ids:
+            issues.append(_issue('customer-duplicate-id', rel, n, cid, repair))
+            rejected.append(row)
+            continue
+        ids.add(cid)
+        kept.append(row)
+        if not SHA256.fullmatch(row[col['PasswordHash']]):
+            issues.append(_issue('customer-truncated-hash', rel, n, f"klient {cid}"))
+        email = row[col['Email']].strip()
+        if email.count('@') != 1 or not all(email.split('@')):
+            issues.append(_issue('customer-invalid-email', rel, n, f"klient {cid}: {email!r}"))
+        elif email.casefold() in emails:
+            issues.append(_issue('customer-duplicate-email', rel, n,
+                                 f"klient {cid} i {emails[email.casefold()]}: {email}"))
+        else:
+            emails[email.casefold()] = cid
+        try:
+            datetime.date.fromisoformat(row[col['Data_rejestracji']])
+        except ValueError:
+            issues.append(_issue('customer-invalid-date', rel, n,
+                                 f"klient {cid}: {row[col['Data_rejestracji']]!r}"))
+    if repair and rejected:
+        _reject(store.root, rel, [_csv_line(r) for r in rejected])
+        tmp = f"{path}.{os.getpid()}.fsck.tmp"
+        with open(tmp, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows(kept)
+        os.replace(tmp, path)
+    return issues, ids
+
+
+# --- Paragony (zadania puli procesów) ---
+_known = {}  # Katalog i klienci przekazani procesowi roboczemu (initializer puli)
+
+
+def _init_worker(products, customers):
+    _known['products'], _known['customers'] = products, customers
+
+
+def _check_line(line):
+    """
+    Sprawdza jedną linię paragonu (bez znaku nowej linii).
+    Zwraca (kod problemu albo None, linia w bieżącym formacie albo None dla linii do odrzucenia).
+    """
+    stamp, sep, items = line.partition(b' -> ')
+    if not sep or not ITEMS.fullmatch(items.strip()):
+        return 'receipt-malformed-line', None
+    if STAMP.fullmatch(stamp):
+        return None, line
+    if STAMP_ISO.fullmatch(stamp):
+        try:
+            when = datetime.datetime.fromisoformat(stamp.decode('ascii'))
+        except ValueError:
+            return 'receipt-malformed-line', None
+        return 'receipt-timestamp-format', f"{when:%Y-%m-%d %H:%M}".encode('ascii') + sep + items
+    return 'receipt-malformed-line', None
+
+
+def _check_receipt_file(root, name, repair):
+    """Sprawdza (i z repair=True naprawia) jeden plik DATABASE/<name>; zwraca listę Issue."""
+    rel = f"DATABASE/{name}"
+    path = os.path.join(root, 'DATABASE', name)
+    cid = name[:-4]
+    with open(path, 'rb') as f:
+        data = f.read()
+    known = cid == GUEST or cid in _known['customers']
+    if not data:
+        if known:
+            return []  # Pusty plik zakłada rejestracja – klient jeszcze nic nie kupił
+        if repair:
+            os.remove(path)
+        return [_issue('receipt-empty-orphan', rel, 0, f"klient {cid}", repair)]
+
+    issues = [] if known else [_issue('receipt-unknown-customer', rel, 0, f"klient {cid}")]
+    if not GOOD_FILE.fullmatch(data):
+        # Wolna ścieżka: linia po linii, z numerami linii pierwszych problemów
+        found = collections.OrderedDict()
+        kept, rejected = [], []
+        lines = data.split(b'\n')
+        last = lines.pop()  # b'' dla pliku zakończonego znakiem nowej linii
+        for n, line in enumerate(lines, 1):
+            code, fixed = _check_line(line)
+            if code:
+                found.setdefault(code, [n, 0])[1] += 1
+            (kept if fixed is not None else rejected).append((fixed if fixed is not None else line) + b'\n')
+        if last:
+            code, fixed = _check_line(last)
+            found.setdefault('receipt-truncated-line', [len(lines) + 1, 0])[1] += 1
+            if code == 'receipt-timestamp-format':
+                found.setdefault(code, [len(lines) + 1, 0])[1] += 1
+            (kept if fixed is not None else rejected).append((fixed if fixed is not None else last) + b'\n')
+        for code, (first, count) in found.items():
+            issues.append(_issue(code, rel, first, f"{count} linii", repair))
+        if repair and found:
+            if rejected:
+                _reject(root, rel, rejected)
+            _replace_bytes(path, b''.join(kept))
+            data = b''.join(kept)
+
+    missing = set(m.decode('utf-8', errors='replace') for m in PRODUCT_REF.findall(data)) \
+        - _known['products']
+    if missing:
+        issues.append(_issue('receipt-unknown-product', rel, 0, ', '.join(sorted(missing))))
+    return issues
+
+
+def _check_chunk(root, names, repair):
+    """Zadanie puli: sprawdza porcję plików paragonów."""
+    issues = []
+    for name in names:
+        try:
+            issues.extend(_check_receipt_file(root, name, repair))
+        except FileNotFoundError:
+            continue  # Plik usunięty w trakcie sprawdzania
+    return issues
+
+
+def _receipt_chunks(receipts_dir, issues):
+    """Porcje nazw plików *.txt z DATABASE/ (strumieniowo); obce pliki trafiają do issues."""
+    chunk = []
+    with os.scandir(receipts_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.tmp'):
+                continue  # Sprawdzane razem z pozostałościami w data/
+            if not entry.is_file() or not entry.name.endswith('.txt'):
+                issues.append(_issue('receipt-foreign-file', f"DATABASE/{entry.name}"))
+                continue
+            chunk.append(entry.name)
+            if len(chunk) == CHUNK_FILES:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def check_receipts(products, customers, repair=False, workers=None):
+    """
+    Sprawdza wszystkie pliki paragonów w puli procesów (workers=1 – w bieżącym procesie).
+    :param products: zbiór ID produktów z katalogu
+    :param customers: zbiór ID klientów
+    :return: (lista Issue, liczba sprawdzonych plików)
+    """
+    store = current_store()
+    issues, files = [], 0
+    if not os.path.isdir(store.receipts_dir):
+        return issues, files
+    chunks = _receipt_chunks(store.receipts_dir, issues)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        _init_worker(products, customers)
+        for chunk in chunks:
+            issues.extend(_check_chunk(store.root, chunk, repair))
+            files += len(chunk)
+        return issues, files
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                initargs=(products, customers)) as pool:
+        pending = {}
+        for chunk in chunks:
+            if len(pending) >= 2 * workers:  # Ograniczamy liczbę zadań w kolejce (pamięć)
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    issues.extend(future.result())
+                    files += pending.pop(future)
+            pending[pool.submit(_check_chunk, store.root, chunk, repair)] = len(chunk)
+        for future, count in pending.items():
+            issues.extend(future.result())
+            files += count
+    return issues, files
+
+
+# --- Pozostałości po przerwanych zapisach ---
+def check_leftovers(repair=False):
+    """Szuka plików *.tmp w data/ i DATABASE/ starszych niż TEMP_AGE sekund."""
+    store = current_store()
+    issues, now = [], time.time()
+    for sub in ('data', 'DATABASE'):
+        top = os.path.join(store.root, sub)
+        if not os.path.isdir(top):
+            continue
+        with os.scandir(top) as entries:
+            for entry in entries:
+                if entry.name.endswith('.tmp') and entry.is_file() \
+                        and now - entry.stat().st_mtime > TEMP_AGE:
+                    if repair:
+                        os.remove(entry.path)
+                    issues.append(_issue('leftover-temp-file', f"{sub}/{entry.name}", repaired=repair))
+    return issues
+
+
+# --- Całość ---
+def fsck(repair=False, workers=None):
+    """
+    Sprawdza (i z repair=True naprawia) dane bieżącego sklepu.
+    Po przepisaniu plików paragonów usuwane są stany pochodne z offsetami w tych plikach
+    (model rekomendacji, stan sprzedaży) – zostaną odbudowane przy następnym użyciu.
+    :return: słownik: issues (lista Issue), files (liczba plików paragonów), seconds
+    """
+    start = time.perf_counter()
+    issues, products = check_products(repair)
+    found, customers = check_customers(repair)
+    issues += found
+    found, files = check_receipts(frozenset(products), frozenset(customers), repair, workers)
+    issues += found
+    issues += check_leftovers(repair)
+    rewritten = {'receipt-malformed-line', 'receipt-truncated-line', 'receipt-timestamp-format'}
+    if repair and any(i.code in rewritten for i in issues):
+        store = current_store()
+        for path in (store.recommendations, store.sales_state):
+            if os.path.exists(path):
+                os.remove(path)
+    issues.sort(key=lambda i: (i.code, i.path, i.line))
+    return {'issues': issues, 'files': files, 'seconds': time.perf_counter() - start}
+
+
+def exit_code(issues):
+    """Kod wyjścia jak w fsck: 0 – brak błędów, 1 – błędy poprawione, 4 – zostały błędy."""
+    errors = [i for i in issues if CODES[i.code][0] == ERROR]
+    if not errors:
+        return 0
+    return 1 if all(i.repaired for i in errors) else 4
+
+
+def main(argv=None):
+    """Punkt wejścia wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Sprawdzanie i naprawa spójności danych sklepu")
+    parser.add_argument('--repair', action='store_true', help="popraw to, co da się poprawić")
+    parser.add_argument('--workers', type=int, help="liczba procesów (domyślnie liczba CPU)")
+    parser.add_argument('--examples', type=int, default=5, help="ile przykładów pokazać dla każdego problemu")
+    parser.add_argument('--store', default=current_store(), help="katalog sklepu (domyślnie projekt)")
+    parser.add_argument('--output', help="zapis pełnej listy problemów do pliku JSON")
+    args = parser.parse_args(argv)
+
+    with use_store(store_at(args.store)):
+        result = fsck(args.repair, args.workers)
+    issues = result['issues']
+    by_code = collections.defaultdict(list)
+    for issue in issues:
+        by_code[issue.code].append(issue)
+    print(f"Sprawdzono {result['files']} plików paragonów w {result['seconds']:.1f} s")
+    for code, found in by_code.items():
+        severity, _, description = CODES[code]
+        repaired = sum(i.repaired for i in found)
+        suffix = f", naprawiono {repaired}" if repaired else ''
+        print(f"[{severity}] {code}: {len(found)} – {description}{suffix}")
+        for issue in found[:args.examples]:
+            where = f"{issue.path}:{issue.line}" if issue.line else issue.path
+            print(f"    {where} {issue.detail}")
+    if not issues:
+        print("Brak problemów.")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump([i._asdict() for i in issues], f, indent=2, ensure_ascii=False)
+    return exit_code(issues)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -6,23 +6,21 @@ Interfejs graficzny Frog (Tkinter) – elementy funkcyjne: dekoratory, funkcje w
 import tkinter as tk  # Główna biblioteka GUI
 from tkinter import ttk, messagebox, simpledialog  # Elementy GUI i okna dialogowe
 
-# Import funkcji zarządzających produktami, klientami, logowaniem
-from frog.product_manager import list_products, DATA_PATH, add_product, remove_product
-from frog.customer_manager import purchase_products
-from frog.auth import authenticate, register_with_password, hash_password
+# Import usług danych (katalog, klienci, paragony) i logiki koszyka
+from frog.service import DataService, merge_catalogue
+from frog.pricing import build_catalog, load_rules
+from frog.receipts import price_receipt, render_text
+from frog.cart import Cart
+from frog.store import current_store, use_store
 
 # Dodatkowe biblioteki
-import pandas as pd           # Obsługa plików Excel
 import os                    # Obsługa ścieżek i plików
-import csv                   # Obsługa plików CSV
 import datetime              # Czas i daty
 import configparser          # Pliki konfiguracyjne INI
 
-# --- Ścieżki do plików używanych w GUI ---
-BASE_DIR = os.path.dirname(__file__)  # Ścieżka katalogu, w którym znajduje się ten plik
-RECEIPTS_DIR = os.path.join(BASE_DIR, '..', 'DATABASE')  # Folder z paragonami
-CUSTOMERS_CSV = os.path.join(BASE_DIR, '..', 'data', 'customers.csv')  # Klienci
-CONFIG_INI = os.path.join(BASE_DIR, 'config.ini')  # Plik z zapisanym motywem graficznym
+POLL_MS = 15  # Co ile ms pętla Tk sprawdza, czy zlecona operacja się zakończyła (~60 klatek/s)
+CHANGES_MS = 500  # Co ile ms okno sprawdza dziennik zmian sklepu (sam stat(), gdy nic się nie zmieniło)
+HISTORY_PAGE = 50  # Liczba zakupów na stronę w zakładce Historia
 
 # --- Dekorator logujący akcje GUI ---
 def log_action(action):
@@ -37,15 +35,49 @@ def log_action(action):
 # --- Zapis wybranego motywu graficznego do config.ini ---
 def save_theme(theme_name):
     """Zapisuje wybrany motyw do pliku konfiguracyjnego INI."""
+    path = current_store().config_ini
     config = configparser.ConfigParser()
-    if os.path.exists(CONFIG_INI):
-        config.read(CONFIG_INI)
+    if os.path.exists(path):
+        config.read(path)
     else:
         config['settings'] = {}
     config['settings']['theme'] = theme_name
-    with open(CONFIG_INI, 'w') as f:
+    with open(path, 'w') as f:
         config.write(f)
 
+# --- Promocje z config.ini ---
+def load_promotions(root):
+    """
+    Wczytuje promocje sklepu. Błąd w sekcji [promotions] (np. literówka w kluczu) nie blokuje
+    startu okna – pokazuje ostrzeżenie i zwraca brak promocji.
+    """
+    try:
+        return load_rules(current_store().config_ini)
+    except (ValueError, configparser.Error) as e:
+        messagebox.showwarning("Promocje", f"Błąd w sekcji [promotions] pliku config.ini – promocje"
+                                           f" są wyłączone.\n\n{e}", parent=root)
+        return []
+
+# --- Odbiór wyników operacji z puli wątków ---
+def when_done(root, future, on_success, on_error=None):
+    """
+    Czeka (bez blokowania pętli Tk) na zakończenie future i wywołuje on_success(wynik)
+    albo on_error(wyjątek) w wątku GUI – widżetów Tk nie wolno dotykać z wątków roboczych.
+    Domyślnie błąd jest pokazywany w okienku.
+    """
+    def poll():
+        if not future.done():
+            root.after(POLL_MS, poll)
+            return
+        error = future.exception()
+        if error is None:
+            on_success(future.result())
+        elif on_error:
+            on_error(error)
+        else:
+            messagebox.showerror("Błąd", str(error), parent=root)
+    poll()
+
 # --- Klasa z polem autouzupełniania produktów (np. szukajka) ---
 class AutocompleteEntry(ttk.Entry):
     """Pole tekstowe z podpowiedziami – do wyszukiwania produktów po ID lub nazwie."""
@@ -107,8 +139,18 @@ class AutocompleteEntry(ttk.Entry):
         self.listbox = None
         self.event_generate('<KeyRelease>')
 @log_action("Uruchomienie GUI")
-def run_gui(client_id=None):
-    """Uruchamia główne okno interfejsu graficznego aplikacji."""
+def run_gui(client_id=None, store=None):
+    """
+    Uruchamia główne okno interfejsu graficznego aplikacji.
+    :param store: sklep (Store lub katalog), na którym działa okno – domyślnie bieżący
+    """
+    # Pętla Tk działa w tym wątku, więc wszystkie akcje okna widzą ustawiony sklep
+    with use_store(store or current_store()):
+        _run_window(client_id)
+
+
+def _run_window(client_id):
+    """Buduje okno sklepu i uruchamia pętlę zdarzeń Tk."""
     root = tk.Tk()
     root.title("Sklep Frog")  # Tytuł okna
 
@@ -125,8 +167,8 @@ def run_gui(client_id=None):
 
     # Wczytanie aktualnego motywu z pliku config.ini
     config = configparser.ConfigParser()
-    if os.path.exists(CONFIG_INI):
-        config.read(CONFIG_INI)
+    if os.path.exists(current_store().config_ini):
+        config.read(current_store().config_ini)
     current = config['settings'].get('theme', 'light') if 'settings' in config else 'light'
 
     # Funkcja zmieniająca i stosująca motyw
@@ -164,28 +206,95 @@ def run_gui(client_id=None):
     nb.pack(fill='both', expand=True)  # Rozciągnięcie na całe okno
 
     # --- Zmienne pomocnicze ---
-    cart = []  # Lista produktów w koszyku (para: ID, ilość)
+    service = DataService(current_store())  # Operacje na plikach sklepu w wątkach roboczych
+    cart = Cart(build_catalog([]), load_promotions(root))  # Koszyk: ID -> ilość
+    products = []  # Ostatnio wczytany katalog (dla wyszukiwarki i podpowiedzi)
+    product_rows = {}  # ID produktu -> wiersze tabeli produktów (ID w pliku może się powtarzać)
+    feed = service.watch()  # Zmiany katalogu i stanów zapisane przez to i inne okna / kasy
+    polling = False  # Czy odczyt zmian jest w toku (jeden naraz)
     search_var = tk.StringVar()  # Tekst z pola wyszukiwania
 
     # Kolejne sekcje (produkty, koszyk, historia, konto) w dalszych częściach kodu
     # === ZAKŁADKA: Produkty ===
 
+    def update_cart_catalog(catalog):
+        """Podaje koszykowi aktualne ceny i stany; informuje, gdy ilości w koszyku trzeba było zmniejszyć."""
+        adjusted = cart.set_catalog(catalog)
+        if not adjusted:
+            return
+        refresh_cart()
+        lines = [f"{pid}: {before} → {after}" if after else f"{pid}: usunięto ({before} szt.)"
+                 for pid, (before, after) in adjusted.items()]
+        messagebox.showwarning("Koszyk", "Zmieniły się stany magazynowe – poprawiono koszyk:\n"
+                               + '\n'.join(lines), parent=root)
+
     def refresh_products():
-        """Odświeża listę produktów, uwzględniając filtr tekstowy."""
-        def sort_key(item):  # funkcja wyższego rzędu – sposób sortowania
-            return item['Nazwa']
-        products = sorted(list_products(), key=sort_key)
+        """Zleca wczytanie katalogu; tabela odświeży się po jego nadejściu."""
+        def loaded(result):
+            nonlocal products
+            products, catalog = result
+            update_cart_catalog(catalog)  # Aktualne ceny i stany dla koszyka
+            render_products()
+        when_done(root, service.catalogue(), loaded)
+
+    def product_values(p):
+        """Wartości kolumn tabeli produktów dla jednego produktu."""
+        return p['ID'], p['Nazwa'], f"{p['Cena']:.2f}", p['Ilość_w_magazynie']
+
+    def render_products():
+        """Wypełnia tabelę produktów z wczytanego katalogu, uwzględniając filtr tekstowy."""
         tree_products.delete(*tree_products.get_children())
+        product_rows.clear()
         q = search_var.get().strip().lower()
         for p in products:
             pid = str(p.get('ID', '')).lower()
             name = str(p.get('Nazwa', '')).lower()
             cat = str(p.get('Kategoria', '')).lower()
             if q in pid or q in name or q in cat:
-                tree_products.insert(
-                    '', 'end',
-                    values=(p['ID'], p['Nazwa'], f"{p['Cena']:.2f}", p['Ilość_w_magazynie'])
-                )
+                iid = tree_products.insert('', 'end', values=product_values(p))
+                product_rows.setdefault(str(p['ID']), []).append(iid)
+
+    def apply_changes(found):
+        """Nakłada zmiany z dziennika na katalog w pamięci – przerysowuje tylko zmienione wiersze."""
+        nonlocal products
+        merged = merge_catalogue(products, found)
+        if merged is None:  # Plik zmieniony poza dziennikiem – wczytujemy katalog od nowa
+            refresh_products()
+            return
+        products, stock_only, structural = merged
+        if not (stock_only or structural):
+            return
+        update_cart_catalog(build_catalog(products))
+        if structural:
+            render_products()
+        else:
+            rows = {str(p['ID']): p for p in products}
+            for pid in stock_only:
+                for iid in product_rows.get(pid, ()):
+                    tree_products.item(iid, values=product_values(rows[pid]))
+
+    def poll_changes():
+        """Jeśli dziennik zmian urósł, zleca jego odczyt i nakłada zmiany po nadejściu."""
+        nonlocal polling
+        if polling or not feed.pending():
+            return
+        polling = True
+
+        def arrived(found):
+            nonlocal polling
+            polling = False
+            apply_changes(found)
+
+        def failed(e):
+            nonlocal polling
+            polling = False
+            print(f"[LOG] Błąd odczytu zmian: {e}")
+        when_done(root, service.poll(feed), arrived, failed)
+
+    def watch_changes():
+        """Cykliczne sprawdzanie dziennika zmian (co CHANGES_MS)."""
+        poll_changes()
+        root.after(CHANGES_MS, watch_changes)
 
     @log_action("Dodawanie do koszyka")
     def add_to_cart():
@@ -194,69 +303,56 @@ def run_gui(client_id=None):
         if not sel:
             return
         pid, name, price, stock = tree_products.item(sel[0])['values']
+        left = cart.available(pid)
+        if left <= 0:
+            messagebox.showwarning("Brak towaru", f"Brak {name} w magazynie.", parent=root)
+            return
         qty = simpledialog.askinteger(
-            "Ilość", f"Ile sztuk {name}?", minvalue=1, maxvalue=int(stock), parent=root
+            "Ilość", f"Ile sztuk {name}?", minvalue=1, maxvalue=left, parent=root
         )
         if qty:
-            cart.append((pid, qty))
+            try:
+                cart.add(pid, qty)
+            except ValueError as e:
+                messagebox.showerror("Błąd", str(e), parent=root)
             refresh_cart()
 
     @log_action("Dodawanie produktu do bazy")
     def do_add_product():
-        """Dodaje nowy produkt do bazy danych (Excel)."""
-        try:
-            df = pd.read_excel(DATA_PATH)
-            ids = [i for i in df['ID'].astype(str) if i.startswith('P') and i[1:].isdigit()]
-            nums = [int(i[1:]) for i in ids]
-            next_id = f"P{max(nums)+1:03d}" if nums else "P001"
-
-            name = simpledialog.askstring("Dodaj produkt", "Nazwa produktu:", parent=root)
-            if not name: return
-            category = simpledialog.askstring("Dodaj produkt", "Kategoria produktu:", parent=root)
-            if not category: return
-            price_str = simpledialog.askstring("Dodaj produkt", "Cena (PLN):", parent=root)
-            if not price_str: return
-            price = float(price_str.replace(',', '.'))
-            stock = simpledialog.askinteger("Dodaj produkt", "Ilość w magazynie:", minvalue=0, parent=root)
-            if stock is None: return
-
-            add_product({
-                'ID': next_id,
-                'Nazwa': name,
-                'Kategoria': category,
-                'Cena': price,
-                'Ilość_w_magazynie': stock
-            })
-            messagebox.showinfo("Sukces", f"Dodano {name} (ID:{next_id})", parent=root)
-            refresh_products()
-        except ValueError:
-            messagebox.showerror("Błąd", "Nieprawidłowa cena.", parent=root)
-        except Exception as e:
-            messagebox.showerror("Błąd", str(e), parent=root)
+        """Pyta o dane produktu i zleca dodanie go do bazy danych (Excel)."""
+        name = simpledialog.askstring("Dodaj produkt", "Nazwa produktu:", parent=root)
+        if not name: return
+        category = simpledialog.askstring("Dodaj produkt", "Kategoria produktu:", parent=root)
+        if not category: return
+        price = simpledialog.askstring("Dodaj produkt", "Cena (PLN):", parent=root)
+        if not price: return
+        stock = simpledialog.askinteger("Dodaj produkt", "Ilość w magazynie:", minvalue=0, parent=root)
+        if stock is None: return
+
+        def added(pid):
+            messagebox.showinfo("Sukces", f"Dodano {name} (ID:{pid})", parent=root)
+            poll_changes()
+        when_done(root, service.add_product(name, category, price, stock), added)
 
     @log_action("Usuwanie produktu z bazy")
     def do_remove_product():
-        """Usuwa produkt po ID lub nazwie."""
-        try:
-            key = simpledialog.askstring("Usuń produkt", "Podaj ID lub nazwę:", parent=root)
-            if not key:
-                return
-            try:
-                remove_product(key)
-            except ValueError:
-                remove_product(key, by='Nazwa')
+        """Zleca usunięcie produktu po ID lub nazwie."""
+        key = simpledialog.askstring("Usuń produkt", "Podaj ID lub nazwę:", parent=root)
+        if not key:
+            return
+
+        def removed(_):
             messagebox.showinfo("Sukces", f"Usunięto {key}", parent=root)
-            refresh_products()
-        except Exception as e:
-            messagebox.showerror("Błąd", str(e), parent=root)
+            poll_changes()
+        when_done(root, service.remove_product(key), removed)
 
     # Interfejs: wyszukiwarka + lista produktów + przyciski
     frm = ttk.Frame(tab_products)
     frm.pack(fill='x', padx=10, pady=5)
     ttk.Label(frm, text="Szukaj:").pack(side='left')
-    ent_search = AutocompleteEntry(list_products, frm, textvariable=search_var)
+    ent_search = AutocompleteEntry(lambda: products, frm, textvariable=search_var)
     ent_search.pack(side='left', fill='x', expand=True, padx=5)
-    ent_search.bind('<KeyRelease>', lambda e: refresh_products())
+    ent_search.bind('<KeyRelease>', lambda e: render_products())
 
     cols = ('ID', 'Nazwa', 'Cena', 'Ilość')
     tree_products = ttk.Treeview(tab_products, columns=cols, show='headings')
@@ -275,22 +371,26 @@ def run_gui(client_id=None):
     # === ZAKŁADKA: Koszyk ===
 
     def refresh_cart():
-        """Odświeża listę produktów w koszyku i sumę."""
+        """Odświeża listę produktów w koszyku i sumę (bez czytania pliku z produktami)."""
         tree_cart.delete(*tree_cart.get_children())
-        total = 0.0
-        df = pd.read_excel(DATA_PATH).set_index('ID')
         for pid, qty in cart:
-            price = float(df.at[pid, 'Cena'])
-            total += price * qty
-            tree_cart.insert('', 'end', values=(pid, qty))
-        sum_var.set(f"Razem: {total:.2f} PLN")
+            tree_cart.insert('', 'end', iid=pid, values=(pid, qty))
+        label = f"Razem: {cart.total:.2f} PLN"
+        if cart.rules and cart.subtotal - cart.total > 0.004:
+            label += f" (rabat: {cart.subtotal - cart.total:.2f} PLN)"
+        sum_var.set(label)
+        # Podpowiedzi "klienci kupili także" dla zawartości koszyka
+        names = dict(zip(cart.catalog['ids'], cart.catalog['names']))
+        hints = [f"{pid} {names[pid]}" for pid, _ in service.also_bought([pid for pid, _ in cart])
+                 if pid in names]
+        suggest_var.set("Klienci kupili także: " + ", ".join(hints) if hints else "")
 
     def remove_from_cart():
         """Usuwa zaznaczony produkt z koszyka."""
         sel = tree_cart.selection()
         if not sel:
             return
-        cart.pop(tree_cart.index(sel[0]))
+        cart.remove(sel[0])
         refresh_cart()
 
     def show_receipt(cid, items):
@@ -300,17 +400,9 @@ def run_gui(client_id=None):
         win.transient(root)
         win.lift()
         win.focus_force()
-        text = tk.Text(win, width=50, height=len(items) + 6)
-        total = 0.0
-        df = pd.read_excel(DATA_PATH).set_index('ID')
-        text.insert('end', f"=== PARAGON Frog ===\nKlient: {cid}\n")
-        text.insert('end', f"Data: {datetime.datetime.now():%Y-%m-%d %H:%M}\n\n")
-        for pid, qty in items:
-            cena = float(df.at[pid, 'Cena'])
-            lt = cena * qty
-            total += lt
-            text.insert('end', f"{pid} {df.at[pid, 'Nazwa']} x{qty} @ {cena:.2f} = {lt:.2f}\n")
-        text.insert('end', f"\nRAZEM: {total:.2f} PLN")
+        receipt = render_text(price_receipt(cart.catalog, cid, datetime.datetime.now(), items, cart.rules))
+        text = tk.Text(win, width=50, height=receipt.count('\n') + 2)
+        text.insert('end', receipt)
         text.config(state='disabled')
         text.pack(fill='both', expand=True)
 
@@ -326,14 +418,27 @@ def run_gui(client_id=None):
             else:
                 nb.select(tab_account)
                 return
-        purchased = purchase_products(client_id, cart)
-        if purchased:
-            show_receipt(client_id, purchased)
-            cart.clear()
+        cid = client_id
+
+        def done(purchased):
+            btn_checkout.state(['!disabled'])
+            if purchased:
+                show_receipt(cid, purchased)
+                cart.clear()
+                poll_changes()
+                refresh_cart()
+                messagebox.showinfo("Sukces", "Zakup zakończony.", parent=root)
+            else:
+                messagebox.showwarning("Błąd", "Żaden towar niedostępny.", parent=root)
+
+        def failed(e):
+            btn_checkout.state(['!disabled'])
+            messagebox.showerror("Błąd", str(e), parent=root)
+            poll_changes()
             refresh_cart()
-            messagebox.showinfo("Sukces", "Zakup zakończony.", parent=root)
-        else:
-            messagebox.showwarning("Błąd", "Żaden towar niedostępny.", parent=root)
+
+        btn_checkout.state(['disabled'])  # Jeden zakup naraz – do nadejścia wyniku
+        when_done(root, service.checkout(cid, cart.to_purchase()), done, failed)
 
     # Interfejs koszyka
     tree_cart = ttk.Treeview(tab_cart, columns=('ID', 'Ilość'), show='headings')
@@ -344,47 +449,68 @@ def run_gui(client_id=None):
 
     sum_var = tk.StringVar(master=root, value="Razem: 0.00 PLN")
     ttk.Label(tab_cart, textvariable=sum_var).pack(anchor='e', padx=10)
+    suggest_var = tk.StringVar(master=root, value="")
+    ttk.Label(tab_cart, textvariable=suggest_var, wraplength=500).pack(anchor='w', padx=10)
 
     cart_btns = ttk.Frame(tab_cart)
     ttk.Button(cart_btns, text="Usuń", command=remove_from_cart).pack(side='left', padx=5)
-    ttk.Button(cart_btns, text="Finalizuj zakup", command=checkout).pack(side='left')
+    btn_checkout = ttk.Button(cart_btns, text="Finalizuj zakup", command=checkout)
+    btn_checkout.pack(side='left')
     cart_btns.pack(pady=(0, 10))
     # === ZAKŁADKA: Historia zakupów ===
 
+    hist_from, hist_to, hist_product = tk.StringVar(), tk.StringVar(), tk.StringVar()
+    hist_cursor = None  # Kursor następnej (starszej) strony historii
+    hist_query = 0      # Numer bieżącego zapytania – odpowiedzi na starsze są pomijane
+    hist_params = {}    # Filtry bieżącego zapytania (zapamiętane przy „Filtruj”)
+
+    hist_filters = ttk.Frame(tab_history)
+    hist_filters.pack(fill='x', padx=10, pady=(5, 0))
+    for label, var, width in (("Od:", hist_from, 11), ("Do:", hist_to, 11), ("Produkt:", hist_product, 8)):
+        ttk.Label(hist_filters, text=label).pack(side='left')
+        ttk.Entry(hist_filters, textvariable=var, width=width).pack(side='left', padx=(2, 8))
+
     tree_hist = ttk.Treeview(tab_history, columns=('Data', 'Pozycje', 'Kwota'), show='headings')
     tree_hist.heading('Data', text='Data')
     tree_hist.heading('Pozycje', text='Pozycje')
     tree_hist.heading('Kwota', text='Kwota')
     tree_hist.pack(fill='both', expand=True, padx=10, pady=5)
 
+    def load_history_page():
+        """
+        Zleca wczytanie kolejnej strony historii (od najnowszych) i dopisuje ją do tabeli.
+        Używa filtrów zapamiętanych przez refresh_history – pola edytowane bez „Filtruj” nie mieszają wyników.
+        """
+        cid, query, filters = client_id, hist_query, hist_params
+        btn_older.state(['disabled'])
+
+        def loaded(result):
+            nonlocal hist_cursor
+            if cid != client_id or query != hist_query:  # Klient lub filtr zmienił się w międzyczasie
+                return
+            rows, hist_cursor = result
+            for row in rows:
+                tree_hist.insert('', 'end', values=row)
+            if hist_cursor is not None:
+                btn_older.state(['!disabled'])
+        when_done(root, service.history(cid, HISTORY_PAGE, hist_cursor, **filters), loaded)
+
     def refresh_history():
-        """Wczytuje historię zakupów klienta z pliku tekstowego."""
+        """Czyści tabelę historii i wczytuje pierwszą stronę (z filtrami wpisanymi w pola)."""
+        nonlocal hist_cursor, hist_query, hist_params
         tree_hist.delete(*tree_hist.get_children())
+        hist_cursor, hist_query = None, hist_query + 1
+        hist_params = {'date_from': hist_from.get().strip() or None,
+                       'date_to': hist_to.get().strip() or None,
+                       'product': hist_product.get().strip().upper() or None}
         if not client_id:
+            btn_older.state(['disabled'])
             return
-        path = os.path.join(RECEIPTS_DIR, f"{client_id}.txt")
-        if os.path.exists(path):
-            for line in open(path, encoding='utf-8'):
-                if '->' not in line:
-                    continue
-                dt, items_str = line.strip().split(' -> ', 1)
-                try:
-                    items = eval(items_str)
-                except Exception:
-                    items = []
-                df = pd.read_excel(DATA_PATH).set_index('ID')
-                details = []
-                total = 0.0
-                for pid, qty in items:
-                    if pid in df.index:
-                        cena = float(df.at[pid, 'Cena'])
-                        lt = cena * qty
-                        total += lt
-                        details.append(f"{pid}x{qty}={lt:.2f}")
-                tree_hist.insert(
-                    '', 'end',
-                    values=(dt, ', '.join(details), f"{total:.2f} PLN")
-                )
+        load_history_page()
+
+    ttk.Button(hist_filters, text="Filtruj", command=refresh_history).pack(side='left')
+    btn_older = ttk.Button(tab_history, text="Starsze zakupy", command=load_history_page)
+    btn_older.pack(pady=(0, 10))
 
     nb.bind('<<NotebookTabChanged>>',
             lambda e: refresh_history() if nb.index('current') == 2 else None)
@@ -408,17 +534,20 @@ def run_gui(client_id=None):
         ent_pwd = ttk.Entry(tab_login, show='*'); ent_pwd.grid(row=1, column=1)
 
         def do_login():
-            nonlocal client_id
-            if authenticate(ent_id.get(), ent_pwd.get()):
-                client_id = ent_id.get()
-                messagebox.showinfo("OK", "Zalogowano", parent=root)
-                build_account_tabs()
-                refresh_history()
-            else:
-                messagebox.showerror("Błąd", "Niepoprawne dane", parent=root)
+            cid = ent_id.get()
+
+            def checked(ok):
+                nonlocal client_id
+                if ok:
+                    client_id = cid
+                    messagebox.showinfo("OK", "Zalogowano", parent=root)
+                    build_account_tabs()
+                    refresh_history()
+                else:
+                    messagebox.showerror("Błąd", "Niepoprawne dane", parent=root)
+            when_done(root, service.login(cid, ent_pwd.get()), checked)
 
         def do_register():
-            nonlocal client_id
             im = simpledialog.askstring("Imię", "Podaj imię:", parent=root)
             if not im: return
             nm = simpledialog.askstring("Nazwisko", "Podaj nazwisko:", parent=root)
@@ -431,29 +560,28 @@ def run_gui(client_id=None):
             if phone is None or not(phone.isdigit() and len(phone) == 9):
                 messagebox.showerror("Błąd", "Telefon musi mieć 9 cyfr", parent=root)
                 return
-            try:
-                cid = register_with_password(im, nm, email, pwd, phone)
+
+            def registered(cid):
+                nonlocal client_id
                 client_id = cid
                 messagebox.showinfo("OK", f"Zarejestrowano ID={cid}", parent=root)
                 build_account_tabs()
                 refresh_history()
-            except ValueError as e:
-                messagebox.showerror("Błąd", str(e), parent=root)
+            when_done(root, service.register(im, nm, email, pwd, phone), registered)
 
         ttk.Button(tab_login, text="Zaloguj", command=do_login).grid(row=2, columnspan=2, pady=5)
         ttk.Button(tab_login, text="Rejestracja", command=do_register).grid(row=3, columnspan=2, pady=5)
 
     def build_info_tab():
-        """Wyświetla dane zalogowanego użytkownika + opcje edycji konta."""
+        """Zleca wczytanie danych zalogowanego użytkownika i wyświetla je z opcjami edycji konta."""
         for w in tab_info.winfo_children():
             w.destroy()
+        when_done(root, service.customer(client_id), render_info)
 
-        user_data = {}
-        with open(CUSTOMERS_CSV, newline='', encoding='utf-8') as f:
-            for r in csv.DictReader(f):
-                if r['ID'] == client_id:
-                    user_data = r
-                    break
+    def render_info(user_data):
+        """Wyświetla dane użytkownika + opcje edycji konta."""
+        for w in tab_info.winfo_children():
+            w.destroy()
 
         ttk.Label(tab_info, text=f"ID: {user_data.get('ID','')}").pack(anchor='w', pady=(5, 0))
         ttk.Label(tab_info, text=f"Email: {user_data.get('Email','')}").pack(anchor='w')
@@ -464,22 +592,14 @@ def run_gui(client_id=None):
         def change_value(label, key, validate, transform, success_msg):
             """Pomocnicza funkcja do zmiany danych konta."""
             new = simpledialog.askstring(label, label + ":", parent=root)
-            if not validate(new):
+            if new is None or not validate(new):
                 messagebox.showerror("Błąd", f"Niepoprawna wartość: {label}", parent=root)
                 return
-            rows = []
-            with open(CUSTOMERS_CSV, newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for r in reader:
-                    if r['ID'] == client_id:
-                        r[key] = transform(new)
-                    rows.append(r)
-            with open(CUSTOMERS_CSV, 'w', newline='', encoding='utf-8') as f:
-                wr = csv.DictWriter(f, fieldnames=reader.fieldnames)
-                wr.writeheader()
-                wr.writerows(rows)
-            messagebox.showinfo("OK", success_msg, parent=root)
-            build_info_tab()
+
+            def changed(_):
+                messagebox.showinfo("OK", success_msg, parent=root)
+                build_info_tab()
+            when_done(root, service.update_customer(client_id, key, transform(new)), changed)
 
         if not phone:
             ttk.Button(tab_info, text="Dodaj telefon", command=lambda: change_value(
@@ -505,25 +625,20 @@ def run_gui(client_id=None):
 
         def change_pwd():
             old = simpledialog.askstring("Stare hasło", "Podaj stare:", show='*', parent=root)
-            if old is None or not authenticate(client_id, old):
+            if old is None:
                 messagebox.showerror("Błąd", "Niepoprawne hasło", parent=root)
                 return
-            new = simpledialog.askstring("Nowe hasło", "Podaj nowe:", show='*', parent=root)
-            if not new:
-                return
-            h = hash_password(new)
-            rows = []
-            with open(CUSTOMERS_CSV, newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for r in reader:
-                    if r['ID'] == client_id:
-                        r['PasswordHash'] = h
-                    rows.append(r)
-            with open(CUSTOMERS_CSV, 'w', newline='', encoding='utf-8') as f:
-                wr = csv.DictWriter(f, fieldnames=reader.fieldnames)
-                wr.writeheader()
-                wr.writerows(rows)
-            messagebox.showinfo("OK", "Hasło zmienione", parent=root)
+
+            def checked(ok):
+                if not ok:
+                    messagebox.showerror("Błąd", "Niepoprawne hasło", parent=root)
+                    return
+                new = simpledialog.askstring("Nowe hasło", "Podaj nowe:", show='*', parent=root)
+                if not new:
+                    return
+                when_done(root, service.change_password(client_id, old, new),
+                          lambda _: messagebox.showinfo("OK", "Hasło zmienione", parent=root))
+            when_done(root, service.login(client_id, old), checked)
 
         ttk.Button(tab_info, text="Zmień hasło", command=change_pwd).pack(pady=5)
 
@@ -553,6 +668,13 @@ def run_gui(client_id=None):
     # Odświeżenie list na start
     refresh_products()
     refresh_cart()
+    watch_changes()
+    def on_close():
+        """Kończy zlecone operacje, zapisuje model rekomendacji i zamyka okno."""
+        service.close()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
     root.mainloop()  # Uruchomienie pętli GUI
 
 # --- Punkt wejścia programu ---
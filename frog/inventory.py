@@ -0,0 +1,261 @@
+"""
+Moduł dziennika magazynowego sklepu Żabka.
+Każda zmiana stanu (przyjęcie, sprzedaż, korekta, usunięcie produktu) jest dopisywana
+jako jedna linia do dziennika – bez przepisywania całego pliku products.xlsx.
+Bieżący stan to ostatni zapisany snapshot plus krótki ogon dziennika odtworzony od jego offsetu.
+Ścieżki dziennika i snapshotu pochodzą z bieżącego sklepu (frog.store).
+Zapisy są wykonywane pod wyłączną blokadą dziennika (locked) – wspólną dla wątków i procesów,
+więc sprawdzenie stanu i dopisanie sprzedaży (update_stock) nie przeplata się z innymi kasami.
+Zawiera funkcje: locked, record, receive, sell, adjust, delete, current_stock, read_events, snapshot.
+"""
+
+# --- Importy ---
+import contextlib
+import datetime
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from frog.store import current_store
+
+# Nowy snapshot jest zapisywany, gdy ogon dziennika za ostatnim snapshotem przekroczy ten rozmiar
+SNAPSHOT_EVERY_BYTES = 64 * 1024
+
+# --- Rodzaje zdarzeń ---
+RECEIVE = 'receive'   # przyjęcie towaru (+ilość)
+SELL = 'sell'         # sprzedaż (-ilość)
+ADJUST = 'adjust'     # korekta – ustawienie stanu na podaną wartość
+DELETE = 'delete'     # usunięcie produktu z magazynu
+EVENTS = (RECEIVE, SELL, ADJUST, DELETE)
+
+# Stany odtworzone w tym procesie – osobno dla dziennika każdego sklepu
+_states = {}
+_states_lock = threading.Lock()  # Chroni sam słownik _states (zakładanie nowych wpisów)
+
+
+def _journal_state(journal):
+    """
+    Zwraca stan odtworzony z danego dziennika: offset, do którego go zastosowano,
+    stany, offset ostatniego snapshotu i blokadę (RLock) chroniącą wpis przed wątkami.
+    """
+    with _states_lock:
+        state = _states.get(journal)
+        if state is None:
+            state = _states[journal] = {'offset': None, 'stock': {}, 'snapshot_offset': 0,
+                                        'lock': threading.RLock(), 'depth': 0}
+        return state
+
+
+# Blokada plikowa (msvcrt) obejmuje bajt daleko za końcem dziennika, żeby nie blokować odczytów
+_LOCK_OFFSET = 1 << 40
+
+
+def _lock_file(f):
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(_LOCK_OFFSET)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(f):
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(_LOCK_OFFSET)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextlib.contextmanager
+def locked(baseline=None):
+    """
+    Wyłączna blokada dziennika bieżącego sklepu: RLock dla wątków tego procesu
+    i blokada pliku dziennika dla innych procesów (kas). Można ją zagnieżdżać.
+    Wewnątrz bloku current_stock() widzi wszystkie zdarzenia innych kas, a nikt inny
+    nie dopisze zdarzeń przed końcem bloku – sprawdzenie stanu i zapis są jedną operacją.
+    :param baseline: funkcja stanu bazowego, używana tylko przy zakładaniu dziennika
+    """
+    journal = current_store().inventory_log
+    _ensure_journal(journal, baseline)
+    state = _journal_state(journal)
+    with state['lock']:
+        if state['depth']:  # Blokada pliku jest już w rękach tego wątku
+            state['depth'] += 1
+            try:
+                yield
+            finally:
+                state['depth'] -= 1
+            return
+        with open(journal, 'a', encoding='utf-8') as f:
+            _lock_file(f)
+            state['depth'] = 1
+            try:
+                yield
+            finally:
+                state['depth'] = 0
+                _unlock_file(f)
+
+
+# --- Zastosowanie zdarzeń ---
+def _apply(stock, event, pid, qty):
+    """Aplikuje jedno zdarzenie do słownika stanów (w miejscu)."""
+    if event == RECEIVE:
+        stock[pid] = stock.get(pid, 0) + qty
+    elif event == SELL:
+        stock[pid] = stock.get(pid, 0) - qty
+    elif event == ADJUST:
+        stock[pid] = qty
+    elif event == DELETE:
+        stock.pop(pid, None)
+
+
+def read_events(journal, offset=0):
+    """
+    Czyta zdarzenia dopisane do dziennika za offsetem (w bajtach).
+    Zwraca (nowy offset, lista krotek (zdarzenie, ID, ilość)).
+    Niepełna ostatnia linia (zapis w toku) jest pomijana do następnego odczytu.
+    """
+    with open(journal, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b'\n') + 1
+    events = []
+    for line in data[:end].decode('utf-8').splitlines():
+        parts = line.split('\t')
+        if len(parts) != 4 or parts[1] not in EVENTS:
+            continue  # Uszkodzona linia – pomijamy
+        try:
+            events.append((parts[1], parts[2], int(parts[3])))
+        except ValueError:
+            continue
+    return offset + end, events
+
+
+def _replay(journal, stock, offset):
+    """Odtwarza dziennik od offsetu (w bajtach) i zwraca nowy offset."""
+    offset, events = read_events(journal, offset)
+    for event, pid, qty in events:
+        _apply(stock, event, pid, qty)
+    return offset
+
+
+def _load_snapshot(path):
+    """Wczytuje snapshot (offset, stany) albo zwraca pusty stan od początku dziennika."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return int(data['offset']), dict(data['stock'])
+    except (FileNotFoundError, ValueError, KeyError):
+        return 0, {}
+
+
+# --- Zapis zdarzeń ---
+def _ensure_journal(journal, baseline):
+    """
+    Zakłada dziennik, jeśli nie istnieje. Pierwsze linie to korekty (adjust)
+    ze stanem bazowym każdego produktu, więc sam dziennik zawsze opisuje pełny stan.
+    :param journal: ścieżka dziennika
+    :param baseline: funkcja zwracająca słownik ID -> stan (np. odczyt z products.xlsx)
+    """
+    if os.path.exists(journal):
+        return
+    os.makedirs(os.path.dirname(journal), exist_ok=True)
+    stamp = datetime.datetime.now().isoformat(timespec='seconds')
+    stock = baseline() if baseline else {}
+    tmp = f"{journal}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.writelines(f"{stamp}\t{ADJUST}\t{pid}\t{int(qty)}\n" for pid, qty in stock.items())
+    try:
+        os.link(tmp, journal)  # Atomowo i tylko jeśli nikt nas nie uprzedził
+    except FileExistsError:
+        pass
+    finally:
+        os.remove(tmp)
+
+
+def record(events, baseline=None):
+    """
+    Dopisuje zdarzenia do dziennika jednym zapisem (O(1) względem wielkości katalogu).
+    :param events: lista krotek (zdarzenie, ID, ilość), np. [('sell', 'P001', 2)]
+    :param baseline: funkcja stanu bazowego, używana tylko przy zakładaniu dziennika
+    """
+    for event, _, qty in events:
+        if event not in EVENTS:
+            raise ValueError(f"Nieznane zdarzenie magazynowe: {event}")
+        if qty < 0:
+            raise ValueError("Ilość w zdarzeniu nie może być ujemna.")
+    journal = current_store().inventory_log
+    stamp = datetime.datetime.now().isoformat(timespec='seconds')
+    payload = ''.join(f"{stamp}\t{event}\t{pid}\t{int(qty)}\n" for event, pid, qty in events)
+    with locked(baseline):
+        with open(journal, 'a', encoding='utf-8') as f:
+            f.write(payload)
+            end = f.tell()
+        if end - _journal_state(journal)['snapshot_offset'] > SNAPSHOT_EVERY_BYTES:
+            snapshot()
+
+
+def receive(pid, qty, baseline=None):
+    """Przyjęcie qty sztuk produktu na magazyn."""
+    record([(RECEIVE, str(pid), qty)], baseline)
+
+
+def sell(items, baseline=None):
+    """Sprzedaż: items to lista par (ID, ilość), np. koszyk z kasy."""
+    record([(SELL, str(pid), qty) for pid, qty in items], baseline)
+
+
+def adjust(pid, qty, baseline=None):
+    """Korekta – ustawia stan produktu na qty (np. po inwentaryzacji)."""
+    record([(ADJUST, str(pid), qty)], baseline)
+
+
+def delete(pid, baseline=None):
+    """Usuwa produkt z magazynu."""
+    record([(DELETE, str(pid), 0)], baseline)
+
+
+# --- Odczyt stanu ---
+def current_stock(baseline=None):
+    """
+    Zwraca bieżące stany magazynowe (słownik ID -> ilość).
+    W tym procesie odtwarzany jest tylko ogon dziennika dopisany od ostatniego odczytu;
+    przy pierwszym odczycie – od offsetu ostatniego snapshotu.
+    """
+    store = current_store()
+    journal = store.inventory_log
+    _ensure_journal(journal, baseline)
+    state = _journal_state(journal)
+    with state['lock']:
+        if state['offset'] is None or os.path.getsize(journal) < state['offset']:
+            # Pierwszy odczyt (lub obcięty plik) – zaczynamy od snapshotu
+            offset, stock = _load_snapshot(store.inventory_snapshot)
+            if offset > os.path.getsize(journal):
+                offset, stock = 0, {}
+            state.update(offset=offset, stock=stock, snapshot_offset=offset)
+        state['offset'] = _replay(journal, state['stock'], state['offset'])
+        return dict(state['stock'])
+
+
+def snapshot():
+    """
+    Zapisuje skompaktowany stan (stany + offset w dzienniku) do pliku snapshotu.
+    Zapis jest atomowy (plik tymczasowy + podmiana), więc czytelnicy widzą stary albo nowy snapshot.
+    """
+    store = current_store()
+    state = _journal_state(store.inventory_log)
+    with state['lock']:
+        stock = current_stock()
+        offset = state['offset']
+        tmp = f"{store.inventory_snapshot}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'offset': offset, 'stock': stock}, f, ensure_ascii=False)
+        os.replace(tmp, store.inventory_snapshot)
+        state['snapshot_offset'] = offset
+        return offset
@@ -0,0 +1,231 @@
+"""
+Moduł wyceny koszyka sklepu Żabka – silnik cen, promocji i sum.
+Wycenia koszyki (listy par ID, ilość) na tablicach NumPy względem indeksu katalogu.
+Obsługuje promocje: "kup N zapłać za M", rabat procentowy na kategorię
+oraz rabat od wartości koszyka (progi kwotowe).
+Zawiera funkcje: build_catalog, multi_buy, category_discount, basket_threshold,
+load_rules, price_cart, price_carts, priced_carts.
+"""
+
+# --- Importy ---
+import configparser
+import os
+
+import numpy as np
+
+# --- Rodzaje reguł promocyjnych ---
+MULTI_BUY = 'multi_buy'      # kup `buy` sztuk, zapłać za `pay`
+CATEGORY = 'category'        # rabat procentowy na wszystkie produkty kategorii
+THRESHOLD = 'threshold'      # rabat procentowy od koszyka o wartości >= min_total
+
+# Sekcja pliku INI z definicjami promocji
+PROMOTIONS_SECTION = 'promotions'
+
+
+# --- Indeks katalogu ---
+def build_catalog(products):
+    """
+    Buduje indeks katalogu z listy produktów (np. wyniku list_products()).
+    Zwraca słownik z tablicami cen, stanów i kodów kategorii oraz mapą ID -> pozycja.
+    """
+    ids = [str(p['ID']) for p in products]
+    categories = [str(p.get('Kategoria', '')) for p in products]
+    cat_index = {}
+    cat_codes = [cat_index.setdefault(c.casefold(), len(cat_index)) for c in categories]
+    return {
+        'ids': ids,
+        'index': {pid: pos for pos, pid in enumerate(ids)},
+        'names': [str(p.get('Nazwa', '')) for p in products],
+        'categories': categories,
+        'prices': np.array([float(p['Cena']) for p in products], dtype=np.float64),
+        'stock': np.array([int(p.get('Ilość_w_magazynie', 0)) for p in products], dtype=np.int64),
+        'cat_codes': np.array(cat_codes, dtype=np.int64),
+        'cat_index': cat_index,
+    }
+
+
+# --- Konstruktory reguł promocyjnych ---
+def multi_buy(product_id, buy, pay):
+    """Promocja "kup `buy` zapłać za `pay`" dla jednego produktu (np. 3 za 2)."""
+    if not 0 <= pay < buy:
+        raise ValueError("Promocja wielosztukowa wymaga 0 <= pay < buy.")
+    return {'type': MULTI_BUY, 'ID': str(product_id), 'buy': int(buy), 'pay': int(pay)}
+
+
+def category_discount(category, percent):
+    """Rabat procentowy na wszystkie produkty z danej kategorii."""
+    if not 0 < percent <= 100:
+        raise ValueError("Rabat procentowy musi być z przedziału (0, 100].")
+    return {'type': CATEGORY, 'Kategoria': str(category), 'percent': float(percent)}
+
+
+def basket_threshold(min_total, percent):
+    """Rabat procentowy od całego koszyka, jeśli jego wartość (po rabatach) >= min_total."""
+    if not 0 < percent <= 100:
+        raise ValueError("Rabat procentowy musi być z przedziału (0, 100].")
+    return {'type': THRESHOLD, 'min_total': float(min_total), 'percent': float(percent)}
+
+
+def load_rules(config_path):
+    """
+    Wczytuje reguły promocyjne z sekcji [promotions] pliku INI, np.:
+        multi_buy.P031 = 3:2
+        category.Napoje = 10
+        threshold.100 = 5
+    Brak pliku lub sekcji oznacza brak promocji.
+    """
+    config = configparser.ConfigParser()
+    if os.path.exists(config_path):
+        config.read(config_path, encoding='utf-8')
+    if PROMOTIONS_SECTION not in config:
+        return []
+    rules = []
+    for key, value in config[PROMOTIONS_SECTION].items():
+        kind, _, target = key.partition('.')
+        value = value.split(';')[0].strip()  # Pomijamy komentarz na końcu linii
+        if kind == MULTI_BUY:
+            buy, pay = value.split(':')
+            rules.append(multi_buy(target.upper(), int(buy), int(pay)))
+        elif kind == CATEGORY:
+            rules.append(category_discount(target, float(value)))
+        elif kind == THRESHOLD:
+            rules.append(basket_threshold(float(target), float(value)))
+        else:
+            raise ValueError(f"Nieznany typ promocji: {key}")
+    return rules
+
+
+# --- Kompilacja reguł do tablic ---
+def _compile_rules(catalog, rules):
+    """Zamienia listę reguł na tablice indeksowane pozycją produktu / kodem kategorii."""
+    n = len(catalog['ids'])
+    mb_buy = np.zeros(n, dtype=np.int64)
+    mb_pay = np.zeros(n, dtype=np.int64)
+    cat_pct = np.zeros(len(catalog['cat_index']), dtype=np.float64)
+    thresholds = []
+    for rule in rules:
+        if rule['type'] == MULTI_BUY:
+            pos = catalog['index'].get(rule['ID'])
+            if pos is not None:
+                mb_buy[pos], mb_pay[pos] = rule['buy'], rule['pay']
+        elif rule['type'] == CATEGORY:
+            code = catalog['cat_index'].get(rule['Kategoria'].casefold())
+            if code is not None:
+                cat_pct[code] = max(cat_pct[code], rule['percent'])
+        elif rule['type'] == THRESHOLD:
+            thresholds.append((rule['min_total'], rule['percent']))
+    thresholds.sort()
+    mins = np.array([t[0] for t in thresholds], dtype=np.float64)
+    # Najlepszy rabat dostępny od danego progu wzwyż (max narastająco)
+    best = np.maximum.accumulate(np.array([t[1] for t in thresholds], dtype=np.float64)) \
+        if thresholds else np.zeros(0)
+    return {'mb_buy': mb_buy, 'mb_pay': mb_pay, 'cat_pct': cat_pct,
+            'th_min': mins, 'th_pct': best}
+
+
+def _positions(catalog, cart):
+    """Zamienia koszyk (ID, ilość) na tablice pozycji w katalogu i ilości."""
+    index = catalog['index']
+    try:
+        pos = np.fromiter((index[str(pid)] for pid, _ in cart), dtype=np.int64, count=len(cart))
+    except KeyError as e:
+        raise KeyError(f"Nieznany produkt: {e.args[0]}") from None
+    qty = np.fromiter((int(q) for _, q in cart), dtype=np.int64, count=len(cart))
+    return pos, qty
+
+
+def _price_lines(catalog, compiled, pos, qty):
+    """Wycenia pozycje: zwraca (cena jednostkowa, wartość brutto, rabat na pozycji)."""
+    price = catalog['prices'][pos]
+    gross = price * qty
+    buy = compiled['mb_buy'][pos]
+    pay = compiled['mb_pay'][pos]
+    # Darmowe sztuki z promocji "kup N zapłać za M"
+    free = np.where(buy > 0, (qty // np.maximum(buy, 1)) * (buy - pay), 0)
+    line_discount = free * price
+    # Rabat kategorii liczony od wartości po promocji wielosztukowej
+    pct = compiled['cat_pct'][catalog['cat_codes'][pos]]
+    line_discount = line_discount + (gross - line_discount) * pct / 100.0
+    return price, gross, line_discount
+
+
+def _basket_discount(compiled, net):
+    """Rabat koszykowy dla tablicy wartości koszyków po rabatach na pozycjach."""
+    if not len(compiled['th_min']):
+        return np.zeros_like(net)
+    idx = np.searchsorted(compiled['th_min'], net, side='right') - 1
+    pct = np.where(idx >= 0, compiled['th_pct'][np.maximum(idx, 0)], 0.0)
+    return net * pct / 100.0
+
+
+# --- Wycena ---
+def price_cart(catalog, cart, rules=()):
+    """
+    Wycenia jeden koszyk (ten sam rachunek i zaokrąglenia co price_carts).
+    :param catalog: indeks z build_catalog()
+    :param cart: lista par (ID, ilość)
+    :param rules: lista reguł promocyjnych
+    :return: słownik z pozycjami ('lines') i sumami: subtotal, discount, total
+    """
+    return next(priced_carts(catalog, [cart], rules))
+
+
+def price_carts(catalog, carts, rules=(), lines=False):
+    """
+    Wycenia wiele koszyków naraz (np. uzgodnienie na koniec dnia).
+    Wszystkie pozycje wszystkich koszyków są liczone jednym zestawem operacji na tablicach.
+    :param lines: czy zwrócić też tablice pozycji (np. do wydruku paragonów)
+    :return: słownik tablic NumPy (po jednej wartości na koszyk): subtotal, discount, total,
+             basket_discount; z lines=True także tablice po jednej wartości na pozycję:
+             owner (numer koszyka), pos (pozycja w katalogu), qty, price, gross, line_discount
+    """
+    compiled = _compile_rules(catalog, rules)
+    n = len(carts)
+    owner = np.repeat(np.arange(n), np.array([len(c) for c in carts], dtype=np.int64))
+    flat = [item for cart in carts for item in cart]
+    pos, qty = _positions(catalog, flat)
+    _, gross, line_discount = _price_lines(catalog, compiled, pos, qty)
+    # astype: bincount bez pozycji (puste koszyki) zwraca tablicę całkowitą
+    subtotal = np.bincount(owner, weights=gross, minlength=n).astype(np.float64, copy=False)
+    line_total = np.bincount(owner, weights=line_discount, minlength=n).astype(np.float64, copy=False)
+    net = subtotal - line_total
+    basket = _basket_discount(compiled, net)
+    result = {
+        'subtotal': np.round(subtotal, 2),
+        'discount': np.round(line_total + basket, 2),
+        'total': np.round(net - basket, 2),
+        'basket_discount': np.round(basket, 2),
+    }
+    if lines:
+        result.update(owner=owner, pos=pos, qty=qty, price=catalog['prices'][pos],
+                      gross=gross, line_discount=line_discount)
+    return result
+
+
+def priced_carts(catalog, carts, rules=()):
+    """
+    Generator: wycenia wiele koszyków jednym wywołaniem price_carts i zwraca każdy
+    w formacie price_cart() – z pozycjami (np. do wydruku paragonów z całego dnia).
+    """
+    batch = price_carts(catalog, carts, rules, lines=True)
+    ids, names = catalog['ids'], catalog['names']
+    pos, qty = batch['pos'].tolist(), batch['qty'].tolist()
+    price = np.round(batch['price'], 2).tolist()
+    gross = np.round(batch['gross'], 2).tolist()
+    line_discount = np.round(batch['line_discount'], 2).tolist()
+    to_pay = np.round(batch['gross'] - batch['line_discount'], 2).tolist()
+    subtotal, basket = batch['subtotal'].tolist(), batch['basket_discount'].tolist()
+    discount, total = batch['discount'].tolist(), batch['total'].tolist()
+    start = 0
+    for n, cart in enumerate(carts):
+        end = start + len(cart)
+        yield {
+            'lines': [{'ID': ids[pos[j]], 'Nazwa': names[pos[j]], 'Ilość': qty[j], 'Cena': price[j],
+                       'Wartość': gross[j], 'Rabat': line_discount[j], 'Do_zapłaty': to_pay[j]}
+                      for j in range(start, end)],
+            'subtotal': subtotal[n],
+            'basket_discount': basket[n],
+            'discount': discount[n],
+            'total': total[n],
+        }
+        start = end
@@ -1,15 +1,15 @@
 """
 Moduł obsługi produktów sklepu Żabka – wersja funkcyjna.
-Zawiera funkcje do dodawania, usuwania i listowania produktów spożywczych.
+Zawiera funkcje do dodawania, usuwania, listowania produktów spożywczych i zmiany ich stanów.
 """
 
 # --- Importy ---
 import pandas as pd   # Obsługa plików Excel
 import os             # Obsługa plików i ścieżek
 
-# --- Ścieżka do pliku z produktami ---
-BASE_DIR = os.path.dirname(__file__)  # Ścieżka katalogu tego pliku
-DATA_PATH = os.path.join(BASE_DIR, '..', 'data', 'products.xlsx')  # Lokalizacja pliku Excel z produktami
+from frog import changes    # Dziennik zmian katalogu (powiadomienia dla otwartych okien)
+from frog import inventory  # Dziennik zmian stanów magazynowych
+from frog.store import current_store  # Ścieżki plików bieżącego sklepu (products.xlsx)
 
 # --- Dekorator logujący operacje na produktach ---
 def log_operation(operation):
@@ -25,15 +25,32 @@ def log_operation(operation):
         return wrapper
     return decorator
 
+# --- Stany magazynowe zapisane w pliku Excel (stan bazowy dziennika) ---
+def _stock_column(df):
+    """Kolumna Ilość_w_magazynie jako liczby całkowite – pusta lub nieczytelna komórka to 0."""
+    return pd.to_numeric(df['Ilość_w_magazynie'], errors='coerce').fillna(0).astype(int)
+
+def _workbook_stock():
+    """Zwraca słownik ID -> Ilość_w_magazynie odczytany z pliku Excel."""
+    path = current_store().products_xlsx
+    if not os.path.exists(path):
+        return {}
+    df = pd.read_excel(path)
+    return dict(zip(df['ID'].astype(str), _stock_column(df)))
+
 # --- Funkcja zwracająca wszystkie produkty ---
 def list_products():
     """
     Wczytuje produkty z pliku Excel i zwraca jako listę słowników (dict).
     Każdy słownik to jeden produkt z polami: ID, Nazwa, Kategoria, Cena, Ilość_w_magazynie.
+    Stan magazynowy pochodzi z dziennika magazynowego (inventory).
     """
-    if not os.path.exists(DATA_PATH):
+    path = current_store().products_xlsx
+    if not os.path.exists(path):
         return []
-    df = pd.read_excel(DATA_PATH)
+    df = pd.read_excel(path)
+    stock = inventory.current_stock(baseline=lambda: dict(zip(df['ID'].astype(str), _stock_column(df))))
+    df['Ilość_w_magazynie'] = df['ID'].astype(str).map(stock).fillna(_stock_column(df)).astype(int)
     return df.to_dict(orient='records')
 
 # --- Funkcja dodająca nowy produkt ---
@@ -43,15 +60,19 @@ def add_product(product):
     Dodaje nowy produkt do pliku Excel.
     :param product: dict z kluczami: ID, Nazwa, Kategoria, Cena, Ilość_w_magazynie
     """
+    path = current_store().products_xlsx
     try:
         # Jeśli plik nie istnieje – utwórz pustą tabelę
-        if not os.path.exists(DATA_PATH):
+        if not os.path.exists(path):
             df = pd.DataFrame(columns=['ID', 'Nazwa', 'Kategoria', 'Cena', 'Ilość_w_magazynie'])
         else:
-            df = pd.read_excel(DATA_PATH)
+            df = pd.read_excel(path)
         # Dodaj nowy produkt
         df = pd.concat([df, pd.DataFrame([product])], ignore_index=True)
-        df.to_excel(DATA_PATH, index=False)
+        df.to_excel(path, index=False)
+        # Stan początkowy trafia do dziennika magazynowego
+        inventory.adjust(product['ID'], int(product.get('Ilość_w_magazynie', 0)), _workbook_stock)
+        changes.record(changes.PRODUCTS, [(changes.UPSERT, product['ID'], product)])
     except Exception as e:
         print("Błąd dodawania produktu:", e)
         raise
@@ -63,21 +84,84 @@ def remove_product(key, by='ID'):
     Usuwa produkt na podstawie ID lub nazwy.
     :param key: ID lub nazwa produktu
     :param by: 'ID' (domyślnie) lub 'Nazwa'
+    :return: lista ID usuniętych produktów (pusta, gdy nic nie pasowało – plik nie jest wtedy zapisywany)
     """
+    path = current_store().products_xlsx
     try:
-        if not os.path.exists(DATA_PATH):
+        if not os.path.exists(path):
             raise FileNotFoundError("Brak bazy produktów.")
-        df = pd.read_excel(DATA_PATH)
+        df = pd.read_excel(path)
         if by == 'ID':
-            df = df[df['ID'] != key]
+            keep = df['ID'] != key
         else:
             # Porównanie nazw nie rozróżnia wielkości liter
-            df = df[df['Nazwa'].str.lower() != str(key).lower()]
-        df.to_excel(DATA_PATH, index=False)
+            keep = df['Nazwa'].str.lower() != str(key).lower()
+        removed = df.loc[~keep, 'ID'].astype(str).tolist()
+        if not removed:
+            return removed
+        df[keep].to_excel(path, index=False)
+        inventory.record([(inventory.DELETE, pid, 0) for pid in removed], _workbook_stock)
+        changes.record(changes.PRODUCTS, [(changes.DELETE, pid, None) for pid in removed])
+        return removed
     except Exception as e:
         print("Błąd usuwania produktu:", e)
         raise
 
+# --- Funkcja aktualizująca stany magazynowe ---
+@log_operation("Aktualizacja stanów magazynowych")
+def update_stock(deltas):
+    """
+    Zmienia stany magazynowe produktów – dopisuje zdarzenia do dziennika magazynowego
+    (przyjęcie dla zmian dodatnich, sprzedaż dla ujemnych) zamiast przepisywać plik Excel.
+    :param deltas: lista par (ID, zmiana), np. [('P001', -2)] przy sprzedaży 2 sztuk
+    Produkt dopisany do pliku Excel z pominięciem add_product (brak go w dzienniku) dostaje
+    najpierw korektę do stanu z Excela – tak samo pokazuje go list_products().
+    Podnosi KeyError dla nieznanego ID i ValueError, gdy stan spadłby poniżej zera
+    (wtedy nic nie jest zapisywane). Sprawdzenie i zapis odbywają się pod blokadą dziennika,
+    więc równoległe kasy nie sprzedadzą więcej, niż jest w magazynie.
+    """
+    try:
+        if not os.path.exists(current_store().products_xlsx):
+            raise FileNotFoundError("Brak bazy produktów.")
+        with inventory.locked(_workbook_stock):
+            stock = inventory.current_stock(_workbook_stock)
+            workbook = None
+            events = []
+            for pid, delta in deltas:
+                pid, delta = str(pid), int(delta)
+                if pid not in stock:
+                    if workbook is None:
+                        workbook = _workbook_stock()
+                    if pid not in workbook:
+                        raise KeyError(f"Nieznany produkt: {pid}")
+                    stock[pid] = workbook[pid]
+                    events.append((inventory.ADJUST, pid, workbook[pid]))
+                stock[pid] += delta
+                if stock[pid] < 0:
+                    raise ValueError(f"Brak wystarczającej ilości produktu {pid} w magazynie.")
+                if delta:
+                    events.append((inventory.RECEIVE, pid, delta) if delta > 0 else (inventory.SELL, pid, -delta))
+            inventory.record(events)
+    except Exception as e:
+        print("Błąd aktualizacji stanów:", e)
+        raise
+
+# --- Funkcja zapisująca bieżące stany do pliku Excel ---
+@log_operation("Zapis stanów magazynowych do Excela")
+def sync_stock_to_workbook():
+    """
+    Przepisuje bieżące stany z dziennika magazynowego do kolumny Ilość_w_magazynie
+    (np. na koniec dnia, żeby plik Excel był aktualny dla innych narzędzi).
+    """
+    path = current_store().products_xlsx
+    if not os.path.exists(path):
+        return
+    df = pd.read_excel(path)
+    stock = inventory.current_stock(_workbook_stock)
+    df['Ilość_w_magazynie'] = df['ID'].astype(str).map(stock).fillna(_stock_column(df)).astype(int)
+    df.to_excel(path, index=False)
+    inventory.snapshot()
+
 # --- Funkcja zliczająca produkty (opcjonalnie z filtrem) ---
 def count_products(filter_func=None):
     """
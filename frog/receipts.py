@@ -0,0 +1,292 @@
+"""
+Moduł paragonów sklepu Żabka – wycena i wydruk paragonów niezależnie od Tk.
+Paragon powstaje z linii historii zakupów (DATABASE/<ID>.txt) i migawki katalogu
+(indeks z pricing.build_catalog) razem z promocjami z config.ini.
+Eksport paragonów jednego dnia (tekst, CSV, JSON) dzieli pliki klientów na porcje
+wyceniane wektorowo (pricing.priced_carts) w puli procesów; każda porcja jest zapisywana
+strumieniowo do pliku częściowego, a pliki częściowe są sklejane w kolejności klientów.
+Pozycje produktów, których nie ma już w katalogu, zostają na paragonie bez ceny i z oznaczeniem
+(Nieznany / „brak w katalogu”) – nie są wliczane do sumy, ale nie znikają bez śladu.
+
+Przykład (z katalogu głównego projektu):
+    python -m frog.receipts 2025-05-01 --format csv --output paragony-2025-05-01.csv
+Zawiera: price_receipt, render_text, day_receipts, write_text, write_csv, write_json, export_day.
+"""
+
+# --- Importy ---
+import argparse
+import concurrent.futures
+import contextlib
+import csv
+import datetime
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from frog.customer_manager import parse_receipt_line
+from frog.pricing import build_catalog, load_rules, price_cart, priced_carts
+from frog.product_manager import list_products
+from frog.store import current_store, store_at, use_store
+
+FORMATS = ('txt', 'csv', 'json')
+CSV_FIELDS = ['Klient', 'Data', 'ID', 'Nazwa', 'Ilość', 'Cena', 'Wartość', 'Rabat', 'Do_zapłaty', 'Razem',
+              'Uwagi']
+UNKNOWN_NOTE = 'brak w katalogu'  # Uwaga przy pozycji produktu spoza katalogu (bez ceny)
+CHUNK_FILES = 1000  # Ile plików klientów wycenia jedno zadanie puli
+
+
+# --- Wycena i wydruk pojedynczego paragonu ---
+def price_receipt(catalog, client_id, when, items, rules=()):
+    """
+    Wycenia jeden zakup.
+    :param catalog: indeks katalogu z build_catalog()
+    :param when: data zakupu (tekst z historii albo datetime)
+    :param items: lista par (ID, ilość)
+    :return: wynik price_cart() uzupełniony o 'Klient' i 'Data'
+    """
+    receipt = price_cart(catalog, items, rules)
+    if isinstance(when, datetime.datetime):
+        when = f"{when:%Y-%m-%d %H:%M}"
+    receipt.update(Klient=client_id, Data=when)
+    return receipt
+
+
+def render_text(receipt):
+    """Zwraca tekst paragonu (jak w okienku GUI)."""
+    out = [f"=== PARAGON Frog ===\nKlient: {receipt['Klient']}\nData: {receipt['Data']}\n\n"]
+    for line in receipt['lines']:
+        if line.get('Nieznany'):
+            out.append(f"{line['ID']} x{line['Ilość']} – {UNKNOWN_NOTE}, bez ceny\n")
+            continue
+        out.append(f"{line['ID']} {line['Nazwa']} x{line['Ilość']} @ {line['Cena']:.2f}"
+                   f" = {line['Wartość']:.2f}\n")
+        if line['Rabat']:
+            out.append(f"    rabat -{line['Rabat']:.2f}\n")
+    if receipt['basket_discount']:
+        out.append(f"Rabat koszykowy: -{receipt['basket_discount']:.2f}\n")
+    out.append(f"\nRAZEM: {receipt['total']:.2f} PLN")
+    if receipt.get('unknown'):
+        out.append(f"\n(pozycje spoza katalogu nie są wliczone: {receipt['unknown']})")
+    return ''.join(out)
+
+
+# --- Paragony jednego dnia ---
+def _day_lines(path, day):
+    """Zwraca (data, pozycje) z pliku historii dla linii z danego dnia (RRRR-MM-DD)."""
+    prefix = day.encode('ascii')
+    with open(path, 'rb') as f:
+        data = f.read()
+    found = []
+    start = data.find(prefix)
+    while start != -1:
+        if start == 0 or data[start - 1] == 0x0A:  # Data na początku linii
+            end = data.find(b'\n', start)
+            if end == -1:
+                break  # Niepełna ostatnia linia (zapis w toku)
+            parsed = parse_receipt_line(data[start:end].decode('utf-8', errors='replace'))
+            if parsed:
+                found.append(parsed)
+            start = data.find(prefix, end)
+        else:
+            start = data.find(prefix, start + 1)
+    return found
+
+
+def _client_files(client_ids=None):
+    """Lista (ID klienta, ścieżka) plików historii bieżącego sklepu, posortowana po nazwie."""
+    receipts_dir = current_store().receipts_dir
+    if not os.path.isdir(receipts_dir):
+        return []
+    names = sorted(n for n in os.listdir(receipts_dir) if n.endswith('.txt'))
+    if client_ids is not None:
+        wanted = {f"{cid}.txt" for cid in client_ids}
+        names = [n for n in names if n in wanted]
+    return [(n[:-4], os.path.join(receipts_dir, n)) for n in names]
+
+
+def _unknown_line(pid, qty):
+    """Pozycja produktu spoza katalogu – bez ceny, oznaczona jako Nieznany."""
+    return {'ID': pid, 'Nazwa': '', 'Ilość': qty, 'Cena': None, 'Wartość': None, 'Rabat': None,
+            'Do_zapłaty': None, 'Nieznany': True}
+
+
+def _priced(catalog, rules, raw):
+    """
+    Wycenia listę (klient, data, pozycje) jednym przebiegiem (pricing.priced_carts) i zwraca
+    paragony w formacie price_receipt() uzupełnione o 'unknown' – liczbę pozycji produktów,
+    których nie ma już w katalogu. Takie pozycje zostają na swoim miejscu z oznaczeniem Nieznany.
+    """
+    index = catalog['index']
+    carts = [[(pid, qty) for pid, qty in items if pid in index] for _, _, items in raw]
+    for (cid, dt, items), cart, receipt in zip(raw, carts, priced_carts(catalog, carts, rules)):
+        receipt.update(Klient=cid, Data=dt, unknown=len(items) - len(cart))
+        if receipt['unknown']:
+            priced = iter(receipt['lines'])
+            receipt['lines'] = [next(priced) if pid in index else _unknown_line(pid, qty)
+                                for pid, qty in items]
+        yield receipt
+
+
+def _catalogue_snapshot():
+    """Migawka katalogu i promocji bieżącego sklepu (jedna na cały eksport)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        products = list_products()
+    return build_catalog(products), load_rules(current_store().config_ini)
+
+
+def day_receipts(day, client_ids=None, catalog=None, rules=None):
+    """
+    Generator wycenionych paragonów z jednego dnia (w kolejności klientów i godzin).
+    :param day: dzień RRRR-MM-DD
+    :param client_ids: tylko ci klienci (None = wszyscy)
+    :param catalog: indeks katalogu (domyślnie bieżący katalog sklepu)
+    :param rules: promocje (domyślnie z config.ini sklepu)
+    """
+    if catalog is None:
+        catalog, store_rules = _catalogue_snapshot()
+        if rules is None:
+            rules = store_rules
+    files = _client_files(client_ids)
+    for start in range(0, len(files), CHUNK_FILES):
+        raw = [(cid, dt, items) for cid, path in files[start:start + CHUNK_FILES]
+               for dt, items in _day_lines(path, day)]
+        yield from _priced(catalog, rules or (), raw)
+
+
+# --- Strumieniowe zapisy ---
+def write_text(f, receipts):
+    """Zapisuje paragony jako tekst (pusta linia między paragonami); zwraca ich liczbę."""
+    n = 0
+    for receipt in receipts:
+        f.write(render_text(receipt))
+        f.write('\n\n')
+        n += 1
+    return n
+
+
+def write_csv(f, receipts, header=True):
+    """
+    Zapisuje paragony jako CSV – wiersz na pozycję, z sumą paragonu w kolumnie Razem.
+    Pozycje spoza katalogu mają puste kwoty i uwagę UNKNOWN_NOTE.
+    """
+    writer = csv.writer(f)
+    if header:
+        writer.writerow(CSV_FIELDS)
+    n = 0
+    for r in receipts:
+        writer.writerows([r['Klient'], r['Data'], line['ID'], line['Nazwa'], line['Ilość'], '', '', '', '',
+                          f"{r['total']:.2f}", UNKNOWN_NOTE] if line.get('Nieznany') else
+                         [r['Klient'], r['Data'], line['ID'], line['Nazwa'], line['Ilość'],
+                          f"{line['Cena']:.2f}", f"{line['Wartość']:.2f}", f"{line['Rabat']:.2f}",
+                          f"{line['Do_zapłaty']:.2f}", f"{r['total']:.2f}", ''] for line in r['lines'])
+        n += 1
+    return n
+
+
+def write_json(f, receipts, brackets=True):
+    """
+    Zapisuje paragony jako elementy tablicy JSON, po jednym w linii.
+    :param brackets: czy dopisać nawiasy tablicy (False – sam fragment do sklejenia z innymi)
+    """
+    if brackets:
+        f.write('[\n')
+    n = 0
+    for receipt in receipts:
+        if n:
+            f.write(',\n')
+        f.write(json.dumps(receipt, ensure_ascii=False))
+        n += 1
+    if brackets:
+        f.write('\n]\n' if n else ']\n')
+    return n
+
+
+def _write_part(f, fmt, receipts):
+    """Zapisuje fragment eksportu bez nagłówka CSV i nawiasów JSON."""
+    if fmt == 'txt':
+        return write_text(f, receipts)
+    if fmt == 'csv':
+        return write_csv(f, receipts, header=False)
+    return write_json(f, receipts, brackets=False)
+
+
+# --- Eksport dnia ---
+def _export_chunk(store, files, day, fmt, catalog, rules, part):
+    """Zadanie puli: wycenia i zapisuje paragony z porcji plików do pliku częściowego."""
+    with use_store(store):
+        raw = [(cid, dt, items) for cid, path in files for dt, items in _day_lines(path, day)]
+        with open(part, 'w', newline='', encoding='utf-8') as f:
+            return _write_part(f, fmt, _priced(catalog, rules, raw))
+
+
+def export_day(day, output, fmt='txt', workers=None, client_ids=None):
+    """
+    Eksportuje wszystkie paragony z jednego dnia do pliku.
+    :param day: dzień RRRR-MM-DD
+    :param output: plik wynikowy (zapis atomowy – plik tymczasowy i podmiana)
+    :param fmt: 'txt', 'csv' albo 'json'
+    :param workers: liczba procesów (domyślnie liczba CPU; 1 = bez puli)
+    :param client_ids: tylko ci klienci (None = wszyscy)
+    :return: liczba wyeksportowanych paragonów
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Nieznany format: {fmt}")
+    store = current_store()
+    catalog, rules = _catalogue_snapshot()
+    files = _client_files(client_ids)
+    chunks = [files[i:i + CHUNK_FILES] for i in range(0, len(files), CHUNK_FILES)]
+    workers = min(workers or os.cpu_count() or 1, max(len(chunks), 1))
+    directory = os.path.dirname(os.path.abspath(output))
+    total = 0
+    with tempfile.TemporaryDirectory(prefix='frog-receipts-', dir=directory) as tmp:
+        parts = [os.path.join(tmp, f"{i:05d}.part") for i in range(len(chunks))]
+        args = [(store, chunk, day, fmt, catalog, rules, part) for chunk, part in zip(chunks, parts)]
+        if workers <= 1:
+            counts = [_export_chunk(*a) for a in args]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                counts = list(pool.map(_export_chunk, *zip(*args)))
+
+        # Sklejanie plików częściowych w kolejności klientów
+        result = os.path.join(tmp, 'export')
+        with open(result, 'w', newline='', encoding='utf-8') as out:
+            if fmt == 'csv':
+                csv.writer(out).writerow(CSV_FIELDS)
+            elif fmt == 'json':
+                out.write('[\n')
+            for part, n in zip(parts, counts):
+                if not n:
+                    continue
+                if fmt == 'json' and total:
+                    out.write(',\n')
+                with open(part, newline='', encoding='utf-8') as f:
+                    shutil.copyfileobj(f, out, 1 << 20)
+                total += n
+            if fmt == 'json':
+                out.write('\n]\n' if total else ']\n')
+        os.replace(result, output)
+    return total
+
+
+def main(argv=None):
+    """Punkt wejścia wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Eksport paragonów z jednego dnia")
+    parser.add_argument('day', help="dzień RRRR-MM-DD")
+    parser.add_argument('--format', choices=FORMATS, default='txt')
+    parser.add_argument('--output', help="plik wynikowy (domyślnie paragony-DZIEŃ.FORMAT)")
+    parser.add_argument('--client', action='append', help="tylko paragony tego klienta (można powtórzyć)")
+    parser.add_argument('--workers', type=int, help="liczba procesów (domyślnie liczba CPU)")
+    parser.add_argument('--store', default=current_store(), help="katalog sklepu (domyślnie projekt)")
+    args = parser.parse_args(argv)
+
+    output = args.output or f"paragony-{args.day}.{args.format}"
+    with use_store(store_at(args.store)):
+        n = export_day(args.day, output, args.format, args.workers, args.client)
+    print(f"Zapisano {n} paragonów do {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    main()
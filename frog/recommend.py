@@ -0,0 +1,161 @@
+"""
+Moduł rekomendacji "klienci kupili także" sklepu Żabka.
+Buduje rzadką macierz współwystępowania produktów (słownik liczników) z paragonów
+w DATABASE/*.txt. Model jest zapisywany razem z offsetami przeczytanych plików,
+więc po restarcie doczytywane są tylko nowe linie; po zakupie wystarczy
+doczytać ogon jednego pliku klienta. Plik przepisany od ostatniego odczytu (inny i-węzeł,
+skrócony albo ze zmienionym początkiem) albo usunięty powoduje przebudowę modelu od zera –
+liczniki par nie pamiętają, z którego pliku pochodzą. Listy top-k są trzymane w pamięci podręcznej,
+więc podpowiedź dla koszyka to kilka odczytów ze słownika.
+Zawiera funkcje: load_model, save_model, observe, update_model, update_customer, also_bought.
+"""
+
+# --- Importy ---
+import heapq
+import json
+import os
+
+from frog import customer_manager
+from frog.store import current_store
+
+TOP_K = 10  # Ile sąsiadów produktu trzymamy w pamięci podręcznej
+
+
+# --- Model ---
+SAVED = ('offsets', 'files', 'counts', 'pairs')  # Klucze modelu zapisywane do pliku
+
+
+def _empty_model():
+    """
+    Pusty model: offsety i podpisy przeczytanych plików (i-węzeł, czas modyfikacji, suma początku),
+    liczba koszyków z produktem, pary współwystępowania.
+    """
+    return {'offsets': {}, 'files': {}, 'counts': {}, 'pairs': {}, '_top': {}}
+
+
+def _reset_model(model):
+    """Czyści model (w miejscu) – kolejny odczyt przeczyta wszystkie paragony od początku."""
+    model.update(_empty_model())
+
+
+def load_model(catch_up=True):
+    """
+    Wczytuje zapisany model (lub pusty) i – domyślnie – doczytuje paragony
+    dopisane od ostatniego zapisu.
+    """
+    model = _empty_model()
+    try:
+        with open(current_store().recommendations, encoding='utf-8') as f:
+            data = json.load(f)
+        model.update(offsets=data['offsets'], counts=data['counts'], pairs=data['pairs'],
+                     files=data.get('files', {}))  # Starsze modele nie mają podpisów plików
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+    if catch_up and update_model(model):
+        save_model(model)
+    return model
+
+
+def save_model(model):
+    """Zapisuje model atomowo (bez pamięci podręcznej top-k)."""
+    path = current_store().recommendations
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({k: model[k] for k in SAVED}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def observe(model, items):
+    """Dodaje jeden koszyk (lista par ID, ilość) do macierzy współwystępowania."""
+    pids = sorted({str(pid) for pid, _ in items})
+    counts, pairs, top = model['counts'], model['pairs'], model['_top']
+    for a in pids:
+        counts[a] = counts.get(a, 0) + 1
+        row = pairs.setdefault(a, {})
+        for b in pids:
+            if a != b:
+                row[b] = row.get(b, 0) + 1
+        top.pop(a, None)  # Lista top-k tego produktu jest nieaktualna
+
+
+def _read_file(model, customer_id, path):
+    """
+    Doczytuje do modelu ogon pliku paragonów klienta.
+    Plik bez nowych bajtów jest pomijany po samym rozmiarze i czasie modyfikacji.
+    :return: liczba nowych koszyków albo None, gdy plik przepisano od ostatniego odczytu
+    """
+    offset, known = model['offsets'].get(customer_id, 0), model['files'].get(customer_id)
+    st = os.stat(path)
+    if customer_manager.receipt_file_rewritten(st, path, offset, known):
+        return None
+    if st.st_size == offset and known and known[1] == st.st_mtime_ns:
+        return 0
+    offset, receipts = customer_manager.read_receipt_file(path, offset)
+    model['offsets'][customer_id] = offset
+    model['files'][customer_id] = customer_manager.receipt_file_signature(st, path, offset)
+    for _, items in receipts:
+        observe(model, items)
+    return len(receipts)
+
+
+def update_model(model):
+    """
+    Doczytuje do modelu paragony dopisane od zapamiętanych offsetów (wszystkie pliki).
+    Gdy któryś plik przepisano lub usunięto, model jest budowany od zera.
+    Zwraca liczbę nowych koszyków.
+    """
+    receipts_dir = current_store().receipts_dir
+    names = sorted(os.listdir(receipts_dir)) if os.path.isdir(receipts_dir) else []
+    customer_ids = [name[:-4] for name in names if name.endswith('.txt')]
+    if not set(model['offsets']) <= set(customer_ids):
+        _reset_model(model)  # Usunięty plik – jego koszyków nie da się odjąć
+    new = 0
+    for cid in customer_ids:
+        count = _read_file(model, cid, os.path.join(receipts_dir, f"{cid}.txt"))
+        if count is None:
+            _reset_model(model)  # Po wyczyszczeniu nie ma offsetów, więc drugi przebieg czyta wszystko
+            return update_model(model)
+        new += count
+    return new
+
+
+def update_customer(model, customer_id):
+    """
+    Doczytuje ogon pliku historii jednego klienta – wywoływane po purchase_products,
+    bez przeglądania pozostałych plików. Gdy plik przepisano, model jest budowany od zera.
+    Zwraca liczbę nowych koszyków.
+    """
+    path = os.path.join(current_store().receipts_dir, f"{customer_id}.txt")
+    if not os.path.exists(path):
+        return 0
+    count = _read_file(model, customer_id, path)
+    if count is None:
+        _reset_model(model)
+        return update_model(model)
+    return count
+
+
+# --- Podpowiedzi ---
+def _top(model, pid):
+    """Lista top-k (ID, liczba wspólnych koszyków) dla produktu – z pamięci podręcznej."""
+    top = model['_top'].get(pid)
+    if top is None:
+        row = model['pairs'].get(pid, {})
+        top = heapq.nlargest(TOP_K, row.items(), key=lambda kv: (kv[1], kv[0]))
+        model['_top'][pid] = top
+    return top
+
+
+def also_bought(model, cart_ids, k=5):
+    """
+    Zwraca do k produktów najczęściej kupowanych razem z produktami z koszyka
+    (lista par ID, wynik). Produkty już w koszyku są pomijane.
+    """
+    cart_ids = {str(pid) for pid in cart_ids}
+    scores = {}
+    for pid in cart_ids:
+        for other, count in _top(model, pid):
+            if other not in cart_ids:
+                scores[other] = scores.get(other, 0) + count
+    return heapq.nlargest(k, scores.items(), key=lambda kv: (kv[1], kv[0]))
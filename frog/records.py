@@ -0,0 +1,107 @@
+"""
+Moduł zwartych rekordów produktów i klientów sklepu Żabka.
+Product i Customer to klasy z __slots__ (bez słownika atrybutów na każdy obiekt),
+a loadery tworzą je wprost z wierszy pliku Excel / CSV, bez pośrednich słowników.
+Przy milionie klientów w pamięci to kilkukrotnie mniej bajtów niż lista dictów
+z load_customers() (pomiar: python -m benchmarks.memory).
+"""
+
+# --- Importy ---
+import csv
+import os
+import sys
+from dataclasses import dataclass
+
+import openpyxl
+
+from frog import inventory
+from frog.store import current_store
+
+
+@dataclass(slots=True)
+class Product:
+    """Produkt z katalogu (wiersz products.xlsx)."""
+    id: str
+    nazwa: str
+    kategoria: str
+    cena: float
+    ilosc: int
+
+    def as_dict(self):
+        """Słownik w formacie list_products() (klucze jak w pliku Excel)."""
+        return {'ID': self.id, 'Nazwa': self.nazwa, 'Kategoria': self.kategoria,
+                'Cena': self.cena, 'Ilość_w_magazynie': self.ilosc}
+
+
+@dataclass(slots=True)
+class Customer:
+    """Klient sklepu (wiersz customers.csv)."""
+    id: str
+    imie: str
+    nazwisko: str
+    email: str
+    data_rejestracji: str
+    password_hash: str
+    telefon: str
+
+    def as_dict(self):
+        """Słownik w formacie load_customers() (klucze jak w pliku CSV)."""
+        return {'ID': self.id, 'Imię': self.imie, 'Nazwisko': self.nazwisko, 'Email': self.email,
+                'Data_rejestracji': self.data_rejestracji, 'PasswordHash': self.password_hash,
+                'Telefon': self.telefon}
+
+
+# --- Loadery ---
+def load_product_records():
+    """
+    Wczytuje produkty z pliku Excel wprost do obiektów Product
+    (openpyxl w trybie tylko do odczytu, wiersz po wierszu).
+    Stany magazynowe – jak w list_products() – pochodzą z dziennika magazynowego.
+    """
+    path = current_store().products_xlsx
+    if not os.path.exists(path):
+        return []
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return []
+        col = {name: i for i, name in enumerate(header)}
+        i_id, i_name, i_cat = col['ID'], col['Nazwa'], col['Kategoria']
+        i_price, i_stock = col['Cena'], col['Ilość_w_magazynie']
+        records = [Product(str(r[i_id]), str(r[i_name]), sys.intern(str(r[i_cat])),
+                           float(r[i_price]), int(r[i_stock] or 0))
+                   for r in rows if r[i_id] is not None]
+    finally:
+        wb.close()
+    stock = inventory.current_stock(baseline=lambda: {p.id: p.ilosc for p in records})
+    for p in records:
+        p.ilosc = stock.get(p.id, p.ilosc)
+    return records
+
+
+def load_customer_records():
+    """
+    Wczytuje klientów z pliku CSV wprost do obiektów Customer (csv.reader, bez DictReader).
+    Powtarzające się wartości (imiona, daty rejestracji) są internowane.
+    """
+    path = current_store().customers_csv
+    if not os.path.exists(path):
+        return []
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+        col = {name: i for i, name in enumerate(header)}
+        idx = [col.get(name) for name in
+               ('ID', 'Imię', 'Nazwisko', 'Email', 'Data_rejestracji', 'PasswordHash', 'Telefon')]
+        intern = sys.intern
+        records = []
+        for r in reader:
+            if not r:
+                continue
+            v = [r[i] if i is not None and i < len(r) else '' for i in idx]
+            records.append(Customer(v[0], intern(v[1]), intern(v[2]), v[3], intern(v[4]), v[5], v[6]))
+    return records
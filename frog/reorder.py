@@ -0,0 +1,269 @@
+"""
+Moduł alertów niskiego stanu i sugestii zamówień sklepu Żabka.
+Łączy bieżące stany z list_products() z tempem sprzedaży liczonym przyrostowo
+z paragonów w DATABASE/*.txt. Stan obliczeń (offsety plików, dzienna sprzedaż,
+tempo sprzedaży) jest zapisywany, więc kolejne raporty czytają tylko nowe linie
+paragonów i przeliczają tylko produkty, których dotyczyły nowe zakupy.
+Plik paragonów przepisany od ostatniego raportu (inny i-węzeł, skrócony albo ze zmienionym
+początkiem) powoduje przeliczenie stanu od zera – dzienna sprzedaż nie pamięta klientów,
+więc starych linii takiego pliku nie da się odjąć.
+
+Przykład (z katalogu głównego projektu):
+    python -m frog.reorder --window 28 --lead-time 3 --cover 14
+"""
+
+# --- Importy ---
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+
+import numpy as np
+
+from frog import customer_manager
+from frog.product_manager import list_products
+from frog.store import current_store, use_store
+
+HISTORY_DAYS = 90        # Ile dni dziennej sprzedaży przechowujemy (licząc od najnowszej sprzedaży)
+PARALLEL_MIN_FILES = 64  # Od tylu plików z nowymi danymi skanujemy je w puli procesów
+
+# --- Poziomy alertów ---
+OUT_OF_STOCK = 'BRAK'    # stan <= 0
+LOW_STOCK = 'NISKI'      # stan nie pokryje sprzedaży do czasu dostawy (+ zapas bezpieczeństwa)
+
+
+# --- Stan obliczeń ---
+def load_state():
+    """Wczytuje zapisany stan obliczeń albo zwraca pusty."""
+    try:
+        with open(current_store().sales_state, encoding='utf-8') as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        state = {}
+    state.setdefault('offsets', {})    # ID klienta -> przeczytane bajty pliku paragonów
+    state.setdefault('files', {})      # ID klienta -> [i-węzeł, czas modyfikacji, suma początku pliku]
+    state.setdefault('daily', {})      # ID produktu -> {data: sprzedane sztuki}
+    state.setdefault('velocity', {})   # ID produktu -> średnia dzienna sprzedaż
+    state.setdefault('params', {})     # Parametry, dla których policzono 'velocity'
+    return state
+
+
+def save_state(state):
+    """Zapisuje stan obliczeń atomowo (plik tymczasowy + podmiana)."""
+    path = current_store().sales_state
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+# --- Odczyt sprzedaży ---
+def _scan_files(batch):
+    """
+    Czyta nowe paragony z partii plików [(ścieżka, offset, suma początku pliku), ...].
+    Zwraca (nowe offsety, nowe sumy początku, {(ID, data): sprzedane sztuki}) – płaski słownik
+    tani do przesłania między procesami – albo None, gdy któryś plik przepisano od ostatniego odczytu.
+    """
+    offsets, heads = [], []
+    counts = {}
+    for path, offset, head in batch:
+        if offset and head is not None and customer_manager.receipt_head_sum(path, offset) != head:
+            return None
+        offset, receipts = customer_manager.read_receipt_file(path, offset)
+        offsets.append(offset)
+        heads.append(customer_manager.receipt_head_sum(path, offset))
+        for dt, items in receipts:
+            day = dt[:10]  # Obie wersje formatu daty zaczynają się od RRRR-MM-DD
+            for pid, qty in items:
+                key = (pid, day)
+                counts[key] = counts.get(key, 0) + qty
+    return offsets, heads, counts
+
+
+def _reset_sales(state):
+    """Czyści stan obliczeń (w miejscu) – kolejny skan przeczyta wszystkie paragony od początku."""
+    for key in ('offsets', 'files', 'daily', 'velocity', 'params'):
+        state[key] = {}
+    state.pop('latest', None)
+
+
+def update_sales(state, workers=None):
+    """
+    Dopisuje do stanu sprzedaż z linii paragonów dopisanych od ostatniego raportu.
+    Pliki bez nowych bajtów są pomijane po samym rozmiarze i czasie modyfikacji; przy wielu plikach
+    z nowymi danymi skan odbywa się równolegle w puli procesów (partiami plików).
+    Gdy któryś plik przepisano (zmiana i-węzła, skrócenie, inny początek), stan jest liczony od zera.
+    :return: zbiór ID produktów, których dotyczyła nowa sprzedaż
+    """
+    receipts_dir = current_store().receipts_dir
+    if not os.path.isdir(receipts_dir):
+        return set()
+    offsets, files = state['offsets'], state['files']
+    pending = []
+    rewritten = False
+    with os.scandir(receipts_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.txt'):
+                continue
+            cid = entry.name[:-4]
+            st = entry.stat()
+            offset, known = offsets.get(cid, 0), files.get(cid)
+            if offset and (st.st_size < offset or (known and known[0] != entry.inode())):
+                rewritten = True
+                break
+            if st.st_size != offset or (known and known[1] != st.st_mtime_ns):
+                pending.append((cid, entry.path, offset, known[2] if known else None,
+                                entry.inode(), st.st_mtime_ns))
+
+    results = None
+    if not rewritten:
+        workers = workers or os.cpu_count() or 1
+        batch = [(path, offset, head) for _, path, offset, head, _, _ in pending]
+        if len(pending) >= PARALLEL_MIN_FILES and workers > 1:
+            size = -(-len(batch) // (workers * 4))  # Kilka partii na proces – równe obciążenie
+            parts = [batch[i:i + size] for i in range(0, len(batch), size)]
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_scan_files, parts))
+        else:
+            results = [_scan_files(batch)]
+    if results is None or None in results:
+        _reset_sales(state)  # Po wyczyszczeniu nie ma offsetów, więc drugi przebieg czyta wszystko
+        return update_sales(state, workers)
+
+    new_offsets = [o for read, _, _ in results for o in read]
+    new_heads = [h for _, heads, _ in results for h in heads]
+    for (cid, _, _, _, inode, mtime), offset, head in zip(pending, new_offsets, new_heads):
+        offsets[cid] = offset
+        files[cid] = [inode, mtime, head]
+    affected = set()
+    daily = state['daily']
+    for _, _, counts in results:
+        for (pid, day), qty in counts.items():
+            bucket = daily.setdefault(pid, {})
+            bucket[day] = bucket.get(day, 0) + qty
+            affected.add(pid)
+
+    # Przycinamy historię dotkniętych produktów do HISTORY_DAYS od najnowszej sprzedaży
+    if affected:
+        latest = max(max(daily[pid]) for pid in affected)
+        state['latest'] = max(state.get('latest', latest), latest)
+        cutoff = (datetime.date.fromisoformat(state['latest'])
+                  - datetime.timedelta(days=HISTORY_DAYS)).isoformat()
+        for pid in affected:
+            daily[pid] = {d: q for d, q in daily[pid].items() if d > cutoff}
+    return affected
+
+
+def _velocity(days, start, end, window):
+    """Średnia dzienna sprzedaż w oknie [start, end] (daty ISO)."""
+    return sum(q for d, q in days.items() if start <= d <= end) / window
+
+
+# --- Raport ---
+def reorder_report(as_of=None, window=28, lead_time=3, safety_days=2, cover_days=14,
+                   products=None, workers=None):
+    """
+    Buduje raport zamówień i alertów.
+    :param as_of: data raportu (datetime.date, domyślnie dziś)
+    :param window: okno (dni) do liczenia tempa sprzedaży, od 1 do HISTORY_DAYS
+    :param lead_time: czas dostawy w dniach
+    :param safety_days: zapas bezpieczeństwa (w dniach sprzedaży)
+    :param cover_days: na ile dni sprzedaży ma wystarczyć zamówienie
+    :param products: lista produktów (domyślnie list_products())
+    :return: słownik z listami 'products' (wiersz na produkt) i 'categories'
+    """
+    if not 1 <= window <= HISTORY_DAYS:
+        # Starsza sprzedaż nie jest przechowywana – dłuższe okno zaniżałoby tempo
+        raise ValueError(f"Okno tempa sprzedaży musi mieć od 1 do {HISTORY_DAYS} dni.")
+    as_of = as_of or datetime.date.today()
+    products = list_products() if products is None else products
+    state = load_state()
+    affected = update_sales(state, workers)
+
+    end = as_of.isoformat()
+    start = (as_of - datetime.timedelta(days=window - 1)).isoformat()
+    params = {'as_of': end, 'window': window}
+    velocity = state['velocity']
+    # Zmiana daty lub okna przesuwa okno wszystkim produktom – wtedy liczymy wszystko
+    to_update = state['daily'].keys() if state['params'] != params else affected
+    for pid in to_update:
+        velocity[pid] = _velocity(state['daily'][pid], start, end, window)
+    state['params'] = params
+    save_state(state)
+
+    # Obliczenia wektorowe dla całego katalogu
+    ids = [str(p['ID']) for p in products]
+    stock = np.array([int(p['Ilość_w_magazynie']) for p in products], dtype=np.float64)
+    rate = np.array([velocity.get(pid, 0.0) for pid in ids], dtype=np.float64)
+    reorder_point = rate * (lead_time + safety_days)
+    target = np.ceil(rate * (lead_time + safety_days + cover_days))
+    order_qty = np.maximum(target - stock, 0).astype(np.int64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cover = np.where(rate > 0, stock / rate, np.inf)
+    alert = np.where(stock <= 0, OUT_OF_STOCK, np.where(stock <= reorder_point, LOW_STOCK, ''))
+
+    rows = [{
+        'ID': pid,
+        'Nazwa': p.get('Nazwa', ''),
+        'Kategoria': p.get('Kategoria', ''),
+        'Ilość_w_magazynie': int(s),
+        'Sprzedaż_dziennie': round(float(r), 3),
+        'Dni_zapasu': None if np.isinf(c) else round(float(c), 1),
+        'Zamówić': int(q),
+        'Alert': str(a),
+    } for pid, p, s, r, c, q, a in zip(ids, products, stock, rate, cover, order_qty, alert)]
+
+    categories = {}
+    for row in rows:
+        cat = categories.setdefault(row['Kategoria'], {
+            'Kategoria': row['Kategoria'], 'Produkty': 0, 'Ilość_w_magazynie': 0,
+            'Sprzedaż_dziennie': 0.0, 'Zamówić': 0, 'Alerty': 0})
+        cat['Produkty'] += 1
+        cat['Ilość_w_magazynie'] += row['Ilość_w_magazynie']
+        cat['Sprzedaż_dziennie'] += row['Sprzedaż_dziennie']
+        cat['Zamówić'] += row['Zamówić']
+        cat['Alerty'] += bool(row['Alert'])
+    for cat in categories.values():
+        cat['Sprzedaż_dziennie'] = round(cat['Sprzedaż_dziennie'], 3)
+    return {'as_of': end, 'products': rows, 'categories': sorted(categories.values(),
+                                                                   key=lambda c: -c['Alerty'])}
+
+
+def low_stock_alerts(report):
+    """Funkcja wyższego rzędu: wybiera z raportu produkty z alertem, najpilniejsze pierwsze."""
+    def urgency(row):
+        return (row['Alert'] != OUT_OF_STOCK, row['Dni_zapasu'] if row['Dni_zapasu'] is not None else 0)
+    return sorted(filter(lambda r: r['Alert'], report['products']), key=urgency)
+
+
+def main(argv=None):
+    """Punkt wejścia wiersza poleceń – wypisuje alerty i podsumowanie kategorii."""
+    parser = argparse.ArgumentParser(description="Alerty niskiego stanu i sugestie zamówień")
+    parser.add_argument('--as-of', type=datetime.date.fromisoformat, help="data raportu RRRR-MM-DD")
+    parser.add_argument('--window', type=int, default=28, help="okno tempa sprzedaży (dni)")
+    parser.add_argument('--lead-time', type=int, default=3, help="czas dostawy (dni)")
+    parser.add_argument('--safety-days', type=int, default=2, help="zapas bezpieczeństwa (dni)")
+    parser.add_argument('--cover', type=int, default=14, help="na ile dni zamawiamy")
+    parser.add_argument('--workers', type=int, help="liczba procesów przy skanie paragonów")
+    parser.add_argument('--store', default=current_store(), help="katalog sklepu (domyślnie projekt)")
+    args = parser.parse_args(argv)
+    if not 1 <= args.window <= HISTORY_DAYS:
+        parser.error(f"--window musi mieć od 1 do {HISTORY_DAYS} dni")
+
+    with use_store(args.store):
+        report = reorder_report(args.as_of, args.window, args.lead_time, args.safety_days,
+                                args.cover, workers=args.workers)
+    print(f"Raport na dzień {report['as_of']}")
+    for row in low_stock_alerts(report):
+        print(f"[{row['Alert']:<5}] {row['ID']} {row['Nazwa']:<25} stan={row['Ilość_w_magazynie']:<5}"
+              f" sprzedaż/dzień={row['Sprzedaż_dziennie']:<7} zamówić={row['Zamówić']}")
+    print("\nKategorie:")
+    for cat in report['categories']:
+        print(f"  {cat['Kategoria']:<15} produkty={cat['Produkty']:<5} alerty={cat['Alerty']:<4}"
+              f" zamówić={cat['Zamówić']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+"""
+Warstwa usług danych sklepu Żabka – logika, którą wcześniej trzymały domknięcia w run_gui.
+Funkcje modułu to zwykłe operacje na katalogu, klientach i paragonach (do testów
+i benchmarków bez ekranu). DataService uruchamia je w puli wątków roboczych i zwraca
+concurrent.futures.Future, więc GUI tylko zleca wywołania i wyświetla wyniki,
+a pętla zdarzeń Tk nie czeka na pandas / pliki CSV.
+Zawiera: load_catalogue, merge_catalogue, history_page, history_rows, create_product, delete_product,
+checkout, customer_details, set_customer_field, change_password, DataService.
+"""
+
+# --- Importy ---
+import concurrent.futures
+import csv
+import os
+import threading
+
+import pandas as pd
+
+from frog import changes, recommend
+from frog.auth import authenticate, hash_password, register_with_password
+from frog.customer_manager import (purchase_history, purchase_products, update_customer_email,
+                                   update_customer_password, update_customer_phone)
+from frog.pricing import build_catalog
+from frog.product_manager import add_product, list_products, remove_product, update_stock
+from frog.store import current_store, store_at, use_store
+
+# Pola konta, które klient może zmienić sam, i funkcje zapisujące je w customers.csv
+EDITABLE_FIELDS = {'Telefon': update_customer_phone, 'Email': update_customer_email}
+
+
+# --- Katalog produktów ---
+def _by_name(item):  # funkcja wyższego rzędu – sposób sortowania katalogu
+    return str(item['Nazwa'])
+
+
+def load_catalogue():
+    """Zwraca (produkty posortowane po nazwie, indeks katalogu dla koszyka)."""
+    products = sorted(list_products(), key=_by_name)
+    return products, build_catalog(products)
+
+
+def merge_catalogue(products, found):
+    """
+    Nakłada zmiany z dziennika zmian (frog.changes) na wczytany katalog.
+    :param products: lista produktów z load_catalogue (wiersze są aktualizowane w miejscu)
+    :param found: lista Change z Feed.poll()
+    :return: (nowa lista produktów, ID produktów ze zmienionym tylko stanem,
+             czy zmienił się skład lub treść listy) albo None, gdy katalog trzeba wczytać od nowa
+    """
+    by_id = {str(p['ID']): p for p in products}
+    result = changes.apply(by_id, found, changes.PRODUCTS)
+    if result is None:
+        return None
+    stock_only, structural = result
+    if structural:
+        products = sorted(by_id.values(), key=_by_name)
+    return products, stock_only, structural
+
+
+def next_product_id():
+    """Następne wolne ID produktu w formacie P001, P002, ..."""
+    path = current_store().products_xlsx
+    if not os.path.exists(path):
+        return "P001"
+    df = pd.read_excel(path)
+    ids = [i for i in df['ID'].astype(str) if i.startswith('P') and i[1:].isdigit()]
+    nums = [int(i[1:]) for i in ids]
+    return f"P{max(nums)+1:03d}" if nums else "P001"
+
+
+def create_product(name, category, price, stock):
+    """
+    Dodaje produkt z kolejnym wolnym ID i zwraca to ID.
+    :param price: cena jako liczba albo tekst z przecinkiem lub kropką
+    Podnosi ValueError dla nieprawidłowej ceny.
+    """
+    try:
+        price = float(str(price).replace(',', '.'))
+    except ValueError:
+        raise ValueError("Nieprawidłowa cena.") from None
+    pid = next_product_id()
+    add_product({'ID': pid, 'Nazwa': name, 'Kategoria': category,
+                 'Cena': price, 'Ilość_w_magazynie': int(stock)})
+    return pid
+
+
+def delete_product(key):
+    """
+    Usuwa produkt po ID, a gdy żaden produkt nie ma takiego ID – po nazwie.
+    Podnosi KeyError, gdy nie pasuje ani ID, ani nazwa.
+    """
+    if not remove_product(key) and not remove_product(key, by='Nazwa'):
+        raise KeyError(f"Nieznany produkt: {key}")
+    return key
+
+
+# --- Zakupy i historia ---
+def checkout(client_id, items, model=None):
+    """
+    Zdejmuje towar ze stanu i zapisuje paragon klienta.
+    :param items: lista par (ID, ilość)
+    :param model: model rekomendacji do doczytania nowego paragonu (opcjonalnie)
+    :return: zapisane pozycje (lista par ID, ilość)
+    Podnosi KeyError / ValueError, gdy produktu nie ma lub brakuje towaru – wtedy nic nie jest zapisywane.
+    Gdy nie uda się zapisać paragonu, towar wraca na stan (zdarzenia przyjęcia), a błąd jest zgłaszany dalej.
+    """
+    update_stock([(pid, -qty) for pid, qty in items])  # Zdejmujemy towar ze stanu
+    try:
+        purchased = purchase_products(client_id, list(items))
+    except Exception:
+        update_stock([(pid, qty) for pid, qty in items])  # Sprzedaż bez paragonu – cofamy stan
+        raise
+    if model is not None:
+        recommend.update_customer(model, client_id)  # Doczytujemy tylko dopisany paragon
+    return purchased
+
+
+def _history_row(prices, dt, items):
+    """Wycenia jeden zakup z historii: (data, opis pozycji, kwota) do tabeli Historia."""
+    details = []
+    total = 0.0
+    for pid, qty in items:
+        if pid in prices:
+            lt = prices[pid] * qty
+            total += lt
+            details.append(f"{pid}x{qty}={lt:.2f}")
+    return dt, ', '.join(details), f"{total:.2f} PLN"
+
+
+def _current_prices():
+    """Słownik ID -> cena z pliku Excel (jeden odczyt na stronę historii)."""
+    path = current_store().products_xlsx
+    if not os.path.exists(path):
+        return {}
+    df = pd.read_excel(path, usecols=['ID', 'Cena'])
+    return dict(zip(df['ID'].astype(str), df['Cena'].astype(float)))
+
+
+def history_page(client_id, limit=50, cursor=None, date_from=None, date_to=None, product=None):
+    """
+    Jedna strona historii zakupów klienta (od najnowszych), wyceniona po bieżących cenach.
+    Parametry jak w customer_manager.purchase_history.
+    :return: (lista krotek (data, opis pozycji, kwota), kursor następnej strony albo None)
+    """
+    entries, next_cursor = purchase_history(client_id, limit, cursor, date_from, date_to, product)
+    prices = _current_prices() if entries else {}
+    return [_history_row(prices, dt, items) for dt, items in entries], next_cursor
+
+
+def history_rows(client_id):
+    """
+    Cała historia zakupów klienta w kolejności z pliku (od najstarszych).
+    Zwraca listę krotek (data, opis pozycji, kwota) gotowych do wstawienia do tabeli.
+    """
+    rows, _ = history_page(client_id, limit=None)
+    return rows[::-1]
+
+
+# --- Konto klienta ---
+def customer_details(client_id):
+    """Zwraca wiersz klienta z customers.csv (słownik) albo pusty słownik."""
+    path = current_store().customers_csv
+    if not os.path.exists(path):
+        return {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for r in csv.DictReader(f):
+            if r['ID'] == client_id:
+                return r
+    return {}
+
+
+def set_customer_field(client_id, key, value):
+    """Zmienia pole konta (Telefon lub Email) klienta."""
+    if key not in EDITABLE_FIELDS:
+        raise KeyError(f"Pola {key} nie można zmienić.")
+    EDITABLE_FIELDS[key](client_id, value)
+    return value
+
+
+def change_password(client_id, old, new):
+    """Zmienia hasło po sprawdzeniu starego; ValueError przy niepoprawnym starym haśle."""
+    if not authenticate(client_id, old):
+        raise ValueError("Niepoprawne hasło")
+    update_customer_password(client_id, hash_password(new))
+
+
+# --- Usługa z pulą wątków ---
+class DataService:
+    """
+    Właściciel danych jednego sklepu dla GUI: katalogu, klientów, paragonów i modelu rekomendacji.
+    Każda metoda (poza also_bought i close) zleca pracę puli wątków i od razu zwraca Future.
+    Wątki robocze działają na sklepie podanym przy tworzeniu usługi (use_store).
+    """
+
+    def __init__(self, store=None, workers=2):
+        self.store = store_at(store or current_store())
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='frog-data')
+        self._model_lock = threading.Lock()  # Model czytany w wątku GUI, zmieniany w roboczym
+        self._model = None
+        self.submit(self._load_model)
+
+    def submit(self, func, *args, **kwargs):
+        """Uruchamia func(*args, **kwargs) w puli na sklepie usługi; zwraca Future."""
+        def run():
+            with use_store(self.store):
+                return func(*args, **kwargs)
+        return self._pool.submit(run)
+
+    # --- Model rekomendacji ---
+    def _load_model(self):
+        model = recommend.load_model()
+        with self._model_lock:
+            self._model = model
+
+    def also_bought(self, cart_ids, k=5):
+        """Podpowiedzi dla koszyka z modelu w pamięci (pusta lista, dopóki model się wczytuje)."""
+        with self._model_lock:
+            return recommend.also_bought(self._model, cart_ids, k) if self._model else []
+
+    # --- Operacje na danych ---
+    def catalogue(self):
+        return self.submit(load_catalogue)
+
+    def watch(self, tables=(changes.PRODUCTS, changes.STOCK)):
+        """Kursor dziennika zmian sklepu usługi od bieżącej wersji (Feed.pending() można wołać w wątku GUI)."""
+        return changes.Feed(self.store, tables)
+
+    def poll(self, feed):
+        return self.submit(feed.poll)
+
+    def add_product(self, name, category, price, stock):
+        return self.submit(create_product, name, category, price, stock)
+
+    def remove_product(self, key):
+        return self.submit(delete_product, key)
+
+    def checkout(self, client_id, items):
+        def run():
+            purchased = checkout(client_id, items)
+            with self._model_lock:  # Blokada tylko na doczytanie paragonu do modelu
+                if self._model is not None:
+                    recommend.update_customer(self._model, client_id)
+            return purchased
+        return self.submit(run)
+
+    def history(self, client_id, limit=50, cursor=None, **filters):
+        return self.submit(history_page, client_id, limit, cursor, **filters)
+
+    def login(self, client_id, password):
+        return self.submit(authenticate, client_id, password)
+
+    def register(self, imie, nazwisko, email, password, phone=''):
+        return self.submit(register_with_password, imie, nazwisko, email, password, phone)
+
+    def customer(self, client_id):
+        return self.submit(customer_details, client_id)
+
+    def update_customer(self, client_id, key, value):
+        return self.submit(set_customer_field, client_id, key, value)
+
+    def change_password(self, client_id, old, new):
+        return self.submit(change_password, client_id, old, new)
+
+    def close(self):
+        """Zapisuje model rekomendacji i czeka na zakończenie zleconych operacji."""
+        def save():
+            with self._model_lock:
+                if self._model is not None:
+                    recommend.save_model(self._model)
+        self.submit(save)
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,107 @@
+"""
+Moduł kontekstu sklepu Żabka.
+Store opisuje katalog danych jednego sklepu (data/, DATABASE/, config.ini),
+a wszystkie moduły pobierają ścieżki przez current_store(). Dzięki temu jeden proces
+może obsługiwać wiele sklepów naraz – każdy wątek / zadanie ustawia swój sklep przez use_store().
+Zawiera: Store, DEFAULT_STORE, current_store, use_store, store_at.
+"""
+
+# --- Importy ---
+import contextlib
+import contextvars
+import os
+from dataclasses import dataclass
+
+# Katalog główny projektu (domyślny sklep: ../data i ../DATABASE względem pakietu frog)
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+@dataclass(frozen=True)
+class Store:
+    """
+    Sklep = katalog główny z podkatalogami data/ i DATABASE/.
+    :param root: katalog główny sklepu
+    :param name: nazwa sklepu (domyślnie nazwa katalogu)
+    :param config: ścieżka pliku INI (domyślnie root/config.ini)
+    """
+    root: str
+    name: str = ''
+    config: str = ''
+
+    def __post_init__(self):
+        object.__setattr__(self, 'root', os.path.abspath(self.root))
+        if not self.name:
+            object.__setattr__(self, 'name', os.path.basename(self.root))
+
+    # --- Ścieżki plików sklepu ---
+    @property
+    def data_dir(self):
+        return os.path.join(self.root, 'data')
+
+    @property
+    def products_xlsx(self):
+        return os.path.join(self.data_dir, 'products.xlsx')
+
+    @property
+    def customers_csv(self):
+        return os.path.join(self.data_dir, 'customers.csv')
+
+    @property
+    def receipts_dir(self):
+        return os.path.join(self.root, 'DATABASE')
+
+    @property
+    def config_ini(self):
+        return self.config or os.path.join(self.root, 'config.ini')
+
+    @property
+    def inventory_log(self):
+        return os.path.join(self.data_dir, 'inventory.log')
+
+    @property
+    def inventory_snapshot(self):
+        return os.path.join(self.data_dir, 'inventory_snapshot.json')
+
+    @property
+    def sales_state(self):
+        return os.path.join(self.data_dir, 'sales_state.json')
+
+    @property
+    def recommendations(self):
+        return os.path.join(self.data_dir, 'recommendations.json')
+
+    @property
+    def changes_log(self):
+        return os.path.join(self.data_dir, 'changes.log')
+
+
+# Sklep z katalogu projektu; config.ini zostaje w pakiecie frog, jak dotychczas
+DEFAULT_STORE = Store(PROJECT_DIR, name='default',
+                      config=os.path.join(os.path.dirname(__file__), 'config.ini'))
+
+# Sklep bieżącego wątku / zadania. Nowe wątki zaczynają od DEFAULT_STORE,
+# więc kod uruchamiany w puli wątków musi sam wywołać use_store().
+_current = contextvars.ContextVar('frog_store', default=DEFAULT_STORE)
+
+
+def current_store():
+    """Zwraca sklep, na którym działają funkcje w bieżącym kontekście."""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def use_store(store):
+    """
+    Ustawia sklep dla bloku with (tylko w bieżącym wątku / kontekście).
+    :param store: obiekt Store albo ścieżka katalogu sklepu
+    """
+    token = _current.set(store_at(store))
+    try:
+        yield current_store()
+    finally:
+        _current.reset(token)
+
+
+def store_at(store):
+    """Zamienia ścieżkę katalogu na Store (obiekt Store zwraca bez zmian)."""
+    return store if isinstance(store, Store) else Store(store)
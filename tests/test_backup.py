@@ -0,0 +1,73 @@
+"""
+Testy kopii zapasowych: odtworzenie musi dać pliki zgodne z manifestem,
+także gdy paragon jest dopisywany w trakcie tworzenia kopii, a powtórzone ID produktu
+nie sklejają wierszy; verify wykrywa zmieniony plik.
+"""
+
+# --- Importy ---
+import os
+
+import pytest
+
+from benchmarks import generators
+from frog import backup
+from frog.store import Store, use_store
+
+EXTRA_LINE = "2026-10-19 12:00 -> [('P001', 1)]\n"
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_restore_after_append_during_backup(tmp_path, monkeypatch):
+    root, backup_dir = str(tmp_path / 'store'), str(tmp_path / 'backup')
+    _, customers = generators.build_store(root, n_products=5, n_customers=3, lines_per_customer=20)
+    receipt = os.path.join(root, 'DATABASE', f"{customers[0]['ID']}.txt")
+    add_range = backup._add_range
+
+    def add_range_then_append(tar, name, path, offset, size, crc=0):
+        """Kasa dopisuje paragon zaraz po skopiowaniu pliku do archiwum."""
+        crc = add_range(tar, name, path, offset, size, crc)
+        if path == receipt:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(EXTRA_LINE)
+        return crc
+
+    with use_store(Store(root)):
+        monkeypatch.setattr(backup, '_add_range', add_range_then_append)
+        backup.backup(backup_dir)
+        monkeypatch.setattr(backup, '_add_range', add_range)
+        full = _read(receipt)[:-len(EXTRA_LINE)]
+        backup.restore(backup_dir, str(tmp_path / 'first'))
+        assert _read(str(tmp_path / 'first' / 'DATABASE' / os.path.basename(receipt))) == full
+
+        entry = backup.backup(backup_dir)
+        assert entry['data_bytes'] == len(EXTRA_LINE)
+        backup.restore(backup_dir, str(tmp_path / 'second'))
+        assert _read(str(tmp_path / 'second' / 'DATABASE' / os.path.basename(receipt))) == _read(receipt)
+
+
+def test_duplicate_ids_and_verify(tmp_path):
+    root, backup_dir = str(tmp_path / 'store'), str(tmp_path / 'backup')
+    products, customers = generators.build_store(root, n_products=4, n_customers=2, lines_per_customer=5)
+    xlsx = os.path.join(root, 'data', 'products.xlsx')
+    with use_store(Store(root)):
+        backup.backup(backup_dir)
+        twin = dict(products[0], Nazwa='Drugi wiersz z tym samym ID')
+        generators.write_products(xlsx, products + [twin])  # Powtórzone ID nie może zastąpić wiersza
+        backup.backup(backup_dir)
+
+    target = str(tmp_path / 'restored')
+    backup.restore(backup_dir, target)
+    _, rows = backup._product_rows(os.path.join(target, 'data', 'products.xlsx'))
+    assert [r[1] for r in rows if r[0] == products[0]['ID']] == [products[0]['Nazwa'], twin['Nazwa']]
+
+    manifest = backup.load_manifest(backup_dir)
+    receipt = os.path.join(target, 'DATABASE', f"{customers[0]['ID']}.txt")
+    data = _read(receipt)
+    with open(receipt, 'wb') as f:
+        f.write(b'1' + data[1:] if data[:1] != b'1' else b'2' + data[1:])  # Ten sam rozmiar i koniec pliku
+    with pytest.raises(ValueError):
+        backup.verify(target, manifest)
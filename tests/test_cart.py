@@ -0,0 +1,60 @@
+"""
+Testy koszyka: pilnowanie stanów przy dodawaniu, suma przyrostowa
+i poprawianie ilości po odświeżeniu katalogu.
+"""
+
+# --- Importy ---
+import pytest
+
+from frog.cart import Cart
+from frog.pricing import build_catalog, multi_buy
+
+
+def _catalog(stock):
+    """Katalog z trzema produktami; stock – stany magazynowe P001..P003."""
+    return build_catalog([{'ID': f"P00{i}", 'Nazwa': f"Produkt {i}", 'Kategoria': 'Inne',
+                           'Cena': 1.10 * i, 'Ilość_w_magazynie': qty}
+                          for i, qty in enumerate(stock, 1)])
+
+
+def test_add_merges_and_respects_stock():
+    cart = Cart(_catalog([5, 2, 0]))
+    cart.add('P001', 2)
+    cart.add('P001', 3)
+    assert cart.items() == [('P001', 5)]
+    assert cart.available('P001') == 0
+    with pytest.raises(ValueError):
+        cart.add('P001')
+    with pytest.raises(ValueError):
+        cart.add('P003')
+    with pytest.raises(KeyError):
+        cart.add('P404')
+    assert cart.subtotal == pytest.approx(5.5)
+
+
+def test_remove_and_total_with_rules():
+    cart = Cart(_catalog([5, 2, 0]), [multi_buy('P001', 3, 2)])
+    cart.add('P001', 3)
+    cart.add('P002', 2)
+    assert cart.subtotal == pytest.approx(7.7)
+    assert cart.total == pytest.approx(6.6)
+    cart.remove('P002', 1)
+    cart.remove('P001')
+    assert cart.items() == [('P002', 1)]
+    assert cart.total == pytest.approx(2.2)
+
+
+def test_set_catalog_clamps_to_new_stock():
+    cart = Cart(_catalog([5, 2, 1]))
+    cart.add('P001', 4)
+    cart.add('P002', 2)
+    cart.add('P003', 1)
+
+    adjusted = cart.set_catalog(_catalog([3, 2, 0]))
+    assert adjusted == {'P001': (4, 3), 'P003': (1, 0)}
+    assert cart.items() == [('P001', 3), ('P002', 2)]
+    assert cart.subtotal == pytest.approx(3 * 1.1 + 2 * 2.2)
+
+    cart.set_catalog(build_catalog([]))
+    assert not cart
+    assert cart.subtotal == 0
@@ -0,0 +1,79 @@
+"""
+Testy historii zakupów: stronicowanie kursorem, filtry dat i produktu
+oraz sprawdzanie argumentów.
+"""
+
+# --- Importy ---
+import os
+
+import pytest
+
+from frog.customer_manager import purchase_history
+from frog.store import Store, use_store
+
+LINES = [
+    "2025-05-01 10:00 -> [('P001', 1)]\n",
+    "2025-05-02T11:00:00.123456 -> [('P002', 2)]\n",  # Stary format daty
+    "2025-05-15 09:00 -> [('P001', 3), ('P003', 1)]\n",
+    "2025-06-01 12:00 -> [('P003', 1)]\n",
+    "2025-06-02 08:00 -> [('P001', 1)]\n",
+]
+
+
+@pytest.fixture
+def receipts(tmp_path):
+    """Sklep z jednym plikiem historii klienta 1000; zwraca ścieżkę tego pliku."""
+    path = tmp_path / 'DATABASE' / '1000.txt'
+    path.parent.mkdir()
+    path.write_text(''.join(LINES), encoding='utf-8')
+    with use_store(Store(str(tmp_path))):
+        yield str(path)
+
+
+def _days(page):
+    return [dt[:10] for dt, _ in page]
+
+
+def test_pages_newest_first(receipts):
+    page, cursor = purchase_history('1000', limit=2)
+    assert _days(page) == ['2025-06-02', '2025-06-01']
+    with open(receipts, 'a', encoding='utf-8') as f:
+        f.write("2025-06-03 10:00 -> [('P002', 1)]\n")  # Nowy zakup nie przesuwa kolejnych stron
+    page, cursor = purchase_history('1000', limit=2, cursor=cursor)
+    assert _days(page) == ['2025-05-15', '2025-05-02']
+    page, cursor = purchase_history('1000', limit=2, cursor=cursor)
+    assert _days(page) == ['2025-05-01']
+    assert cursor is None
+    assert len(purchase_history('1000', limit=None)[0]) == len(LINES) + 1
+
+
+def test_filters(receipts):
+    page, _ = purchase_history('1000', limit=None, date_from='2025-05-01', date_to='2025-05-31')
+    assert _days(page) == ['2025-05-15', '2025-05-02', '2025-05-01']
+    page, _ = purchase_history('1000', limit=None, product='P003')
+    assert _days(page) == ['2025-06-01', '2025-05-15']
+    page, cursor = purchase_history('1000', limit=1, date_from='2025-05-02', product='P001')
+    assert _days(page) == ['2025-06-02']
+    page, cursor = purchase_history('1000', limit=1, cursor=cursor, date_from='2025-05-02', product='P001')
+    assert _days(page) == ['2025-05-15']
+    assert purchase_history('1000', limit=1, cursor=cursor, date_from='2025-05-02', product='P001') == ([], None)
+
+
+def test_unordered_file(receipts):
+    with open(receipts, 'a', encoding='utf-8') as f:
+        f.write("2025-04-01 10:00 -> [('P003', 2)]\n")  # Zakup dopisany z wcześniejszą datą
+    page, cursor = purchase_history('1000', limit=1, date_to='2025-05-01')
+    assert _days(page) == ['2025-05-01']  # Kolejność po dacie, nie po miejscu w pliku
+    page, cursor = purchase_history('1000', limit=1, cursor=cursor, date_to='2025-05-01')
+    assert _days(page) == ['2025-04-01']
+
+
+def test_arguments(receipts):
+    with pytest.raises(ValueError):
+        purchase_history('1000', limit=0)
+    with pytest.raises(ValueError):
+        purchase_history('1000', date_from='2025-5-1')
+    with pytest.raises(ValueError):
+        purchase_history('1000', date_to='2025-02-30')
+    assert purchase_history('9999') == ([], None)
+    assert os.path.exists(receipts)
@@ -0,0 +1,56 @@
+"""
+Testy sprawdzania spójności: raport uszkodzonych danych, naprawa z odłożeniem
+odrzuconych linii do lost+found/ i czysty raport po naprawie.
+"""
+
+# --- Importy ---
+import os
+
+import pytest
+
+from benchmarks import generators
+from frog import fsck
+from frog.store import Store, use_store
+
+BROKEN = "to nie jest paragon\n"
+TRUNCATED = "2025-06-01 12:00 -> [('P001', 1)"
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Sklep z trzema klientami; w pliku pierwszego jest uszkodzona i niedokończona linia."""
+    root = str(tmp_path)
+    _, customers = generators.build_store(root, n_products=5, n_customers=3, lines_per_customer=10)
+    path = os.path.join(root, 'DATABASE', f"{customers[0]['ID']}.txt")
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(BROKEN + TRUNCATED)
+    with use_store(Store(root)):
+        yield root, f"DATABASE/{customers[0]['ID']}.txt"
+
+
+def _codes(result, path):
+    return {i.code for i in result['issues'] if i.path == path}
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_report(store, workers):
+    _, rel = store
+    result = fsck.fsck(workers=workers)
+    assert result['files'] == 3
+    assert {'receipt-malformed-line', 'receipt-truncated-line'} <= _codes(result, rel)
+    assert fsck.exit_code(result['issues']) == 4
+
+
+def test_repair(store):
+    root, rel = store
+    result = fsck.fsck(repair=True, workers=1)
+    assert fsck.exit_code(result['issues']) == 1
+    with open(os.path.join(root, fsck.LOST_FOUND, *rel.split('/')), encoding='utf-8') as f:
+        assert f.read() == BROKEN + TRUNCATED + '\n'  # Niedokończona linia też – bez zgadywania końca
+    with open(os.path.join(root, *rel.split('/')), encoding='utf-8') as f:
+        data = f.read()
+    assert BROKEN not in data and TRUNCATED not in data and data.endswith(']\n')
+
+    result = fsck.fsck(workers=1)
+    assert result['issues'] == []
+    assert fsck.exit_code(result['issues']) == 0
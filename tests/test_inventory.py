@@ -0,0 +1,70 @@
+"""
+Testy dziennika magazynowego: równoległe kasy nie mogą sprzedać więcej, niż jest w magazynie.
+"""
+
+# --- Importy ---
+import concurrent.futures
+import contextlib
+import io
+
+from benchmarks import generators
+from frog import inventory
+from frog.store import Store, use_store
+
+SELLERS = 8
+STOCK = 500
+
+
+def _sell_until_empty(root, pid):
+    """Kasa sprzedaje po jednej sztuce, aż update_stock odmówi; zwraca liczbę sprzedanych sztuk."""
+    from frog.product_manager import update_stock
+
+    sold = 0
+    with use_store(Store(root)), contextlib.redirect_stdout(io.StringIO()):
+        while True:
+            try:
+                update_stock([(pid, -1)])
+            except ValueError:
+                return sold
+            sold += 1
+
+
+def _replayed_minimum(journal, pid):
+    """Najniższy stan produktu w trakcie odtwarzania dziennika od początku."""
+    stock, lowest = {}, None
+    for event, event_pid, qty in inventory.read_events(journal)[1]:
+        inventory._apply(stock, event, event_pid, qty)
+        if event_pid == pid:
+            lowest = stock.get(pid, 0) if lowest is None else min(lowest, stock.get(pid, 0))
+    return lowest
+
+
+def test_concurrent_sellers_never_oversell(tmp_path):
+    root = str(tmp_path)
+    products, _ = generators.build_store(root, n_products=5, n_customers=1)
+    pid = products[1]['ID']
+    with use_store(Store(root)):
+        inventory.adjust(pid, STOCK)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=SELLERS) as pool:
+        sold = sum(pool.map(_sell_until_empty, [root] * SELLERS, [pid] * SELLERS))
+
+    with use_store(Store(root)):
+        assert inventory.current_stock()[pid] == 0
+        assert _replayed_minimum(Store(root).inventory_log, pid) >= 0
+    assert sold == STOCK
+
+
+def test_concurrent_threads_never_oversell(tmp_path):
+    root = str(tmp_path)
+    products, _ = generators.build_store(root, n_products=5, n_customers=1)
+    pid = products[1]['ID']
+    with use_store(Store(root)):
+        inventory.adjust(pid, STOCK // 5)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=SELLERS) as pool:
+        sold = sum(pool.map(_sell_until_empty, [root] * SELLERS, [pid] * SELLERS))
+
+    with use_store(Store(root)):
+        assert inventory.current_stock()[pid] == 0
+    assert sold == STOCK // 5
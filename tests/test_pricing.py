@@ -0,0 +1,70 @@
+"""
+Testy wyceny koszyka: promocje wielosztukowe, rabaty kategorii i progi koszykowe
+oraz zgodność wyceny pojedynczej z wyceną wielu koszyków naraz.
+"""
+
+# --- Importy ---
+import pytest
+
+from frog import pricing
+
+PRODUCTS = [
+    {'ID': 'P001', 'Nazwa': 'Woda', 'Kategoria': 'Napoje', 'Cena': 2.50, 'Ilość_w_magazynie': 10},
+    {'ID': 'P002', 'Nazwa': 'Chleb', 'Kategoria': 'Pieczywo', 'Cena': 10.00, 'Ilość_w_magazynie': 5},
+    {'ID': 'P003', 'Nazwa': 'Sok', 'Kategoria': 'napoje', 'Cena': 5.00, 'Ilość_w_magazynie': 3},
+]
+RULES = [pricing.multi_buy('P001', 3, 2), pricing.category_discount('Napoje', 10),
+         pricing.basket_threshold(20, 5)]
+
+
+@pytest.fixture
+def catalog():
+    return pricing.build_catalog(PRODUCTS)
+
+
+def test_cart_without_promotions(catalog):
+    priced = pricing.price_cart(catalog, [('P001', 2), ('P002', 1)])
+    assert priced['subtotal'] == 15.0
+    assert priced['discount'] == 0.0
+    assert priced['total'] == 15.0
+    assert [line['ID'] for line in priced['lines']] == ['P001', 'P002']
+
+
+def test_cart_with_all_promotions(catalog):
+    # P001: 3 za 2 (-2.50), potem -10% kategorii od 5.00 (-0.50); P003: -10% od 5.00 (-0.50).
+    # Po rabatach na pozycjach koszyk ma 29.00 >= 20, więc jeszcze -5% (-1.45).
+    priced = pricing.price_cart(catalog, [('P001', 3), ('P002', 2), ('P003', 1)], RULES)
+    assert priced['subtotal'] == 32.5
+    assert priced['basket_discount'] == 1.45
+    assert priced['discount'] == 4.95
+    assert priced['total'] == 27.55
+    assert priced['lines'][0]['Do_zapłaty'] == 4.5
+
+
+def test_threshold_below_minimum(catalog):
+    priced = pricing.price_cart(catalog, [('P002', 1)], RULES)
+    assert priced['total'] == 10.0
+
+
+def test_batch_matches_single_carts(catalog):
+    carts = [[('P001', 3), ('P002', 2), ('P003', 1)], [], [('P002', 1)], [('P001', 7)]]
+    batch = pricing.price_carts(catalog, carts, RULES)
+    singles = [pricing.price_cart(catalog, cart, RULES) for cart in carts]
+    assert batch['total'].tolist() == [s['total'] for s in singles]
+    assert singles[1]['total'] == 0.0
+
+
+def test_unknown_product(catalog):
+    with pytest.raises(KeyError):
+        pricing.price_cart(catalog, [('P404', 1)])
+
+
+def test_load_rules(tmp_path, catalog):
+    path = tmp_path / 'config.ini'
+    path.write_text("[promotions]\nmulti_buy.p001 = 3:2 ; woda\ncategory.Napoje = 10\n"
+                    "threshold.20 = 5\n", encoding='utf-8')
+    rules = pricing.load_rules(str(path))  # configparser zamienia klucze na małe litery
+    assert [r['type'] for r in rules] == [r['type'] for r in RULES]
+    cart = [('P001', 3), ('P002', 2), ('P003', 1)]
+    assert pricing.price_cart(catalog, cart, rules) == pricing.price_cart(catalog, cart, RULES)
+    assert pricing.load_rules(str(tmp_path / 'brak.ini')) == []
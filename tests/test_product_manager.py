@@ -0,0 +1,72 @@
+"""
+Testy odczytu katalogu: pusta komórka stanu w products.xlsx to 0 sztuk,
+a wczytany katalog da się wycenić w koszyku; list_products i update_stock
+widzą te same produkty także po dopisaniu wiersza do Excela.
+"""
+
+# --- Importy ---
+import os
+
+import pytest
+
+from benchmarks import generators
+from frog import product_manager
+from frog.cart import Cart
+from frog.pricing import build_catalog
+from frog.store import Store, use_store
+
+
+@pytest.fixture
+def blank_stock_store(tmp_path):
+    """Sklep z pięcioma produktami, z których pierwszy ma pustą komórkę Ilość_w_magazynie."""
+    root = str(tmp_path)
+    products, _ = generators.build_store(root, n_products=5, n_customers=1)
+    products[0]['Ilość_w_magazynie'] = None
+    generators.write_products(os.path.join(root, 'data', 'products.xlsx'), products)
+    with use_store(Store(root)):
+        yield products
+
+
+def _priced_cart(products):
+    """Koszyk z jedną sztuką drugiego produktu, wyceniony na katalogu z list_products()."""
+    cart = Cart(build_catalog(product_manager.list_products()))
+    assert cart.available(products[0]['ID']) == 0
+    cart.add(products[1]['ID'])
+    return cart
+
+
+def test_blank_stock_cell_prices_cart(blank_stock_store):
+    products = blank_stock_store
+    stock = {p['ID']: p['Ilość_w_magazynie'] for p in product_manager.list_products()}
+    assert stock[products[0]['ID']] == 0
+
+    cart = _priced_cart(products)
+    assert cart.total == pytest.approx(products[1]['Cena'])
+    with pytest.raises(ValueError):
+        cart.add(products[0]['ID'])
+
+
+def test_blank_stock_cell_with_journal(blank_stock_store):
+    products = blank_stock_store
+    product_manager.update_stock([(products[1]['ID'], 1)])
+
+    cart = _priced_cart(products)
+    assert cart.price()['total'] == pytest.approx(products[1]['Cena'])
+
+
+def test_product_added_to_workbook_after_journal(tmp_path):
+    root = str(tmp_path)
+    products, _ = generators.build_store(root, n_products=3, n_customers=1)
+    with use_store(Store(root)):
+        product_manager.update_stock([(products[0]['ID'], -1)])
+        extra = dict(products[0], ID='P999', **{'Ilość_w_magazynie': 7})
+        generators.write_products(os.path.join(root, 'data', 'products.xlsx'), products + [extra])
+
+        listed = {p['ID']: p['Ilość_w_magazynie'] for p in product_manager.list_products()}
+        assert listed['P999'] == 7
+        product_manager.update_stock([('P999', -2)])
+        listed = {p['ID']: p['Ilość_w_magazynie'] for p in product_manager.list_products()}
+        assert listed['P999'] == 5
+        assert listed[products[0]['ID']] == products[0]['Ilość_w_magazynie'] - 1
+        with pytest.raises(KeyError):
+            product_manager.update_stock([('P000', 1)])
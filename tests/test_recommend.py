@@ -0,0 +1,78 @@
+"""
+Testy modelu rekomendacji: po dopisaniu, przepisaniu lub usunięciu pliku paragonów
+model doczytany przyrostowo musi być taki sam jak zbudowany od zera.
+"""
+
+# --- Importy ---
+import os
+
+import pytest
+
+from benchmarks import generators
+from frog import recommend
+from frog.store import Store, use_store
+
+RECEIPT = "2026-10-19 12:00 -> [('P001', 1), ('P002', 2)]\n"
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Sklep z pięcioma klientami po dwadzieścia paragonów; zwraca ścieżki plików paragonów."""
+    root = str(tmp_path)
+    _, customers = generators.build_store(root, n_products=8, n_customers=5, lines_per_customer=20)
+    with use_store(Store(root)):
+        yield [os.path.join(root, 'DATABASE', f"{c['ID']}.txt") for c in customers]
+
+
+def _fresh():
+    """Liczniki modelu zbudowanego od zera z bieżących plików."""
+    model = recommend._empty_model()
+    recommend.update_model(model)
+    return model['counts'], model['pairs']
+
+
+def _rewrite(path, lines):
+    """Przepisuje plik paragonów podanymi liniami i przesuwa czas modyfikacji."""
+    st = os.stat(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def _lines(path):
+    with open(path, encoding='utf-8') as f:
+        return f.readlines()
+
+
+def test_append_is_read_incrementally(store):
+    model = recommend.load_model()
+    with open(store[0], 'a', encoding='utf-8') as f:
+        f.write(RECEIPT)
+    assert recommend.update_model(model) == 1
+    assert (model['counts'], model['pairs']) == _fresh()
+
+
+def test_shorter_rewrite_is_not_double_counted(store):
+    model = recommend.load_model()
+    _rewrite(store[1], _lines(store[1])[:5])
+    recommend.update_model(model)
+    assert (model['counts'], model['pairs']) == _fresh()
+
+
+def test_same_size_rewrite_after_save(store):
+    recommend.load_model()
+    lines = [line.replace("'P001'", "'P009'") for line in _lines(store[2])]
+    _rewrite(store[2], lines)  # Inny produkt o ID tej samej długości – rozmiar pliku bez zmian
+    model = recommend.load_model()
+    assert (model['counts'], model['pairs']) == _fresh()
+
+
+def test_update_customer_after_rewrite_and_removal(store):
+    model = recommend.load_model()
+    _rewrite(store[3], [RECEIPT])
+    recommend.update_customer(model, os.path.basename(store[3])[:-4])
+    assert (model['counts'], model['pairs']) == _fresh()
+
+    os.remove(store[4])
+    recommend.update_model(model)
+    assert (model['counts'], model['pairs']) == _fresh()
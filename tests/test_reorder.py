@@ -0,0 +1,81 @@
+"""
+Testy raportu zamówień: przyrostowa sprzedaż dzienna po dopisaniu i przepisaniu
+plików paragonów oraz alerty niskiego stanu.
+"""
+
+# --- Importy ---
+import datetime
+import os
+
+import pytest
+
+from benchmarks import generators
+from frog import reorder
+from frog.store import Store, use_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Sklep z dziesięcioma klientami; zwraca ścieżki plików paragonów."""
+    root = str(tmp_path)
+    _, customers = generators.build_store(root, n_products=6, n_customers=10, lines_per_customer=15)
+    with use_store(Store(root)):
+        yield [os.path.join(root, 'DATABASE', f"{c['ID']}.txt") for c in customers]
+
+
+def _fresh():
+    """Sprzedaż dzienna policzona od zera z bieżących plików."""
+    state = reorder.load_state()
+    reorder._reset_sales(state)
+    reorder.update_sales(state, workers=1)
+    return state['daily']
+
+
+def _incremental(workers):
+    state = reorder.load_state()
+    reorder.update_sales(state, workers)
+    reorder.save_state(state)
+    return state['daily']
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_append_and_rewrite(store, workers, monkeypatch):
+    monkeypatch.setattr(reorder, 'PARALLEL_MIN_FILES', 2)  # Pula procesów już przy kilku plikach
+    _incremental(workers)
+    with open(store[0], 'a', encoding='utf-8') as f:
+        f.write("2025-01-05 10:00 -> [('P001', 3)]\n")
+    assert _incremental(workers) == _fresh()
+
+    with open(store[1], encoding='utf-8') as f:
+        lines = f.readlines()
+    st = os.stat(store[1])
+    with open(store[1], 'w', encoding='utf-8') as f:
+        f.writelines(lines[:-3])  # Plik skrócony – jego sprzedaży nie wolno liczyć dwa razy
+    assert _incremental(workers) == _fresh()
+
+    with open(store[2], encoding='utf-8') as f:
+        data = f.read()
+    with open(store[2], 'w', encoding='utf-8') as f:
+        f.write(data.replace("', 1)", "', 2)", 1) if "', 1)" in data else data.replace("', 2)", "', 1)", 1))
+    os.utime(store[2], ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))  # Ten sam rozmiar, inna treść
+    assert _incremental(workers) == _fresh()
+
+
+def test_alerts(store):
+    products = [
+        {'ID': 'P001', 'Nazwa': 'A', 'Kategoria': 'X', 'Ilość_w_magazynie': 0},
+        {'ID': 'P002', 'Nazwa': 'B', 'Kategoria': 'X', 'Ilość_w_magazynie': 1},
+        {'ID': 'P404', 'Nazwa': 'C', 'Kategoria': 'Y', 'Ilość_w_magazynie': 50},
+    ]
+    with open(store[0], 'a', encoding='utf-8') as f:
+        f.write("2030-01-10 10:00 -> [('P002', 14)]\n")
+    report = reorder.reorder_report(as_of=datetime.date(2030, 1, 10), window=7, products=products,
+                                    workers=1)
+    rows = {r['ID']: r for r in report['products']}
+    assert rows['P002']['Sprzedaż_dziennie'] == 2.0
+    assert rows['P002']['Alert'] == reorder.LOW_STOCK
+    assert rows['P002']['Zamówić'] == 2 * (3 + 2 + 14) - 1
+    assert rows['P404']['Alert'] == '' and rows['P404']['Dni_zapasu'] is None
+    assert [r['ID'] for r in reorder.low_stock_alerts(report)] == ['P001', 'P002']
+    with pytest.raises(ValueError):
+        reorder.reorder_report(window=0, products=products)
@@ -0,0 +1,37 @@
+"""
+Testy warstwy usług: usuwanie produktu po ID albo nazwie.
+"""
+
+# --- Importy ---
+import pytest
+
+from benchmarks import generators
+from frog import service
+from frog.product_manager import list_products
+from frog.store import Store, use_store
+
+
+@pytest.fixture
+def products(tmp_path):
+    root = str(tmp_path)
+    products, _ = generators.build_store(root, n_products=4, n_customers=1)
+    with use_store(Store(root)):
+        yield products
+
+
+def _ids():
+    return {p['ID'] for p in list_products()}
+
+
+def test_delete_product_by_id_then_by_name(products):
+    service.delete_product(products[0]['ID'])
+    assert products[0]['ID'] not in _ids()
+
+    service.delete_product(products[1]['Nazwa'].upper())
+    assert _ids() == {p['ID'] for p in products[2:]}
+
+
+def test_delete_unknown_product(products):
+    with pytest.raises(KeyError):
+        service.delete_product('brak-takiego-produktu')
+    assert _ids() == {p['ID'] for p in products}